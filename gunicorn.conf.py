@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration for multi-worker API deployments
+
+    gunicorn -c gunicorn.conf.py src.api.main:app
+"""
+import os
+import tempfile
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Shared mmap-backed Prometheus store so every worker reports aggregated totals.
+# Must be set before any worker imports prometheus_client.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "prometheus_multiproc"))
+
+
+def on_starting(server):
+    """Start every deployment with an empty metrics directory"""
+    directory = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.endswith(".db"):
+            os.remove(os.path.join(directory, name))
+
+
+def child_exit(server, worker):
+    from src.monitoring.metrics import mark_process_dead
+    mark_process_dead(worker.pid)
@@ -1,32 +1,47 @@
 #!/usr/bin/env python3
 """
 Container health check script
+
+Checks liveness (/health) by default; pass --ready to wait for /ready, which
+only returns 200 once the API has finished its startup warm-up.
 """
 
+import argparse
 import requests
 import time
 import sys
 
-def check_api_health():
-    """Check if API is healthy"""
+def check_api_health(url="http://localhost:8000", endpoint="/health"):
+    """Check if API is healthy (or ready, for endpoint=/ready)"""
     try:
-        response = requests.get("http://localhost:8000/health", timeout=5)
+        response = requests.get(f"{url.rstrip('/')}{endpoint}", timeout=5)
         return response.status_code == 200
     except:
         return False
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Wait for the API to become healthy or ready")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--endpoint", default="/health")
+    parser.add_argument("--ready", action="store_true", help="Shortcut for --endpoint /ready")
+    parser.add_argument("--attempts", type=int, default=10)
+    parser.add_argument("--interval", type=float, default=5.0)
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main health check"""
-    max_attempts = 10
-    for attempt in range(max_attempts):
-        if check_api_health():
-            print("✅ API is healthy!")
+    args = parse_args(argv)
+    endpoint = "/ready" if args.ready else args.endpoint
+    state = "ready" if endpoint == "/ready" else "healthy"
+    for attempt in range(args.attempts):
+        if check_api_health(args.url, endpoint):
+            print(f"✅ API is {state}!")
             sys.exit(0)
         else:
-            print(f"⏳ Waiting for API... (attempt {attempt + 1}/{max_attempts})")
-            time.sleep(5)
-    
-    print("❌ API health check failed!")
+            print(f"⏳ Waiting for API... (attempt {attempt + 1}/{args.attempts})")
+            time.sleep(args.interval)
+
+    print(f"❌ API {endpoint} check failed!")
     sys.exit(1)
 
 if __name__ == "__main__":
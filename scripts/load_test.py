@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Load generator for the prediction API
+
+Open-loop (constant arrival rate) and closed-loop (fixed concurrency) modes
+against /predict, /predict/batch and /stream/predict, with coordinated-omission
+corrected latency histograms and JSON / markdown reports.
+
+Examples:
+    python scripts/load_test.py --in-process --mode open --rate 200 --duration 30
+    python scripts/load_test.py --url http://localhost:8000 --endpoint batch \\
+        --batch-size 1000 --format numpy --mode closed --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class HdrHistogram:
+    """
+    Log-linear latency histogram in microseconds with ~3 significant digits.
+
+    Values keep their top ``sub_bucket_bits`` bits, so the relative error of
+    any reported percentile is below 2 ** -(sub_bucket_bits - 1).
+    """
+
+    def __init__(self, sub_bucket_bits: int = 11):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts = Counter()
+        self.total = 0
+        self.max_value = 0
+        self.sum = 0
+
+    def _key(self, value: int):
+        magnitude = max(0, value.bit_length() - self.sub_bucket_bits)
+        return magnitude, value >> magnitude
+
+    def record(self, value_us: float, count: int = 1):
+        value = max(0, int(value_us))
+        self.counts[self._key(value)] += count
+        self.total += count
+        self.sum += value * count
+        self.max_value = max(self.max_value, value)
+
+    def record_corrected(self, value_us: float, expected_interval_us: float):
+        """
+        Record a value and back-fill the samples a stalled closed-loop client
+        never sent (coordinated-omission correction).
+        """
+        self.record(value_us)
+        if expected_interval_us <= 0:
+            return
+        missing = value_us - expected_interval_us
+        while missing >= expected_interval_us:
+            self.record(missing)
+            missing -= expected_interval_us
+
+    def merge(self, other: "HdrHistogram"):
+        self.counts.update(other.counts)
+        self.total += other.total
+        self.sum += other.sum
+        self.max_value = max(self.max_value, other.max_value)
+
+    def percentile(self, p: float) -> float:
+        """Value (upper bound of its bucket) at percentile ``p`` in microseconds"""
+        if not self.total:
+            return 0.0
+        target = max(1, int(np.ceil(self.total * p / 100.0)))
+        seen = 0
+        for magnitude, sub in sorted(self.counts):
+            seen += self.counts[(magnitude, sub)]
+            if seen >= target:
+                return float(min(((sub + 1) << magnitude) - 1, self.max_value))
+        return float(self.max_value)
+
+    def summary(self) -> dict:
+        """Latency summary in milliseconds"""
+        result = {f"p{p:g}": self.percentile(p) / 1000.0 for p in PERCENTILES}
+        result["mean"] = (self.sum / self.total / 1000.0) if self.total else 0.0
+        result["max"] = self.max_value / 1000.0
+        result["count"] = self.total
+        return result
+
+
+class PayloadFactory:
+    """Builds request payloads of a configurable shape"""
+
+    def __init__(self, endpoint: str, n_qubits: int, batch_size: int, fmt: str, seed: int = 0):
+        self.endpoint = endpoint
+        self.n_qubits = n_qubits
+        self.batch_size = batch_size if endpoint != "predict" else 1
+        self.fmt = fmt
+        self.rng = np.random.default_rng(seed)
+
+    @property
+    def path(self) -> str:
+        return {"predict": "/predict", "batch": "/predict/batch", "stream": "/stream/predict"}[self.endpoint]
+
+    def build(self):
+        """Return ``(content bytes, headers)`` for one request"""
+        rows = self.rng.uniform(0, np.pi, size=(self.batch_size, self.n_qubits))
+        if self.endpoint == "predict":
+            return json.dumps({"features": rows[0].tolist()}).encode(), {"Content-Type": "application/json"}
+        if self.endpoint == "stream":
+            body = "\n".join(json.dumps({"id": i, "features": r.tolist()}) for i, r in enumerate(rows))
+            return body.encode(), {"Content-Type": "application/x-ndjson"}
+        if self.fmt == "numpy":
+            return rows.astype("<f8").tobytes(), {
+                "Content-Type": f"application/x-numpy; dtype=float64; columns={self.n_qubits}",
+                "Accept": "application/x-numpy",
+            }
+        return json.dumps({"features": rows.tolist()}).encode(), {"Content-Type": "application/json"}
+
+
+class LoadGenerator:
+    """Drives an httpx.AsyncClient in open- or closed-loop mode"""
+
+    def __init__(self, client, payloads: PayloadFactory, mode: str = "open", rate: float = 100.0,
+                 concurrency: int = 8, duration: float = 10.0, warmup: float = 1.0,
+                 max_in_flight: int = 10000):
+        self.client = client
+        self.payloads = payloads
+        self.mode = mode
+        self.rate = rate
+        self.concurrency = concurrency
+        self.duration = duration
+        self.warmup = warmup
+        self.max_in_flight = max_in_flight
+        self.histogram = HdrHistogram()
+        self.requests = 0
+        self.errors = Counter()
+        self.recording = False
+        # Pre-build a pool of payloads so payload generation is not measured
+        self._pool = [payloads.build() for _ in range(64)]
+
+    async def _send(self, index: int, intended_start: float, expected_interval: float = 0.0):
+        content, headers = self._pool[index % len(self._pool)]
+        try:
+            response = await self.client.post(self.payloads.path, content=content, headers=headers)
+            await response.aread()
+            ok = response.status_code < 400
+            error = None if ok else f"http_{response.status_code}"
+        except Exception as e:
+            ok, error = False, type(e).__name__
+        latency_us = (time.perf_counter() - intended_start) * 1e6
+        if self.recording:
+            self.requests += 1
+            if ok:
+                if expected_interval:
+                    self.histogram.record_corrected(latency_us, expected_interval * 1e6)
+                else:
+                    self.histogram.record(latency_us)
+            else:
+                self.errors[error] += 1
+
+    async def _open_loop(self, deadline: float):
+        """Send at a constant rate; latency is measured from each request's intended start"""
+        interval = 1.0 / self.rate
+        start = time.perf_counter()
+        in_flight = set()
+        i = 0
+        while True:
+            intended = start + i * interval
+            if intended >= deadline:
+                break
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(in_flight) >= self.max_in_flight:
+                if self.recording:
+                    self.errors["client_saturated"] += 1
+            else:
+                task = asyncio.create_task(self._send(i, intended))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            i += 1
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+    async def _closed_loop(self, deadline: float):
+        """Fixed number of workers sending back to back"""
+        expected = self.concurrency / self.rate if self.rate else 0.0
+
+        async def worker(offset: int):
+            i = offset
+            while time.perf_counter() < deadline:
+                await self._send(i, time.perf_counter(), expected)
+                i += self.concurrency
+
+        await asyncio.gather(*(worker(w) for w in range(self.concurrency)))
+
+    async def run(self) -> dict:
+        run = self._open_loop if self.mode == "open" else self._closed_loop
+        if self.warmup > 0:
+            await run(time.perf_counter() + self.warmup)
+        self.recording = True
+        started = time.perf_counter()
+        await run(started + self.duration)
+        elapsed = time.perf_counter() - started
+        self.recording = False
+        return self.report(elapsed)
+
+    def report(self, elapsed: float) -> dict:
+        ok = self.requests - sum(v for k, v in self.errors.items() if k != "client_saturated")
+        return {
+            "config": {
+                "mode": self.mode,
+                "endpoint": self.payloads.path,
+                "rate": self.rate if self.mode == "open" else None,
+                "concurrency": self.concurrency if self.mode == "closed" else None,
+                "duration": self.duration,
+                "n_qubits": self.payloads.n_qubits,
+                "batch_size": self.payloads.batch_size,
+                "format": self.payloads.fmt,
+                "omission_corrected": self.mode == "closed" and bool(self.rate),
+            },
+            "elapsed": elapsed,
+            "requests": self.requests,
+            "errors": dict(self.errors),
+            "throughput_rps": self.requests / elapsed if elapsed else 0.0,
+            "throughput_rows_per_s": ok * self.payloads.batch_size / elapsed if elapsed else 0.0,
+            "latency_ms": self.histogram.summary(),
+        }
+
+
+def to_markdown(report: dict) -> str:
+    config = report["config"]
+    latency = report["latency_ms"]
+    load = f"rate {config['rate']}/s" if config["mode"] == "open" else f"concurrency {config['concurrency']}"
+    lines = [
+        f"# Load test: {config['endpoint']} ({config['mode']}-loop, {load})",
+        "",
+        f"- Duration: {report['elapsed']:.1f}s, qubits: {config['n_qubits']}, "
+        f"batch size: {config['batch_size']}, format: {config['format']}",
+        f"- Requests: {report['requests']}, errors: {sum(report['errors'].values())}",
+        f"- Throughput: {report['throughput_rps']:.1f} req/s, {report['throughput_rows_per_s']:.1f} rows/s",
+        "",
+        "| p50 | p90 | p99 | p99.9 | max | mean |",
+        "|---|---|---|---|---|---|",
+        f"| {latency['p50']:.2f} | {latency['p90']:.2f} | {latency['p99']:.2f} | {latency['p99.9']:.2f} "
+        f"| {latency['max']:.2f} | {latency['mean']:.2f} |",
+        "",
+    ]
+    if config["mode"] == "open":
+        lines.append("Latencies in milliseconds, measured from each request's intended start.")
+    elif config.get("omission_corrected"):
+        lines.append("Latencies in milliseconds, corrected for coordinated omission.")
+    else:
+        lines.append("Latencies in milliseconds, not corrected for coordinated omission.")
+    return "\n".join(lines)
+
+
+@asynccontextmanager
+async def make_client(url: str, in_process: bool, timeout: float):
+    import httpx
+
+    if not in_process:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+            yield client
+        return
+
+    from src.api.main import app
+    from src.api.warmup import warmup
+    # ASGITransport skips the lifespan; without startup no models are loaded and every
+    # request would take the demo fallback path
+    async with app.router.lifespan_context(app):
+        await asyncio.get_running_loop().run_in_executor(None, warmup.wait, timeout)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver", timeout=timeout) as client:
+            yield client
+
+
+async def run_load_test(args) -> dict:
+    payloads = PayloadFactory(args.endpoint, args.n_qubits, args.batch_size, args.format, args.seed)
+    async with make_client(args.url, args.in_process, args.timeout) as client:
+        generator = LoadGenerator(client, payloads, mode=args.mode, rate=args.rate,
+                                  concurrency=args.concurrency, duration=args.duration, warmup=args.warmup)
+        return await generator.run()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Quantum ML API load generator")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--in-process", action="store_true", help="Drive the ASGI app in this process")
+    parser.add_argument("--endpoint", choices=["predict", "batch", "stream"], default="predict")
+    parser.add_argument("--mode", choices=["open", "closed"], default="open")
+    parser.add_argument("--rate", type=float, default=100.0,
+                        help="Open loop: requests/s. Closed loop: target rate for omission correction (0 disables)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--n-qubits", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--format", choices=["json", "numpy"], default="json")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    parser.add_argument("--markdown", help="Write a markdown report to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = asyncio.run(run_load_test(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    markdown = to_markdown(report)
+    if args.markdown:
+        with open(args.markdown, "w") as f:
+            f.write(markdown + "\n")
+    print(markdown)
+    return report
+
+
+if __name__ == "__main__":
+    main()
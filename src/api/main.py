@@ -1,10 +1,23 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, Optional
 import time
+import uuid
 from loguru import logger
 
-from src.schemas.models import PredictionRequest, PredictionResponse, ModelInfo
+import numpy as np
+
+from src.schemas.models import (PredictionRequest, PredictionResponse, ModelInfo,
+                                BatchPredictionRequest, BatchPredictionResponse)
 from src.models.model_manager import model_manager
+from src.api.inference import run_model
+from src.api.warmup import warmup
+from src.api.jobs import job_manager
+from src.monitoring.metrics import metrics_collector
+from src.api.serialization import (decode_batch, encode_batch_response, negotiate,
+                                   UnsupportedMediaType, JSON, MSGPACK, NUMPY)
 
 app = FastAPI(
     title="Quantum ML Platform API",
@@ -23,13 +36,24 @@ app.add_middleware(
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize model on startup"""
+    """Load model artifacts, start watching for new versions and warm up"""
     try:
-        # Load a sample model - replace with your actual model path
-        # model_manager.load_model("models/sample_model.pkl", "quantum_model")
-        logger.info("API startup completed - Model loading disabled for demo")
+        model_manager.scan()
+        model_manager.start_watching()
+        logger.info(f"API startup completed - models: {model_manager.versions}")
     except Exception as e:
         logger.error(f"Startup error: {e}")
+    warmup.start()
+    job_manager.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    model_manager.stop_watching()
+    job_manager.stop()
+    if metrics_collector.mode == "buffered":
+        metrics_collector.stop_flusher()
+    from src.monitoring.monitor import monitor
+    monitor.performance.stop_flusher()
 
 @app.get("/")
 async def root():
@@ -39,110 +63,137 @@ async def root():
 async def health_check():
     return {"status": "healthy", "timestamp": time.time()}
 
-@app.post("/predict", response_model=PredictionResponse)
-async def predict(request: PredictionRequest):
-    """Make predictions using the quantum ML model"""
-    start_time = time.time()
-    
-    try:
-        # Demo prediction - replace with actual model inference
-        mock_prediction = [sum(request.features) / len(request.features)] if request.features else [0.0]
-        inference_time = time.time() - start_time
-        
-        return PredictionResponse(
-            prediction=mock_prediction,
-            confidence=0.95,
-            model_version=request.model_version or "latest",
-            inference_time=inference_time
-        )
-    except Exception as e:
-        logger.error(f"Prediction error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: 200 only once the startup warm-up has completed"""
+    report = warmup.report()
+    if not warmup.ready:
+        return JSONResponse(status_code=503, content=report)
+    return report
 
 @app.get("/models/{model_name}")
 async def get_model_info(model_name: str):
     """Get information about a specific model"""
+    artifact = model_manager.find(model_name)
+    if artifact is None:
+        raise HTTPException(status_code=404, detail=f"Model not found: {model_name}")
     return ModelInfo(
-        name=model_name,
-        version="1.0.0",
-        status="loaded",
-        performance={"accuracy": 0.95, "loss": 0.1}
+        name=artifact.name,
+        version=artifact.version,
+        status="default" if model_manager.find(model_manager.current_model or "") is artifact else "loaded",
+        performance=artifact.metadata.get("performance", {})
     )
 
 @app.get("/models")
 async def list_models():
     """List all available models"""
     return {
-        "models": list(model_manager.models.keys()),
-        "current_model": model_manager.current_model
+        "models": model_manager.versions,
+        "current_model": model_manager.current_model,
+        "traffic": model_manager.traffic
     }
 
+@app.post("/models/reload")
+async def reload_models():
+    """Rescan the models directory immediately"""
+    changed = model_manager.scan()
+    return {"changed": changed, "models": model_manager.versions}
+
+@app.put("/models/traffic")
+async def set_traffic(weights: Optional[Dict[str, float]] = None, default: Optional[str] = None):
+    """Set canary traffic weights per version; an empty body reverts to the registry file"""
+    try:
+        model_manager.set_traffic(weights, default)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Unknown model version: {e}")
+    return {"current_model": model_manager.current_model, "traffic": model_manager.traffic}
+
 # Add monitoring routes
 from src.monitoring.api import router as monitoring_router
 app.include_router(monitoring_router)
 
-# Update predict endpoint to include monitoring
+# Add streaming routes
+from src.api.streaming import router as streaming_router
+app.include_router(streaming_router)
+
+# Add asynchronous job routes
+from src.api.jobs import router as jobs_router
+app.include_router(jobs_router)
+
 @app.post("/predict", response_model=PredictionResponse)
-async def predict(request: PredictionRequest):
+def predict(request: PredictionRequest):
     """Make predictions using the quantum ML model"""
+    # A plain def: FastAPI runs it in the threadpool, so simulation never blocks the event loop
     start_time = time.time()
-    
+    request_id = request.request_id or uuid.uuid4().hex
+
     try:
-        # Demo prediction - replace with actual model inference
-        mock_prediction = [sum(request.features) / len(request.features)] if request.features else [0.0]
+        outputs, model_version = run_model(np.asarray([request.features], dtype=float), request.model_version)
+        prediction = [float(outputs[0])]
+        confidence = (1.0 + abs(prediction[0])) / 2 if model_manager.models else 0.95
         inference_time = time.time() - start_time
-        
+
         # Record metrics
-        # # metrics_collector.record_prediction(request.model_version or "latest", True)
-        # # metrics_collector.record_latency(inference_time)
-        
+        metrics_collector.record_prediction(model_version, True)
+        metrics_collector.record_latency(inference_time)
+
         # Log prediction
         from src.monitoring.monitor import monitor
-        monitor.log_prediction(request.features, mock_prediction, request.model_version or "latest")
-        
+        monitor.log_prediction(request.features, prediction, model_version,
+                               request_id=request_id, latency=inference_time)
+
         return PredictionResponse(
-            prediction=mock_prediction,
-            confidence=0.95,
-            model_version=request.model_version or "latest",
-            inference_time=inference_time
+            prediction=prediction,
+            confidence=confidence,
+            model_version=model_version,
+            inference_time=inference_time,
+            request_id=request_id
         )
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Unknown model version: {e}")
     except Exception as e:
-        # # metrics_collector.record_prediction(request.model_version or "latest", False)
-        # # metrics_collector.record_error(str(e))
+        metrics_collector.record_prediction(request.model_version or "latest", False)
+        metrics_collector.record_error(type(e).__name__)
         logger.error(f"Prediction error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-# Add monitoring routes
-from src.monitoring.api import router as monitoring_router
-app.include_router(monitoring_router)
+@app.post(
+    "/predict/batch",
+    response_model=BatchPredictionResponse,
+    openapi_extra={"requestBody": {"required": True, "content": {
+        JSON: {"schema": BatchPredictionRequest.model_json_schema()},
+        MSGPACK: {"schema": BatchPredictionRequest.model_json_schema()},
+        NUMPY: {"schema": {"type": "string", "format": "binary"}},
+    }}},
+)
+async def predict_batch(request: Request):
+    """
+    Batch predictions with content negotiation.
 
-# Update predict endpoint to include monitoring
-@app.post("/predict", response_model=PredictionResponse)
-async def predict(request: PredictionRequest):
-    """Make predictions using the quantum ML model"""
+    Requests may be JSON, msgpack or raw little-endian float32/float64
+    (``application/x-numpy``); the response format follows the Accept header.
+    """
     start_time = time.time()
-    
     try:
-        # Demo prediction - replace with actual model inference
-        mock_prediction = [sum(request.features) / len(request.features)] if request.features else [0.0]
-        inference_time = time.time() - start_time
-        
-        # Record metrics
-        # # metrics_collector.record_prediction(request.model_version or "latest", True)
-        # # metrics_collector.record_latency(inference_time)
-        
-        # Log prediction
-        from src.monitoring.monitor import monitor
-        monitor.log_prediction(request.features, mock_prediction, request.model_version or "latest")
-        
-        return PredictionResponse(
-            prediction=mock_prediction,
-            confidence=0.95,
-            model_version=request.model_version or "latest",
-            inference_time=inference_time
-        )
+        features, model_version = decode_batch(await request.body(), request.headers.get("content-type"), request.headers)
+    except UnsupportedMediaType as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    model_version = request.query_params.get("model_version") or model_version
+
+    try:
+        # Simulation is CPU-bound; keep the event loop free for other requests
+        predictions, model_version = await run_in_threadpool(run_model, features, model_version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Unknown model version: {e}")
     except Exception as e:
-        # # metrics_collector.record_prediction(request.model_version or "latest", False)
-        # # metrics_collector.record_error(str(e))
-        logger.error(f"Prediction error: {e}")
+        metrics_collector.record_prediction(model_version or "latest", False)
+        metrics_collector.record_error(type(e).__name__)
+        logger.error(f"Batch prediction error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+    inference_time = time.time() - start_time
+    metrics_collector.record_prediction(model_version, True)
+    metrics_collector.record_latency(inference_time)
+    return encode_batch_response(predictions, model_version, inference_time, negotiate(request.headers.get("accept")))
@@ -0,0 +1,162 @@
+"""
+Wire formats for prediction payloads
+Content-negotiated JSON (orjson fast path), msgpack and raw NumPy array bodies
+"""
+from typing import Any, Dict, Optional, Tuple
+import json
+
+import numpy as np
+from fastapi import Response
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+NUMPY = "application/x-numpy"
+
+# Accepted aliases for each canonical media type
+MEDIA_TYPES = {
+    "application/json": JSON,
+    "application/msgpack": MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+    "application/x-numpy": NUMPY,
+    "application/octet-stream": NUMPY,
+}
+
+NUMPY_DTYPES = {"float32": "<f4", "float64": "<f8", "f4": "<f4", "f8": "<f8"}
+
+
+class UnsupportedMediaType(ValueError):
+    """Raised when a payload's content type cannot be handled"""
+
+
+def parse_media_type(header: Optional[str]) -> Tuple[str, Dict[str, str]]:
+    """Split ``type/subtype; key=value`` into the canonical type and its parameters"""
+    if not header:
+        return JSON, {}
+    parts = [p.strip() for p in header.split(";")]
+    params = {}
+    for part in parts[1:]:
+        if "=" in part:
+            key, value = part.split("=", 1)
+            params[key.strip().lower()] = value.strip().strip('"')
+    return parts[0].lower(), params
+
+
+def negotiate(accept: Optional[str], default: str = JSON) -> str:
+    """Pick a response media type from an Accept header (first supported entry wins)"""
+    if not accept:
+        return default
+    for entry in accept.split(","):
+        media_type, _ = parse_media_type(entry)
+        if media_type in MEDIA_TYPES:
+            return MEDIA_TYPES[media_type]
+        if media_type in ("*/*", "application/*"):
+            return default
+    return default
+
+
+def loads_json(body: bytes) -> Any:
+    return orjson.loads(body) if ORJSON_AVAILABLE else json.loads(body)
+
+
+def _features_array(features) -> np.ndarray:
+    try:
+        array = np.asarray(features, dtype=np.float64)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"features must be a rectangular array of numbers ({e})")
+    if array.ndim == 1:
+        array = array[None, :]
+    if array.ndim != 2:
+        raise ValueError("features must be a 1-D row or 2-D batch")
+    return array
+
+
+def decode_batch(body: bytes, content_type: Optional[str], headers=None) -> Tuple[np.ndarray, Optional[str]]:
+    """
+    Decode a batch request body into ``(features[n_rows, n_features], model_version)``.
+
+    ``application/x-numpy`` bodies are raw little-endian float32/float64 values,
+    decoded zero-copy with ``np.frombuffer``. The dtype and shape come from
+    media-type parameters (``dtype=float32; shape=1000,4`` or ``columns=4``) or
+    the ``X-Dtype`` / ``X-Shape`` / ``X-Columns`` headers; the model version from
+    ``X-Model-Version``.
+    """
+    headers = headers or {}
+    media_type, params = parse_media_type(content_type)
+    canonical = MEDIA_TYPES.get(media_type)
+
+    if canonical == NUMPY:
+        dtype_name = params.get("dtype") or headers.get("x-dtype") or "float64"
+        if dtype_name not in NUMPY_DTYPES:
+            raise ValueError(f"Unsupported dtype: {dtype_name}")
+        dtype = np.dtype(NUMPY_DTYPES[dtype_name])
+        if len(body) % dtype.itemsize:
+            raise ValueError("Body length is not a multiple of the dtype size")
+        array = np.frombuffer(body, dtype=dtype)
+        shape = params.get("shape") or headers.get("x-shape")
+        columns = params.get("columns") or headers.get("x-columns")
+        try:
+            if shape:
+                array = array.reshape(tuple(int(s) for s in shape.split(",")))
+            elif columns:
+                array = array.reshape(-1, int(columns))
+            else:
+                array = array.reshape(1, -1)
+        except ValueError as e:
+            raise ValueError(f"Body does not match the declared shape ({e})")
+        if array.ndim != 2:
+            raise ValueError("features must be a 2-D batch")
+        return array, headers.get("x-model-version")
+
+    if canonical == JSON:
+        payload = loads_json(body)
+    elif canonical == MSGPACK:
+        if not MSGPACK_AVAILABLE:
+            raise UnsupportedMediaType("msgpack is not installed")
+        payload = msgpack.unpackb(body)
+    else:
+        raise UnsupportedMediaType(f"Unsupported content type: {media_type}")
+
+    if not isinstance(payload, dict) or "features" not in payload:
+        raise ValueError("Payload must be an object with a 'features' field")
+    return _features_array(payload["features"]), payload.get("model_version")
+
+
+def encode_batch_response(predictions: np.ndarray, model_version: str, inference_time: float,
+                          media_type: str = JSON) -> Response:
+    """Encode batch predictions in the negotiated media type"""
+    predictions = np.ascontiguousarray(predictions, dtype=np.float64)
+    if media_type == NUMPY:
+        return Response(
+            content=predictions.astype("<f8", copy=False).tobytes(),
+            media_type=f"{NUMPY}; dtype=float64; shape={','.join(map(str, predictions.shape))}",
+            headers={"X-Model-Version": model_version, "X-Inference-Time": f"{inference_time:.6f}"},
+        )
+
+    payload = {
+        "predictions": predictions,
+        "model_version": model_version,
+        "inference_time": inference_time,
+        "count": int(predictions.shape[0]),
+    }
+    if media_type == MSGPACK and MSGPACK_AVAILABLE:
+        payload["predictions"] = predictions.tolist()
+        return Response(content=msgpack.packb(payload), media_type=MSGPACK)
+    if ORJSON_AVAILABLE:
+        content = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        payload["predictions"] = predictions.tolist()
+        content = json.dumps(payload).encode("utf-8")
+    return Response(content=content, media_type=JSON)
@@ -0,0 +1,250 @@
+"""
+Streaming prediction endpoints
+NDJSON and WebSocket feature streams scored in ordered micro-batches with flow control
+"""
+from typing import AsyncIterator, List, Optional, Tuple
+import asyncio
+import time
+import uuid
+
+import numpy as np
+from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from loguru import logger
+
+from src.api.inference import run_model
+from src.api.serialization import loads_json
+from src.monitoring.metrics import metrics_collector
+
+router = APIRouter(prefix="/stream", tags=["streaming"])
+
+NDJSON = "application/x-ndjson"
+
+try:
+    import orjson
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+# A record is (id, features) where features is None when the input row was invalid
+Record = Tuple[object, Optional[np.ndarray], Optional[str]]
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    Streams results while the request body is still being read.
+
+    The stock response listens for disconnects on ``receive``, which would steal
+    request body chunks from the NDJSON reader. Here the reader consumes
+    ``receive`` itself and ends the stream on disconnect.
+    """
+
+    async def listen_for_disconnect(self, receive) -> None:
+        await asyncio.Event().wait()
+
+
+def parse_record(line: bytes, seq: int) -> Record:
+    """Parse one NDJSON line: either ``{"id": ..., "features": [...]}`` or a bare array"""
+    try:
+        payload = loads_json(line)
+        if isinstance(payload, dict):
+            row_id, features = payload.get("id", seq), payload["features"]
+        else:
+            row_id, features = seq, payload
+        return row_id, np.asarray(features, dtype=np.float64).reshape(-1), None
+    except Exception as e:
+        return seq, None, f"invalid row: {e}"
+
+
+class PredictionStream:
+    """
+    Scores a stream of rows in arrival order.
+
+    A reader task parses incoming rows into a bounded queue whose size is the
+    flow-control window: once ``window`` rows are waiting the reader stops
+    consuming input, which pushes back on the client through the transport.
+    The scorer drains whatever is queued (up to ``max_batch_size`` rows,
+    never more than the window) into one micro-batch, evaluates it off the
+    event loop and emits the results in order.
+    """
+
+    def __init__(self, transport: str, model_version: Optional[str] = None,
+                 max_batch_size: int = 256, window: int = 4096):
+        self.transport = transport
+        self.model_version = model_version
+        # The client's window is a hard limit, so a micro-batch never waits on more rows than it allows
+        self.window = max(1, window)
+        self.max_batch_size = max(1, min(max_batch_size, self.window))
+        self.stream_id = uuid.uuid4().hex[:12]
+        self.stats = {
+            "stream_id": self.stream_id,
+            "transport": transport,
+            "started_at": time.time(),
+            "rows_in": 0,
+            "rows_out": 0,
+            "errors": 0,
+            "batches": 0,
+            "bytes_in": 0,
+            "bytes_out": 0,
+            "backpressure_waits": 0,
+        }
+
+    def _evaluate(self, records: List[Record]) -> List[dict]:
+        """Score valid rows, grouping runs of equal width into single model calls"""
+        results: List[Optional[dict]] = [None] * len(records)
+        start = 0
+        while start < len(records):
+            row_id, features, error = records[start]
+            if features is None:
+                results[start] = {"id": row_id, "error": error}
+                start += 1
+                continue
+            end = start + 1
+            while end < len(records) and records[end][1] is not None and len(records[end][1]) == len(features):
+                end += 1
+            try:
+                predictions, version = run_model(np.stack([r[1] for r in records[start:end]]), self.model_version)
+                for offset, value in enumerate(predictions):
+                    results[start + offset] = {"id": records[start + offset][0],
+                                               "prediction": float(value), "model_version": version}
+            except Exception as e:
+                for offset in range(end - start):
+                    results[start + offset] = {"id": records[start + offset][0], "error": str(e)}
+            start = end
+        return results
+
+    async def _read(self, source: AsyncIterator[Record], queue: asyncio.Queue):
+        try:
+            async for record in source:
+                if queue.full():
+                    self.stats["backpressure_waits"] += 1
+                await queue.put(record)
+                self.stats["rows_in"] += 1
+        finally:
+            await queue.put(None)
+
+    async def run(self, source: AsyncIterator[Record]) -> AsyncIterator[List[dict]]:
+        """Yield ordered lists of result dicts, one list per evaluated micro-batch"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.window)
+        reader = asyncio.create_task(self._read(source, queue))
+        loop = asyncio.get_running_loop()
+        metrics_collector.stream_opened(self.stream_id, self.transport, self.stats)
+        waits_reported = 0
+        try:
+            finished = False
+            while not finished:
+                item = await queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                while len(batch) < self.max_batch_size and not queue.empty():
+                    item = queue.get_nowait()
+                    if item is None:
+                        finished = True
+                        break
+                    batch.append(item)
+
+                results = await loop.run_in_executor(None, self._evaluate, batch)
+                self.stats["batches"] += 1
+                self.stats["rows_out"] += len(results)
+                self.stats["errors"] += sum(1 for r in results if "error" in r)
+                waits = self.stats["backpressure_waits"] - waits_reported
+                waits_reported += waits
+                metrics_collector.record_stream_batch(self.transport, len(results), waits)
+                yield results
+            await reader
+        finally:
+            reader.cancel()
+            elapsed = time.time() - self.stats["started_at"]
+            self.stats["duration"] = elapsed
+            self.stats["rows_per_second"] = self.stats["rows_out"] / elapsed if elapsed > 0 else 0.0
+            metrics_collector.stream_closed(self.stream_id, self.transport)
+
+
+@router.post("/predict")
+async def stream_predict(request: Request, model_version: Optional[str] = None,
+                         max_batch_size: int = 256, window: int = 4096):
+    """
+    Score an NDJSON request stream; results are streamed back as NDJSON in input order.
+
+    Each input line is ``{"id": ..., "features": [...]}`` or a bare feature array.
+    """
+    stream = PredictionStream("ndjson", model_version, max_batch_size, window)
+
+    async def records():
+        buffer, seq = b"", 0
+        async for chunk in request.stream():
+            stream.stats["bytes_in"] += len(chunk)
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield parse_record(line, seq)
+                    seq += 1
+        if buffer.strip():
+            yield parse_record(buffer, seq)
+
+    async def body():
+        async for results in stream.run(records()):
+            chunk = b"".join(dumps(r) + b"\n" for r in results)
+            stream.stats["bytes_out"] += len(chunk)
+            yield chunk
+
+    return DuplexStreamingResponse(body(), media_type=NDJSON, headers={"X-Stream-Id": stream.stream_id})
+
+
+@router.websocket("/ws")
+async def stream_websocket(websocket: WebSocket, model_version: Optional[str] = None,
+                           max_batch_size: int = 256, window: int = 4096,
+                           columns: Optional[int] = None):
+    """
+    Score rows sent as WebSocket frames.
+
+    Text frames carry one or more NDJSON rows; binary frames carry raw
+    little-endian float64 rows of ``columns`` features. The server first sends
+    ``{"type": "window", "rows": N}``; clients should keep at most N rows
+    unacknowledged. Each ``result`` message returns credit for the rows it covers.
+    """
+    await websocket.accept()
+    stream = PredictionStream("websocket", model_version, max_batch_size, window)
+    await websocket.send_json({"type": "window", "rows": stream.window, "stream_id": stream.stream_id})
+
+    async def records():
+        seq = 0
+        while True:
+            try:
+                message = await websocket.receive()
+            except WebSocketDisconnect:
+                return
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes") is not None:
+                data = message["bytes"]
+                stream.stats["bytes_in"] += len(data)
+                if not columns or len(data) % (8 * columns):
+                    yield seq, None, "binary frames need a matching 'columns' query parameter"
+                    seq += 1
+                    continue
+                for row in np.frombuffer(data, dtype="<f8").reshape(-1, columns):
+                    yield seq, row, None
+                    seq += 1
+            elif message.get("text") is not None:
+                text = message["text"].encode("utf-8")
+                stream.stats["bytes_in"] += len(text)
+                for line in text.split(b"\n"):
+                    if line.strip():
+                        yield parse_record(line, seq)
+                        seq += 1
+
+    try:
+        async for results in stream.run(records()):
+            payload = dumps({"type": "result", "results": results, "credit": len(results)}).decode("utf-8")
+            stream.stats["bytes_out"] += len(payload)
+            await websocket.send_text(payload)
+    except WebSocketDisconnect:
+        logger.info(f"Stream {stream.stream_id} disconnected")
@@ -0,0 +1,116 @@
+"""
+Startup warm-up and readiness state for the API
+
+The warm-up runs in a background thread after startup so ``/health`` (liveness)
+answers immediately, while ``/ready`` stays 503 until every step has run.
+"""
+from typing import List, Optional
+import json
+import os
+import threading
+import time
+
+import numpy as np
+from loguru import logger
+
+from src.models.model_manager import model_manager
+from src.monitoring.metrics import metrics_collector
+from src.api.serialization import decode_batch, encode_batch_response, JSON, MSGPACK, NUMPY
+
+DEFAULT_BATCH_SIZES = (1, 32, 256)
+
+
+def batch_sizes_from_env() -> List[int]:
+    value = os.environ.get("WARMUP_BATCH_SIZES")
+    if not value:
+        return list(DEFAULT_BATCH_SIZES)
+    return [int(size) for size in value.split(",") if size.strip()]
+
+
+class Warmup:
+    """Runs the warm-up steps once and reports readiness"""
+
+    def __init__(self, batch_sizes: Optional[List[int]] = None):
+        self.batch_sizes = batch_sizes or batch_sizes_from_env()
+        self.status = "pending"
+        self.started_at = None
+        self.finished_at = None
+        self.steps = []
+        self._thread = None
+        self._done = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def _step(self, name: str, fn):
+        start = time.perf_counter()
+        try:
+            detail = fn()
+            ok = True
+        except Exception as e:
+            # A failed step is reported but does not keep the pod out of rotation forever
+            logger.error(f"Warm-up step {name} failed: {e}")
+            detail, ok = str(e), False
+        self.steps.append({"step": name, "ok": ok, "seconds": time.perf_counter() - start, "detail": detail})
+
+    def _models(self):
+        """Compile circuit templates and grow allocations for every model and batch size"""
+        warmed = []
+        rng = np.random.default_rng(0)
+        for (name, version), artifact in model_manager.models.items():
+            for batch_size in self.batch_sizes:
+                artifact.predict(rng.uniform(0, np.pi, (batch_size, artifact.n_qubits)))
+            warmed.append(f"{name}:{version}")
+        return {"models": warmed, "batch_sizes": self.batch_sizes}
+
+    def _serialization(self):
+        """Run each wire format once per batch size"""
+        for batch_size in self.batch_sizes:
+            features = np.zeros((batch_size, 4))
+            decode_batch(features.astype("<f8").tobytes(), f"{NUMPY}; dtype=float64; columns=4")
+            decode_batch(json.dumps({"features": features.tolist()}).encode(), JSON)
+            for media_type in (JSON, MSGPACK, NUMPY):
+                encode_batch_response(features[:, 0], "warmup", 0.0, media_type)
+        return "ok"
+
+    def _metrics(self):
+        """Create the labelled metric children for every loaded version"""
+        versions = sorted({version for _, version in model_manager.models}) or ["latest"]
+        metrics_collector.prewarm(versions)
+        return {"versions": versions}
+
+    def run(self):
+        self.status = "running"
+        self.started_at = time.time()
+        self._step("models", self._models)
+        self._step("serialization", self._serialization)
+        self._step("metrics", self._metrics)
+        self.finished_at = time.time()
+        self.status = "ready"
+        self._done.set()
+        logger.info(f"Warm-up completed in {self.finished_at - self.started_at:.2f}s")
+
+    def start(self):
+        """Run the warm-up in a background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="api-warmup", daemon=True)
+            self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def report(self) -> dict:
+        duration = None
+        if self.started_at is not None:
+            duration = (self.finished_at or time.time()) - self.started_at
+        return {
+            "status": self.status,
+            "ready": self.ready,
+            "duration": duration,
+            "batch_sizes": self.batch_sizes,
+            "steps": self.steps,
+        }
+
+
+warmup = Warmup()
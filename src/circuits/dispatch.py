@@ -0,0 +1,315 @@
+"""
+Backend Dispatcher
+Unified execution of layered RY/CNOT models across the native batched engine,
+Qiskit and PennyLane, routed to the backend calibrated fastest for each shape
+
+    python -m src.circuits.dispatch --output models/backend_calibration.json
+"""
+from collections import deque, Counter
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TABLE_PATH = "models/backend_calibration.json"
+DEFAULT_BACKEND = "native"
+
+
+def layer_circuit(n_qubits: int, weights):
+    """Qiskit circuit for the weight layers: RY(w_0), then CNOT chain + RY(w_l) per layer"""
+    from qiskit import QuantumCircuit
+
+    qc = QuantumCircuit(n_qubits)
+    for layer, row in enumerate(weights):
+        if layer > 0:
+            for i in range(n_qubits - 1):
+                qc.cx(i, i + 1)
+        for i in range(n_qubits):
+            qc.ry(float(row[i]), i)
+    return qc
+
+
+class NativeBackend:
+    """Batched statevector engine of QuantumCircuitManager (fused gate blocks)"""
+
+    name = "native"
+
+    def __init__(self):
+        self._managers = {}
+
+    def available(self) -> bool:
+        return True
+
+    def run(self, inputs: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        from src.circuits.quantum_manager import QuantumCircuitManager
+
+        n_qubits = inputs.shape[1]
+        manager = self._managers.get(n_qubits)
+        if manager is None:
+            manager = self._managers[n_qubits] = QuantumCircuitManager(n_qubits=n_qubits)
+        # encode_batch already applies the first CNOT chain
+        states = manager.encode_batch(inputs)
+        states = manager.evolve_batch(states, layer_circuit(n_qubits, weights))
+        return manager.z_expectation_batch(states)
+
+
+class QiskitBackend:
+    """One qiskit Statevector simulation per sample"""
+
+    name = "qiskit"
+
+    def available(self) -> bool:
+        return True
+
+    def run(self, inputs: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        from qiskit import QuantumCircuit
+        from qiskit.quantum_info import Statevector
+
+        n_qubits = inputs.shape[1]
+        layers = layer_circuit(n_qubits, weights)
+        sign = 1 - 2 * (np.arange(2 ** n_qubits) & 1)
+        outputs = np.empty(len(inputs))
+        for k, row in enumerate(inputs):
+            qc = QuantumCircuit(n_qubits)
+            for i in range(n_qubits):
+                qc.ry(float(row[i]), i)
+            for i in range(n_qubits - 1):
+                qc.cx(i, i + 1)
+            qc.compose(layers, inplace=True)
+            outputs[k] = Statevector.from_instruction(qc).probabilities() @ sign
+        return outputs
+
+
+class PennyLaneBackend:
+    """PennyLane default.qubit with parameter broadcasting over the batch"""
+
+    name = "pennylane"
+
+    def __init__(self):
+        self._qnodes = {}
+
+    def available(self) -> bool:
+        try:
+            import pennylane  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def _qnode(self, n_qubits: int):
+        import pennylane as qml
+
+        qnode = self._qnodes.get(n_qubits)
+        if qnode is None:
+            dev = qml.device("default.qubit", wires=n_qubits)
+
+            @qml.qnode(dev)
+            def circuit(inputs, weights):
+                for i in range(n_qubits):
+                    qml.RY(inputs[:, i], wires=i)
+                for layer in range(len(weights)):
+                    for i in range(n_qubits - 1):
+                        qml.CNOT(wires=[i, i + 1])
+                    for i in range(n_qubits):
+                        qml.RY(weights[layer][i], wires=i)
+                return qml.expval(qml.PauliZ(0))
+
+            qnode = self._qnodes[n_qubits] = circuit
+        return qnode
+
+    def run(self, inputs: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        return np.atleast_1d(np.asarray(self._qnode(inputs.shape[1])(inputs, weights), dtype=float))
+
+
+BACKENDS = {"native": NativeBackend, "qiskit": QiskitBackend, "pennylane": PennyLaneBackend}
+
+
+def shape_key(n_qubits: int, depth: int, batch_size: int) -> str:
+    return f"q{n_qubits}_d{depth}_b{batch_size}"
+
+
+def parse_shape_key(key: str) -> Tuple[int, int, int]:
+    q, d, b = key.split("_")
+    return int(q[1:]), int(d[1:]), int(b[1:])
+
+
+class BackendDispatcher:
+    """
+    Runs ``inputs -> RY encoding -> [CNOT chain, RY(weights[l])] per layer -> <Z_0>``
+    on whichever available backend the calibration table says is fastest.
+
+    This is the model of both ``BasicCircuits.create_penny_lane_circuit`` and
+    ``QuantumCircuitManager.predict_batch`` (weights = parameters reshaped to
+    ``(2, n_qubits)``). Shapes missing from the table use the nearest
+    calibrated shape in log space.
+    """
+
+    def __init__(self, table_path: Optional[str] = DEFAULT_TABLE_PATH, backends: Optional[Sequence[str]] = None,
+                 history: int = 1000):
+        self.table_path = Path(table_path) if table_path else None
+        self.backends = {}
+        for name in backends or BACKENDS:
+            backend = BACKENDS[name]()
+            if backend.available():
+                self.backends[name] = backend
+            else:
+                logger.info(f"Backend {name} not available")
+        self.table: Dict[str, Dict[str, float]] = {}
+        self.calibration_info: Dict[str, object] = {}
+        self.decisions = deque(maxlen=history)
+        self.counts = Counter()
+        self.runtime = Counter()
+        self._lock = threading.Lock()
+        if self.table_path is not None and self.table_path.exists():
+            self.load_table(self.table_path)
+
+    # ------------------------------------------------------------------
+    # Calibration table
+    # ------------------------------------------------------------------
+    def load_table(self, path):
+        with open(path) as f:
+            data = json.load(f)
+        self.table = data.get("timings", {})
+        self.calibration_info = {k: v for k, v in data.items() if k != "timings"}
+        logger.info(f"Loaded backend calibration for {len(self.table)} shapes from {path}")
+
+    def save_table(self, path=None):
+        path = Path(path or self.table_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps({**self.calibration_info, "timings": self.table}, indent=2))
+        tmp.replace(path)
+        return path
+
+    def calibrate(self, n_qubits_grid: Sequence[int] = (2, 4, 6, 8), depth_grid: Sequence[int] = (1, 2, 4),
+                  batch_grid: Sequence[int] = (1, 32, 256), repeats: int = 3, seed: int = 0,
+                  save: bool = True) -> Dict[str, Dict[str, float]]:
+        """Time every available backend on a grid of shapes (median of ``repeats``)"""
+        rng = np.random.default_rng(seed)
+        for n_qubits in n_qubits_grid:
+            for depth in depth_grid:
+                for batch_size in batch_grid:
+                    inputs = rng.uniform(0, np.pi, (batch_size, n_qubits))
+                    weights = rng.uniform(0, 2 * np.pi, (depth, n_qubits))
+                    timings = {}
+                    for name, backend in self.backends.items():
+                        backend.run(inputs, weights)  # warm-up: imports, caches, compilation
+                        samples = []
+                        for _ in range(repeats):
+                            start = time.perf_counter()
+                            backend.run(inputs, weights)
+                            samples.append(time.perf_counter() - start)
+                        timings[name] = float(np.median(samples))
+                    self.table[shape_key(n_qubits, depth, batch_size)] = timings
+                    logger.info(f"Calibrated q={n_qubits} d={depth} b={batch_size}: {timings}")
+        self.calibration_info = {
+            "calibrated_at": time.time(),
+            "host": platform.node(),
+            "backends": sorted(self.backends),
+            "repeats": repeats,
+        }
+        if save and self.table_path is not None:
+            self.save_table()
+        return self.table
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+    def _nearest(self, n_qubits: int, depth: int, batch_size: int) -> Optional[str]:
+        best, best_distance = None, math.inf
+        target = np.log2([n_qubits, depth, batch_size])
+        for key in self.table:
+            distance = float(np.sum((np.log2(parse_shape_key(key)) - target) ** 2))
+            # Qubit count dominates cost, so weight it heavily
+            distance += 3 * (np.log2(parse_shape_key(key)[0]) - target[0]) ** 2
+            if distance < best_distance:
+                best, best_distance = key, distance
+        return best
+
+    def choose(self, n_qubits: int, depth: int, batch_size: int) -> Tuple[str, str]:
+        """``(backend, reason)`` for a request shape"""
+        key = shape_key(n_qubits, depth, batch_size)
+        reason = "calibrated"
+        if key not in self.table:
+            key = self._nearest(n_qubits, depth, batch_size)
+            reason = f"nearest:{key}"
+        timings = {name: t for name, t in self.table.get(key, {}).items() if name in self.backends}
+        if not timings:
+            fallback = DEFAULT_BACKEND if DEFAULT_BACKEND in self.backends else next(iter(self.backends))
+            return fallback, "default"
+        return min(timings, key=timings.get), reason
+
+    def run(self, inputs, weights, backend: Optional[str] = None) -> np.ndarray:
+        """Evaluate the model for a batch of inputs; ``backend`` overrides dispatch"""
+        inputs = np.atleast_2d(np.asarray(inputs, dtype=float))
+        weights = np.atleast_2d(np.asarray(weights, dtype=float))
+        n_qubits, depth, batch_size = inputs.shape[1], weights.shape[0], inputs.shape[0]
+        if backend is None:
+            backend, reason = self.choose(n_qubits, depth, batch_size)
+        else:
+            reason = "explicit"
+        start = time.perf_counter()
+        outputs = self.backends[backend].run(inputs, weights)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.counts[backend] += 1
+            self.runtime[backend] += elapsed
+            self.decisions.append({
+                "timestamp": time.time(),
+                "n_qubits": n_qubits,
+                "depth": depth,
+                "batch_size": batch_size,
+                "backend": backend,
+                "reason": reason,
+                "elapsed": elapsed,
+            })
+        return outputs
+
+    def report(self, recent: int = 20) -> dict:
+        with self._lock:
+            decisions = list(self.decisions)[-recent:]
+            usage = {name: {"calls": self.counts[name], "total_seconds": self.runtime[name]} for name in self.counts}
+        return {
+            "backends": sorted(self.backends),
+            "calibration": {**self.calibration_info, "shapes": len(self.table)},
+            "timings": self.table,
+            "usage": usage,
+            "recent_decisions": decisions,
+        }
+
+
+dispatcher = BackendDispatcher(os.environ.get("BACKEND_CALIBRATION", DEFAULT_TABLE_PATH))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrate simulation backends")
+    parser.add_argument("--output", default=DEFAULT_TABLE_PATH)
+    parser.add_argument("--qubits", type=int, nargs="+", default=[2, 4, 6, 8])
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32, 256])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--backends", nargs="+", choices=sorted(BACKENDS))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+    calibrator = BackendDispatcher(None, backends=args.backends)
+    calibrator.table_path = Path(args.output)
+    table = calibrator.calibrate(args.qubits, args.depths, args.batch_sizes, repeats=args.repeats)
+    print(json.dumps({key: min(t, key=t.get) for key, t in table.items()}, indent=2))
+    return table
+
+
+if __name__ == "__main__":
+    main()
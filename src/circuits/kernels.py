@@ -0,0 +1,144 @@
+"""
+Quantum Kernel Engine
+Fidelity kernels over the encoding feature map, evaluated block-wise from cached statevectors
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+import logging
+import os
+import tempfile
+
+import numpy as np
+
+from src.circuits.quantum_manager import QuantumCircuitManager
+
+logger = logging.getLogger(__name__)
+
+
+def _fidelity_block(left, right):
+    """|<a|b>|^2 for every pair of rows in two blocks of statevectors"""
+    overlaps = left.conj() @ right.T
+    return overlaps.real ** 2 + overlaps.imag ** 2
+
+
+def _kernel_tile_worker(task):
+    """Compute one output tile in a worker process and write it into the shared memmap"""
+    left_path, right_path, out_path, shape, rows, cols, mirror = task
+    left = np.load(left_path, mmap_mode="r")
+    right = np.load(right_path, mmap_mode="r") if right_path != left_path else left
+    out = np.memmap(out_path, dtype=np.float64, mode="r+", shape=shape)
+    tile = _fidelity_block(left[rows[0]:rows[1]], right[cols[0]:cols[1]])
+    out[rows[0]:rows[1], cols[0]:cols[1]] = tile
+    if mirror:
+        out[cols[0]:cols[1], rows[0]:rows[1]] = tile.T
+    out.flush()
+    return rows, cols
+
+
+class QuantumKernel:
+    """
+    Fidelity quantum kernel K(x, y) = |<psi(x)|psi(y)>|^2 for the encoding circuit.
+
+    Every sample is simulated exactly once (via ``QuantumCircuitManager.encode_batch``);
+    the Gram matrix is then assembled from blocked complex matrix products. Training
+    Gram matrices only evaluate the upper-triangular tiles and mirror them. Large
+    matrices can be streamed tile by tile into a memory-mapped file and tiles can be
+    spread over a process pool.
+
+    Instances are callable with the scikit-learn kernel signature, e.g.
+    ``SVC(kernel=QuantumKernel(n_qubits=4))``.
+    """
+
+    def __init__(self,
+                 circuit_manager: Optional[QuantumCircuitManager] = None,
+                 n_qubits: int = 4,
+                 block_size: int = 1024,
+                 n_jobs: int = 1):
+        self.circuit_manager = circuit_manager or QuantumCircuitManager(n_qubits=n_qubits)
+        self.block_size = block_size
+        self.n_jobs = n_jobs
+
+    def encode(self, X):
+        """Simulate the feature map once per sample"""
+        return self.circuit_manager.encode_batch(X)
+
+    def __call__(self, X, Y=None):
+        # scikit-learn passes the training matrix twice when fitting
+        if Y is X:
+            Y = None
+        return self.evaluate(X, Y)
+
+    def _tiles(self, n_rows, n_cols, symmetric):
+        """Yield (rows, cols, mirror) tile bounds, skipping the lower triangle when symmetric"""
+        for r0 in range(0, n_rows, self.block_size):
+            r1 = min(r0 + self.block_size, n_rows)
+            c_start = r0 if symmetric else 0
+            for c0 in range(c_start, n_cols, self.block_size):
+                c1 = min(c0 + self.block_size, n_cols)
+                yield (r0, r1), (c0, c1), symmetric and c0 != r0
+
+    def evaluate(self, X, Y=None, out_path: Optional[str] = None, callback=None):
+        """
+        Compute the kernel matrix between X and Y (or the Gram matrix of X).
+
+        When ``out_path`` is given the result is streamed to a float64
+        ``np.memmap`` at that path and the memmap is returned. ``callback`` is
+        called as ``callback(tiles_done, tiles_total)`` after every tile.
+        """
+        symmetric = Y is None
+        left = self.encode(X)
+        right = left if symmetric else self.encode(Y)
+        shape = (left.shape[0], right.shape[0])
+
+        if self.n_jobs != 1:
+            return self._evaluate_parallel(left, right, shape, symmetric, out_path, callback)
+
+        if out_path is not None:
+            out = np.memmap(out_path, dtype=np.float64, mode="w+", shape=shape)
+        else:
+            out = np.empty(shape, dtype=np.float64)
+
+        tiles = list(self._tiles(shape[0], shape[1], symmetric))
+        for done, (rows, cols, mirror) in enumerate(tiles, 1):
+            tile = _fidelity_block(left[rows[0]:rows[1]], right[cols[0]:cols[1]])
+            out[rows[0]:rows[1], cols[0]:cols[1]] = tile
+            if mirror:
+                out[cols[0]:cols[1], rows[0]:rows[1]] = tile.T
+            if callback is not None:
+                callback(done, len(tiles))
+
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out
+
+    def _evaluate_parallel(self, left, right, shape, symmetric, out_path, callback=None):
+        """Spread tiles over worker processes sharing memory-mapped inputs and output"""
+        n_workers = self.n_jobs if self.n_jobs > 0 else os.cpu_count()
+        with tempfile.TemporaryDirectory(prefix="qkernel_") as tmpdir:
+            left_path = str(Path(tmpdir) / "left.npy")
+            np.save(left_path, left)
+            right_path = left_path
+            if not symmetric:
+                right_path = str(Path(tmpdir) / "right.npy")
+                np.save(right_path, right)
+
+            target = out_path or str(Path(tmpdir) / "kernel.dat")
+            out = np.memmap(target, dtype=np.float64, mode="w+", shape=shape)
+            del out
+
+            tasks = [
+                (left_path, right_path, target, shape, rows, cols, mirror)
+                for rows, cols, mirror in self._tiles(shape[0], shape[1], symmetric)
+            ]
+            logger.info(f"Evaluating {len(tasks)} kernel tiles on {n_workers} processes")
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                for done, _ in enumerate(pool.map(_kernel_tile_worker, tasks), 1):
+                    if callback is not None:
+                        callback(done, len(tasks))
+
+            result = np.memmap(target, dtype=np.float64, mode="r+", shape=shape)
+            if out_path is None:
+                # The temporary file disappears with the directory; keep an in-memory copy
+                return np.array(result)
+            return result
@@ -3,17 +3,26 @@ Quantum Circuit Manager using Qiskit - Minimal Version
 Uses only core Qiskit components to avoid dependency issues
 """
 from qiskit import QuantumCircuit
-from qiskit.quantum_info import Statevector, SparsePauliOp
+from qiskit.quantum_info import Statevector, SparsePauliOp, Operator
 import numpy as np
 import logging
 
+from src.circuits.optimization import CircuitOptimizer, apply_unitary, light_cone
+from src.circuits.shots import AdaptiveShotEstimator
+from src.circuits.shadows import sample_shadow
+from src.circuits.cutting import CircuitCutter
+
 logger = logging.getLogger(__name__)
 
 class QuantumCircuitManager:
     """Manages quantum circuits and operations for ML"""
     
-    def __init__(self, n_qubits=4):
+    def __init__(self, n_qubits=4, optimize=True, prune=True):
         self.n_qubits = n_qubits
+        # Simplify and fuse circuits before simulation unless disabled
+        self.optimizer = CircuitOptimizer() if optimize else None
+        # Simulate only the light cone of the measured qubits for expectation values
+        self.prune = prune
         self._setup_logging()
     
     def _setup_logging(self):
@@ -35,6 +44,41 @@ class QuantumCircuitManager:
         
         return qc
     
+    def encode_batch(self, features_batch):
+        """
+        Simulate create_encoding_circuit for every row of a feature matrix at once.
+        
+        Returns an array of shape (n_samples, 2**n_qubits) whose rows are the
+        encoded statevectors in Qiskit's little-endian ordering.
+        """
+        features_batch = np.atleast_2d(np.asarray(features_batch, dtype=float))
+        n_samples = features_batch.shape[0]
+        n_features = min(features_batch.shape[1], self.n_qubits)
+        
+        # RY rotations on |0> give a product state; build it qubit by qubit (qubit 0 least significant)
+        states = np.ones((n_samples, 1), dtype=complex)
+        for i in range(self.n_qubits):
+            if i < n_features:
+                half = features_batch[:, i] / 2
+                local = np.stack([np.cos(half), np.sin(half)], axis=1)
+            else:
+                local = np.tile([1.0, 0.0], (n_samples, 1))
+            states = (local[:, :, None] * states[:, None, :]).reshape(n_samples, -1)
+        
+        # The CX entangling chain is a fixed permutation of amplitudes
+        return states[:, self._entangler_permutation()]
+    
+    def _entangler_permutation(self):
+        """Index permutation equivalent to the linear CX chain of the encoding circuit"""
+        perm = getattr(self, "_cx_chain_perm", None)
+        if perm is None or len(perm) != 2 ** self.n_qubits:
+            perm = np.arange(2 ** self.n_qubits)
+            for i in range(self.n_qubits - 1):
+                index = np.arange(2 ** self.n_qubits)
+                perm = perm[index ^ (((index >> i) & 1) << (i + 1))]
+            self._cx_chain_perm = perm
+        return perm
+    
     def create_variational_circuit(self, parameters):
         """Create a parameterized variational circuit for ML"""
         qc = QuantumCircuit(self.n_qubits)
@@ -53,15 +97,39 @@ class QuantumCircuitManager:
         
         return qc
     
+    def evolve_batch(self, states, circuit):
+        """Apply a (parameter-bound) circuit to every row of a batch of statevectors"""
+        blocks = None
+        if self.optimizer is not None:
+            blocks, _ = self.optimizer.fuse(circuit)
+        if blocks is None:
+            blocks = [(tuple(range(circuit.num_qubits)), Operator(circuit).data)]
+        for qubits, matrix in blocks:
+            states = apply_unitary(states, matrix, qubits, circuit.num_qubits)
+        return states
+    
+    def z_expectation_batch(self, states, qubit=0):
+        """<Z> on one qubit for every row of a batch of statevectors"""
+        probs = np.abs(states) ** 2
+        sign = 1 - 2 * ((np.arange(states.shape[-1]) >> qubit) & 1)
+        return probs @ sign
+    
+    def predict_batch(self, features_batch, parameters, states=None):
+        """Model output <Z_0> of encoding + variational circuit for a batch of samples"""
+        if states is None:
+            states = self.encode_batch(features_batch)
+        evolved = self.evolve_batch(states, self.create_variational_circuit(parameters))
+        return self.z_expectation_batch(evolved)
+    
     def get_expectation_value(self, circuit, observable=None):
         """Get expectation value using statevector simulation"""
         if observable is None:
-            # Default: measure Z on first qubit
-            pauli_list = ['Z'] + ['I'] * (self.n_qubits - 1)
-            observable = SparsePauliOp(pauli_list)
+            # Default: Z on qubit 0 (rightmost label character in little-endian order)
+            observable = SparsePauliOp('I' * (circuit.num_qubits - 1) + 'Z')
         
         # Use statevector for expectation value
-        statevector = Statevector.from_instruction(circuit)
+        circuit, observable = self._prune(circuit, observable)
+        statevector = self._simulate(circuit)
         
         # Calculate expectation value properly
         # For Pauli Z measurement, this should be in range [-1, 1]
@@ -81,7 +149,10 @@ class QuantumCircuitManager:
     
     def get_simple_expectation(self, circuit):
         """Simpler expectation value calculation for Z on first qubit"""
-        statevector = Statevector.from_instruction(circuit)
+        if self.prune:
+            # Qubit 0 stays local qubit 0 of the light-cone register
+            circuit, _ = light_cone(circuit, [0])
+        statevector = self._simulate(circuit)
         
         # Manual calculation for Z expectation on first qubit
         # This is more reliable: <ψ|Z⊗I|ψ> = prob(|0⟩) - prob(|1⟩)
@@ -96,15 +167,74 @@ class QuantumCircuitManager:
     
     def run_simulation(self, circuit, shots=1000):
         """Run circuit simulation using statevector sampling"""
-        statevector = Statevector.from_instruction(circuit)
+        statevector = self._simulate(circuit)
         
         # Sample from the statevector
         counts = statevector.sample_counts(shots=shots)
         return counts
     
+    def estimate_expectation(self, circuit, observable=None, estimator=None):
+        """
+        Shot-based estimate of an observable with adaptive allocation across its
+        Pauli terms; returns the value, standard error, CI and shots used
+        """
+        if observable is None:
+            # Z on qubit 0 (rightmost label character in little-endian order)
+            observable = SparsePauliOp('I' * (circuit.num_qubits - 1) + 'Z')
+        estimator = estimator or AdaptiveShotEstimator()
+        circuit, observable = self._prune(circuit, observable)
+        return estimator.estimate(self._simulate(circuit), observable)
+    
+    def classical_shadow(self, circuit, n_snapshots=10000, seed=None):
+        """
+        Randomized-measurement snapshots of the circuit's output state; estimate
+        any number of local Pauli observables from them without re-simulating
+        """
+        return sample_shadow(self._simulate(circuit), n_snapshots, seed)
+    
+    def cut_expectation(self, circuit, observable=None, max_width=12, workers=1, return_report=False):
+        """
+        Expectation value of a circuit too wide to simulate densely, by cutting
+        it into fragments of at most ``max_width`` qubits (default Z on qubit 0)
+        """
+        if observable is None:
+            observable = SparsePauliOp('I' * (circuit.num_qubits - 1) + 'Z')
+        circuit, observable = self._prune(circuit, observable)
+        return CircuitCutter(max_width=max_width, workers=workers).expectation(circuit, observable, return_report)
+    
     def compute_statevector(self, circuit):
         """Compute the statevector of a circuit"""
-        return Statevector.from_instruction(circuit)
+        return self._simulate(circuit)
+    
+    def optimization_report(self, circuit):
+        """Report gate-count and simulated-FLOP reduction from the optimization passes"""
+        if self.optimizer is None:
+            return None
+        return self.optimizer.report(circuit)
+    
+    def _prune(self, circuit, observable):
+        """
+        Restrict a circuit and observable to the backward light cone of the
+        observable's support; gates outside it cannot change the expectation
+        """
+        if not self.prune:
+            return circuit, observable
+        observable = SparsePauliOp(observable)
+        k = observable.num_qubits
+        labels = observable.paulis.to_labels()
+        # An observable narrower than the circuit acts on its first k qubits
+        support = sorted({q for label in labels for q in range(k) if label[k - 1 - q] != 'I'}) or [0]
+        reduced, order = light_cone(circuit, support)
+        if len(order) == circuit.num_qubits:
+            return circuit, observable
+        restricted = [''.join(label[k - 1 - q] if q < k else 'I' for q in reversed(order)) for label in labels]
+        return reduced, SparsePauliOp(restricted, observable.coeffs)
+    
+    def _simulate(self, circuit):
+        """Simulate a circuit, running the optimization pipeline first when enabled"""
+        if self.optimizer is None:
+            return Statevector.from_instruction(circuit)
+        return self.optimizer.simulate(circuit)
 
 # Example usage and testing
 if __name__ == "__main__":
@@ -0,0 +1,158 @@
+"""
+Classical Shadows
+Randomized single-qubit Pauli measurements, stored once and reused to estimate
+many local Pauli observables and fidelities with median-of-means
+"""
+from typing import Optional, Sequence, Tuple, Union
+import logging
+import math
+
+import numpy as np
+
+from src.circuits.optimization import apply_unitary
+
+logger = logging.getLogger(__name__)
+
+# Basis codes stored in the snapshot arrays
+PAULI_CODES = {"X": 0, "Y": 1, "Z": 2}
+
+_H = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
+_SDG = np.diag([1, -1j])
+# Rotation applied before a Z-basis measurement to measure in X, Y or Z
+BASIS_ROTATIONS = (_H, _H @ _SDG, np.eye(2, dtype=complex))
+
+# Single-qubit snapshot inverses 3 U^dag |b><b| U - I, indexed [basis, bit]
+_SNAPSHOT_INVERSES = np.array([
+    [3 * np.outer(U.conj().T[:, b], U[b, :]) - np.eye(2) for b in (0, 1)]
+    for U in BASIS_ROTATIONS
+])
+
+
+def shadow_size(n_observables: int, locality: int, epsilon: float, delta: float = 0.01) -> Tuple[int, int]:
+    """
+    Snapshots and median-of-means groups needed so every one of
+    ``n_observables`` ``locality``-local Pauli estimates is within ``epsilon``
+    with probability ``1 - delta`` (Huang, Kueng & Preskill bound).
+
+    The snapshot count grows with ``log(n_observables)``.
+    """
+    n_groups = int(math.ceil(2 * math.log(2 * n_observables / delta)))
+    per_group = int(math.ceil(34 * 3 ** locality / epsilon ** 2))
+    return n_groups * per_group, n_groups
+
+
+def parse_pauli(label: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Qubits and basis codes of the non-identity factors of a Qiskit Pauli label"""
+    qubits, codes = [], []
+    for q, char in enumerate(reversed(label.upper())):
+        if char != "I":
+            qubits.append(q)
+            codes.append(PAULI_CODES[char])
+    return np.array(qubits, dtype=np.int64), np.array(codes, dtype=np.uint8)
+
+
+class ClassicalShadow:
+    """
+    A set of randomized-measurement snapshots.
+
+    ``bases[s, q]`` is the Pauli basis (0=X, 1=Y, 2=Z) measured on qubit ``q``
+    in snapshot ``s`` and ``outcomes[s, q]`` the measured bit, both uint8.
+    """
+
+    def __init__(self, bases: np.ndarray, outcomes: np.ndarray):
+        self.bases = np.ascontiguousarray(bases, dtype=np.uint8)
+        self.outcomes = np.ascontiguousarray(outcomes, dtype=np.uint8)
+
+    @property
+    def n_snapshots(self) -> int:
+        return self.bases.shape[0]
+
+    @property
+    def n_qubits(self) -> int:
+        return self.bases.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.bases.nbytes + self.outcomes.nbytes
+
+    def _median_of_means(self, values: np.ndarray, n_groups: int) -> np.ndarray:
+        """Median over groups of per-group means along the snapshot axis"""
+        n_groups = max(1, min(n_groups, values.shape[-1]))
+        means = [chunk.mean(axis=-1) for chunk in np.array_split(values, n_groups, axis=-1)]
+        return np.median(np.stack(means), axis=0)
+
+    def pauli_snapshots(self, label: str) -> np.ndarray:
+        """Single-snapshot estimates of a Pauli observable: 3^k * sign or 0"""
+        qubits, codes = parse_pauli(label)
+        if len(qubits) == 0:
+            return np.ones(self.n_snapshots)
+        match = np.all(self.bases[:, qubits] == codes, axis=1)
+        signs = 1 - 2 * (np.sum(self.outcomes[:, qubits], axis=1, dtype=np.int64) % 2)
+        return match * signs * float(3 ** len(qubits))
+
+    def estimate(self, observables: Union[str, Sequence[str], "SparsePauliOp"], n_groups: int = 10):
+        """
+        Estimate Pauli labels (one value each) or a SparsePauliOp (its
+        coefficient-weighted sum) from the stored snapshots.
+        """
+        if isinstance(observables, str):
+            return float(self.estimate([observables], n_groups)[0])
+        if hasattr(observables, "paulis"):
+            terms = np.stack([self.pauli_snapshots(label) for label in observables.paulis.to_labels()])
+            combined = np.real(observables.coeffs) @ terms
+            return float(self._median_of_means(combined, n_groups))
+        snapshots = np.stack([self.pauli_snapshots(label) for label in observables])
+        return self._median_of_means(snapshots, n_groups)
+
+    def estimate_fidelity(self, target_state, n_groups: int = 10, chunk_size: int = 1024) -> float:
+        """Fidelity <psi|rho|psi> with a pure target state"""
+        psi = np.asarray(getattr(target_state, "data", target_state), dtype=complex)
+        n = self.n_qubits
+        values = np.empty(self.n_snapshots)
+        for start in range(0, self.n_snapshots, chunk_size):
+            bases = self.bases[start:start + chunk_size]
+            outcomes = self.outcomes[start:start + chunk_size]
+            m = len(bases)
+            tensor = np.broadcast_to(psi.reshape((1,) + (2,) * n), (m,) + (2,) * n).copy()
+            for q in range(n):
+                axis = 1 + (n - 1 - q)
+                local = _SNAPSHOT_INVERSES[bases[:, q], outcomes[:, q]]
+                tensor = np.moveaxis(np.einsum("mab,m...b->m...a", local, np.moveaxis(tensor, axis, -1)), -1, axis)
+            values[start:start + m] = np.real(tensor.reshape(m, -1) @ psi.conj())
+        return float(self._median_of_means(values, n_groups))
+
+    def save(self, path):
+        np.savez_compressed(path, bases=self.bases, outcomes=self.outcomes)
+
+    @classmethod
+    def load(cls, path) -> "ClassicalShadow":
+        with np.load(path) as data:
+            return cls(data["bases"], data["outcomes"])
+
+
+def sample_shadow(state, n_snapshots: int, seed: Optional[int] = None) -> ClassicalShadow:
+    """
+    Draw ``n_snapshots`` randomized Pauli-basis measurements of a statevector.
+
+    Snapshots sharing a basis are sampled together from one rotated state, so
+    the cost is bounded by the number of distinct bases drawn.
+    """
+    rng = np.random.default_rng(seed)
+    psi = np.asarray(getattr(state, "data", state), dtype=complex)
+    n = int(np.log2(psi.shape[0]))
+    bases = rng.integers(0, 3, size=(n_snapshots, n), dtype=np.uint8)
+    outcomes = np.empty((n_snapshots, n), dtype=np.uint8)
+
+    unique, inverse = np.unique(bases, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    bit_positions = np.arange(n)
+    for index, basis in enumerate(unique):
+        rows = np.flatnonzero(inverse == index)
+        rotated = psi
+        for q in range(n):
+            if basis[q] != PAULI_CODES["Z"]:
+                rotated = apply_unitary(rotated, BASIS_ROTATIONS[basis[q]], (q,), n)
+        probs = np.abs(rotated) ** 2
+        samples = rng.choice(len(probs), size=len(rows), p=probs / probs.sum())
+        outcomes[rows] = (samples[:, None] >> bit_positions) & 1
+    return ClassicalShadow(bases, outcomes)
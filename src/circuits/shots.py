@@ -0,0 +1,129 @@
+"""
+Adaptive Shot Allocation
+Sample expectation values in rounds until a confidence-interval target is met
+"""
+from typing import Dict, Optional
+import logging
+
+import numpy as np
+from scipy.stats import norm
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveShotEstimator:
+    """
+    Estimates <H> = sum_j c_j <P_j> from +/-1 measurement outcomes of each term.
+
+    Every term first gets ``initial_shots``. After each round the per-shot
+    variance of each term is re-estimated (Laplace-smoothed, so a term never
+    looks noiseless after a few identical outcomes) and the next round is split
+    across terms proportionally to ``|c_j| * sigma_j`` (Neyman allocation),
+    sized to reach the target. A round never more than doubles the shots spent
+    so far, which keeps early variance estimates from overshooting. Sampling
+    stops once ``z * std_error <= target_error`` or ``max_shots`` is used.
+    Zero-coefficient terms get no shots, so an all-zero observable is 0 for free.
+    """
+
+    def __init__(self, target_error: float = 0.02, confidence: float = 0.95,
+                 initial_shots: int = 64, max_shots: int = 100000, max_rounds: int = 20,
+                 seed: Optional[int] = None):
+        self.target_error = target_error
+        self.confidence = confidence
+        self.z = float(norm.ppf(0.5 + confidence / 2))
+        self.initial_shots = initial_shots
+        self.max_shots = max_shots
+        self.max_rounds = max_rounds
+        self.rng = np.random.default_rng(seed)
+        self.total_shots = 0
+
+    def estimate_batch(self, expectations, coefficients=None) -> Dict[str, np.ndarray]:
+        """
+        Adaptive estimates for many independent circuits at once.
+
+        ``expectations`` holds the exact per-term values <P_j>, shape
+        ``(n_circuits, n_terms)`` (a 1-D array is one term per circuit); the
+        measurement outcomes are drawn from them. Each circuit stops on its own.
+        """
+        exact = np.asarray(expectations, dtype=float)
+        if exact.ndim == 1:
+            exact = exact[:, None]
+        n_circuits, n_terms = exact.shape
+        coeffs = np.ones(n_terms) if coefficients is None else np.real(np.asarray(coefficients, dtype=complex))
+        weights_c = np.abs(coeffs)
+        p_plus = np.clip((1 + exact) / 2, 0.0, 1.0)
+
+        plus = np.zeros((n_circuits, n_terms))
+        shots = np.zeros((n_circuits, n_terms), dtype=np.int64)
+        active = np.ones(n_circuits, dtype=bool)
+        alloc = np.full((n_circuits, n_terms), min(self.initial_shots, max(1, self.max_shots // n_terms)),
+                        dtype=np.int64)
+        alloc[:, weights_c == 0] = 0
+        rounds = 0
+
+        while True:
+            plus += self.rng.binomial(alloc, p_plus)
+            shots += alloc
+            rounds += 1
+
+            n = np.maximum(shots, 1)
+            q = (plus + 1) / (shots + 2)
+            sigma = 2 * np.sqrt(q * (1 - q))
+            std_error = np.sqrt(np.sum((weights_c * sigma) ** 2 / n * (shots > 0), axis=1))
+            used = shots.sum(axis=1)
+            remaining = self.max_shots - used
+            active &= (self.z * std_error > self.target_error) & (remaining > 0)
+            if not active.any() or rounds >= self.max_rounds:
+                break
+
+            # Neyman allocation of the total needed to hit the target
+            weights = weights_c * sigma
+            weight_sum = weights.sum(axis=1, keepdims=True)
+            # Zero-coefficient terms are never sampled; an all-zero row is already inactive
+            share = np.divide(weights, weight_sum, out=np.zeros_like(weights), where=weight_sum > 0)
+            if self.target_error > 0:
+                needed = (weight_sum[:, 0] * self.z / self.target_error) ** 2
+            else:
+                # No target: spend the whole budget
+                needed = remaining.astype(float)
+            target = needed[:, None] * share
+            alloc = np.ceil(np.maximum(target - shots, 0)).astype(np.int64)
+
+            cap = np.minimum(remaining, np.maximum(used, self.initial_shots))
+            floor = np.minimum(remaining, self.initial_shots)
+            total = alloc.sum(axis=1)
+            over = total > cap
+            alloc[over] = np.floor(alloc[over] * (cap[over] / total[over])[:, None]).astype(np.int64)
+            under = alloc.sum(axis=1) < floor
+            alloc[under] = np.ceil(floor[under, None] * share[under]).astype(np.int64)
+            alloc[~active] = 0
+
+        means = np.where(shots > 0, 2 * plus / np.maximum(shots, 1) - 1, 0.0)
+        value = means @ coeffs
+        spent = shots.sum(axis=1)
+        self.total_shots += int(spent.sum())
+        half_width = self.z * std_error
+        return {
+            "value": value,
+            "std_error": std_error,
+            "ci_low": value - half_width,
+            "ci_high": value + half_width,
+            "shots": spent,
+            "shots_per_term": shots,
+            "converged": half_width <= self.target_error,
+            "rounds": rounds,
+        }
+
+    def estimate(self, statevector, observable) -> Dict[str, object]:
+        """Adaptive estimate of ``observable`` (a SparsePauliOp) on a statevector"""
+        exact = [np.real(statevector.expectation_value(pauli)) for pauli in observable.paulis]
+        result = self.estimate_batch(np.array(exact)[None, :], observable.coeffs)
+        return {
+            "value": float(result["value"][0]),
+            "std_error": float(result["std_error"][0]),
+            "ci": (float(result["ci_low"][0]), float(result["ci_high"][0])),
+            "shots": int(result["shots"][0]),
+            "shots_per_term": dict(zip(observable.paulis.to_labels(), result["shots_per_term"][0].tolist())),
+            "converged": bool(result["converged"][0]),
+            "rounds": result["rounds"],
+        }
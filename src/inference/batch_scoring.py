@@ -0,0 +1,232 @@
+"""
+Offline Bulk Scoring
+Streams CSV/Parquet input in chunks through a process pool of model workers
+
+    python -m src.inference.batch_scoring --model models/trained_model.qmla \\
+        --input data/scoring.parquet --output predictions/ --chunk-size 100000 --workers 8
+
+Each chunk's predictions are written as its own Parquet (or CSV) part file in
+the output directory, atomically, so an interrupted run resumes by skipping
+chunks whose part already exists. The run configuration is recorded in
+``_progress.json`` and a resume with a different model, input or chunking is
+refused, since part indices would no longer line up. At most ``2 * workers`` chunks are in
+flight at any time, which bounds memory regardless of input size.
+"""
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+import argparse
+import json
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_FILE = "_progress.json"
+
+
+class ResumeError(ValueError):
+    """The output directory holds parts from a run with a different configuration"""
+
+# Model held by each worker process, loaded once by the pool initializer
+_worker_model = None
+
+
+def _init_worker(model_path: str):
+    global _worker_model
+    from src.models.artifact import load_artifact
+    _worker_model = load_artifact(model_path)
+
+
+def _score_chunk(task) -> Tuple[int, np.ndarray]:
+    index, features = task
+    return index, _worker_model.predict(features)
+
+
+def iter_chunks(path: str, chunk_size: int, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """Yield DataFrame chunks from a CSV or Parquet file without loading it whole"""
+    if str(path).endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=columns)
+
+
+class BatchScorer:
+    """Scores a dataset chunk by chunk and writes predictions incrementally"""
+
+    def __init__(self, model_path: str, output_dir: str, chunk_size: int = 100000,
+                 workers: Optional[int] = None, feature_columns: Optional[List[str]] = None,
+                 id_column: Optional[str] = None, output_format: str = "parquet"):
+        self.model_path = str(model_path)
+        self.output_dir = Path(output_dir)
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.feature_columns = feature_columns
+        self.id_column = id_column
+        self.output_format = output_format
+        self.max_pending = 2 * self.workers
+
+        from src.models.artifact import read_header
+        header = read_header(self.model_path)
+        self.model_version = header["version"]
+        self.model_checksum = header["checksum"]
+        self.n_qubits = header["n_qubits"]
+
+    def config(self, input_path: str) -> dict:
+        """Everything that determines the content and numbering of the part files"""
+        return {
+            "input": str(Path(input_path).resolve()),
+            "model": str(Path(self.model_path).resolve()),
+            "model_version": self.model_version,
+            "model_checksum": self.model_checksum,
+            "chunk_size": self.chunk_size,
+            "feature_columns": self.feature_columns,
+            "id_column": self.id_column,
+            "output_format": self.output_format,
+        }
+
+    def _prepare_output(self, config: dict):
+        """Refuse to resume into parts written with another configuration; drop partial writes"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        progress = self.output_dir / PROGRESS_FILE
+        if progress.exists():
+            previous = json.loads(progress.read_text()).get("config")
+            if previous != config:
+                changed = sorted(k for k in config if (previous or {}).get(k) != config[k])
+                raise ResumeError(f"{self.output_dir} was written with a different {', '.join(changed)}; "
+                                  f"use a new output directory")
+        elif any(self.output_dir.glob("part-*")):
+            raise ResumeError(f"{self.output_dir} has part files but no {PROGRESS_FILE}; "
+                              f"use a new output directory")
+        # Left behind by a crash mid-write
+        for stale in self.output_dir.glob("*.tmp"):
+            stale.unlink()
+
+    def _part_path(self, index: int) -> Path:
+        return self.output_dir / f"part-{index:06d}.{self.output_format}"
+
+    def _features(self, chunk: pd.DataFrame) -> np.ndarray:
+        if self.feature_columns:
+            frame = chunk[self.feature_columns]
+        else:
+            frame = chunk.drop(columns=[self.id_column] if self.id_column else []).select_dtypes("number")
+        return np.ascontiguousarray(frame.to_numpy(dtype=np.float64))
+
+    def _write_part(self, index: int, ids, predictions: np.ndarray):
+        """Write one chunk's predictions atomically"""
+        frame = pd.DataFrame({"prediction": predictions})
+        if ids is not None:
+            frame.insert(0, self.id_column, ids)
+        frame["model_version"] = self.model_version
+        path = self._part_path(index)
+        # Underscore prefix: dataset readers skip it, so a crash never exposes a partial part
+        tmp = path.with_name(f"_{path.name}.tmp")
+        if self.output_format == "parquet":
+            frame.to_parquet(tmp, index=False)
+        else:
+            frame.to_csv(tmp, index=False)
+        tmp.replace(path)
+
+    def _write_progress(self, stats: dict):
+        path = self.output_dir / PROGRESS_FILE
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(stats, indent=2))
+        tmp.replace(path)
+
+    def run(self, input_path: str) -> dict:
+        """Score ``input_path``; returns run statistics"""
+        config = self.config(input_path)
+        self._prepare_output(config)
+        columns = None
+        if self.feature_columns:
+            columns = self.feature_columns + ([self.id_column] if self.id_column else [])
+
+        stats = {"input": str(input_path), "model": self.model_path, "model_version": self.model_version,
+                 "chunks_scored": 0, "chunks_skipped": 0, "rows_scored": 0}
+        pending = {}
+        ids_by_chunk = {}
+        completed = set()
+        stats["last_completed_chunk"] = -1
+        stats["config"] = config
+        self._write_progress(stats)
+        start = time.perf_counter()
+
+        def mark_completed(index):
+            # Contiguous watermark: every chunk up to it has a part file
+            completed.add(index)
+            while stats["last_completed_chunk"] + 1 in completed:
+                stats["last_completed_chunk"] += 1
+                completed.discard(stats["last_completed_chunk"])
+
+        def collect(done):
+            for future in done:
+                index, predictions = future.result()
+                pending.pop(future)
+                self._write_part(index, ids_by_chunk.pop(index), predictions)
+                stats["chunks_scored"] += 1
+                stats["rows_scored"] += len(predictions)
+                mark_completed(index)
+                self._write_progress(stats)
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.model_path,)) as pool:
+            for index, chunk in enumerate(iter_chunks(input_path, self.chunk_size, columns)):
+                if self._part_path(index).exists():
+                    stats["chunks_skipped"] += 1
+                    mark_completed(index)
+                    continue
+                features = self._features(chunk)
+                ids_by_chunk[index] = chunk[self.id_column].to_numpy() if self.id_column else None
+                pending[pool.submit(_score_chunk, (index, features))] = index
+                del chunk, features
+                if len(pending) >= self.max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        elapsed = time.perf_counter() - start
+        stats["elapsed"] = elapsed
+        stats["rows_per_second"] = stats["rows_scored"] / elapsed if elapsed > 0 else 0.0
+        stats["completed"] = True
+        self._write_progress(stats)
+        logger.info(f"Scored {stats['rows_scored']} rows in {elapsed:.1f}s "
+                    f"({stats['rows_per_second']:.0f} rows/s, {stats['chunks_skipped']} chunks resumed)")
+        return stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline bulk scoring with a quantum model artifact")
+    parser.add_argument("--model", required=True, help="Path to a .qmla model artifact")
+    parser.add_argument("--input", required=True, help="CSV or Parquet input file")
+    parser.add_argument("--output", required=True, help="Output directory for prediction parts")
+    parser.add_argument("--chunk-size", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--features", nargs="+", help="Feature columns (default: all numeric columns)")
+    parser.add_argument("--id-column", help="Column copied through to the output")
+    parser.add_argument("--output-format", choices=["parquet", "csv"], default="parquet")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+    scorer = BatchScorer(args.model, args.output, chunk_size=args.chunk_size, workers=args.workers,
+                         feature_columns=args.features, id_column=args.id_column,
+                         output_format=args.output_format)
+    stats = scorer.run(args.input)
+    print(json.dumps(stats, indent=2))
+    return stats
+
+
+if __name__ == "__main__":
+    main()
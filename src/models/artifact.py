@@ -0,0 +1,225 @@
+"""
+Quantum Model Artifacts
+Versioned binary model format with memory-mapped parameter loading
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import struct
+
+import numpy as np
+
+MAGIC = b"QMLA"
+FORMAT_VERSION = 1
+# magic, format version, header length
+PREAMBLE = struct.Struct("<4sHI")
+# Parameter data starts on an aligned offset so it can be mapped directly
+ALIGNMENT = 64
+ARTIFACT_SUFFIX = ".qmla"
+
+DEFAULT_TEMPLATE = {"encoding": "ry_cx_chain", "ansatz": "ry_cx_ry"}
+
+
+class ArtifactError(ValueError):
+    """Raised when a model artifact is malformed or fails validation"""
+
+
+def default_observables(n_qubits: int) -> List[Dict[str, Any]]:
+    """Z on qubit 0 (Qiskit labels put qubit 0 rightmost)"""
+    return [{"pauli": "I" * (n_qubits - 1) + "Z", "coeff": 1.0}]
+
+
+def _checksum(buffer) -> str:
+    return hashlib.sha256(memoryview(buffer).cast("B")).hexdigest()
+
+
+def save_artifact(path,
+                  parameters,
+                  n_qubits: int,
+                  name: str = "quantum_model",
+                  version: str = "1.0.0",
+                  observables: Optional[List[Dict[str, Any]]] = None,
+                  circuit_template: Optional[Dict[str, Any]] = None,
+                  metadata: Optional[Dict[str, Any]] = None,
+                  dtype=np.float64) -> Path:
+    """
+    Write a model artifact.
+
+    Layout: ``QMLA`` magic, format version, JSON header length, JSON header,
+    zero padding to a 64-byte boundary, then the raw little-endian parameter array.
+    """
+    dtype = np.dtype(dtype).newbyteorder("<")
+    if dtype.kind != "f" or dtype.itemsize not in (4, 8):
+        raise ArtifactError(f"Unsupported parameter dtype: {dtype}")
+    params = np.ascontiguousarray(np.asarray(parameters), dtype=dtype)
+
+    header = {
+        "name": name,
+        "version": version,
+        "created_at": datetime.now().isoformat(),
+        "n_qubits": n_qubits,
+        "circuit_template": {**DEFAULT_TEMPLATE, **(circuit_template or {}), "n_qubits": n_qubits},
+        "observables": observables or default_observables(n_qubits),
+        "dtype": dtype.str,
+        "shape": list(params.shape),
+        "checksum": _checksum(params),
+        "metadata": metadata or {},
+    }
+    header_bytes = json.dumps(header, sort_keys=True).encode("utf-8")
+    data_offset = PREAMBLE.size + len(header_bytes)
+    padding = (-data_offset) % ALIGNMENT
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * padding)
+        f.write(params.tobytes())
+    # Readers never observe a half-written artifact
+    tmp_path.replace(path)
+    return path
+
+
+def read_header(path) -> Dict[str, Any]:
+    """Parse only the artifact header; adds the parameter ``data_offset``"""
+    with open(path, "rb") as f:
+        preamble = f.read(PREAMBLE.size)
+        if len(preamble) != PREAMBLE.size:
+            raise ArtifactError(f"{path}: truncated artifact")
+        magic, format_version, header_len = PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise ArtifactError(f"{path}: not a quantum model artifact")
+        if format_version > FORMAT_VERSION:
+            raise ArtifactError(f"{path}: unsupported artifact format version {format_version}")
+        try:
+            header = json.loads(f.read(header_len).decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ArtifactError(f"{path}: corrupt header ({e})")
+    offset = PREAMBLE.size + header_len
+    header["data_offset"] = offset + (-offset) % ALIGNMENT
+    header["format_version"] = format_version
+    return header
+
+
+class ModelArtifact:
+    """
+    A loaded model artifact.
+
+    ``parameters`` is a read-only ``np.memmap`` into the file, so every worker
+    process that loads the same artifact shares the page-cache copy and no
+    Python objects are reconstructed from pickles.
+    """
+
+    def __init__(self, path, header: Dict[str, Any], parameters: np.ndarray):
+        self.path = Path(path)
+        self.header = header
+        self.parameters = parameters
+        self._circuit_manager = None
+
+    @property
+    def name(self) -> str:
+        return self.header["name"]
+
+    @property
+    def version(self) -> str:
+        return self.header["version"]
+
+    @property
+    def n_qubits(self) -> int:
+        return self.header["n_qubits"]
+
+    @property
+    def observables(self) -> List[Dict[str, Any]]:
+        return self.header["observables"]
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.header.get("metadata", {})
+
+    def verify(self):
+        """Validate the parameter checksum against the header"""
+        if _checksum(self.parameters) != self.header["checksum"]:
+            raise ArtifactError(f"{self.path}: parameter checksum mismatch")
+
+    @property
+    def circuit_manager(self):
+        """Circuit manager for this artifact's qubit count, created on first use"""
+        if self._circuit_manager is None:
+            from src.circuits.quantum_manager import QuantumCircuitManager
+            self._circuit_manager = QuantumCircuitManager(n_qubits=self.n_qubits)
+        return self._circuit_manager
+
+    def dispatch_weights(self) -> Optional[np.ndarray]:
+        """
+        Parameters as ``(2, n_qubits)`` weight layers when the artifact is the
+        backend dispatcher's model (default template, Z on qubit 0); else None
+        """
+        template = self.header.get("circuit_template", DEFAULT_TEMPLATE)
+        if any(template.get(key) != value for key, value in DEFAULT_TEMPLATE.items()):
+            return None
+        if [term["pauli"] for term in self.observables] != [default_observables(self.n_qubits)[0]["pauli"]]:
+            return None
+        if self.parameters.size != 2 * self.n_qubits:
+            return None
+        return np.asarray(self.parameters, dtype=float).reshape(2, self.n_qubits)
+
+    def predict(self, features_batch, states=None):
+        """Evaluate the weighted observable sum for a batch of feature rows"""
+        weights = self.dispatch_weights() if states is None else None
+        if weights is not None:
+            # Run on whichever backend is calibrated fastest for this batch shape
+            from src.circuits.dispatch import dispatcher
+            features = np.atleast_2d(np.asarray(features_batch, dtype=float))[:, :self.n_qubits]
+            if features.shape[1] < self.n_qubits:
+                # Same as encode_batch: qubits without a feature stay in |0>
+                features = np.pad(features, ((0, 0), (0, self.n_qubits - features.shape[1])))
+            return self.observables[0].get("coeff", 1.0) * dispatcher.run(features, weights)
+        qm = self.circuit_manager
+        if states is None:
+            states = qm.encode_batch(features_batch)
+        evolved = qm.evolve_batch(states, qm.create_variational_circuit(np.asarray(self.parameters, dtype=float)))
+        probs = np.abs(evolved) ** 2
+        result = np.zeros(evolved.shape[0])
+        for term in self.observables:
+            label = term["pauli"]
+            if set(label) <= {"I", "Z"}:
+                # Diagonal observable: parity of the Z positions
+                index = np.arange(evolved.shape[1])
+                parity = np.zeros_like(index)
+                for q, p in enumerate(reversed(label)):
+                    if p == "Z":
+                        parity ^= (index >> q) & 1
+                result += term.get("coeff", 1.0) * (probs @ (1 - 2 * parity))
+            else:
+                from qiskit.quantum_info import Pauli, Statevector
+                pauli = Pauli(label)
+                result += term.get("coeff", 1.0) * np.array(
+                    [np.real(Statevector(row).expectation_value(pauli)) for row in evolved]
+                )
+        return result
+
+    def describe(self) -> Dict[str, Any]:
+        """JSON-friendly summary without the parameter data"""
+        return {k: v for k, v in self.header.items() if k != "data_offset"}
+
+
+def load_artifact(path, verify: bool = True) -> ModelArtifact:
+    """Map an artifact's parameters into memory, optionally validating the checksum"""
+    header = read_header(path)
+    shape = tuple(header["shape"])
+    expected = header["data_offset"] + int(np.prod(shape)) * np.dtype(header["dtype"]).itemsize
+    if Path(path).stat().st_size < expected:
+        raise ArtifactError(f"{path}: truncated parameter data")
+    if int(np.prod(shape)) == 0:
+        parameters = np.zeros(shape, dtype=header["dtype"])
+    else:
+        parameters = np.memmap(path, dtype=header["dtype"], mode="r",
+                               offset=header["data_offset"], shape=shape)
+    artifact = ModelArtifact(path, header, parameters)
+    if verify:
+        artifact.verify()
+    return artifact
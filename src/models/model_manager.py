@@ -0,0 +1,286 @@
+"""
+Model Manager
+Versioned model registry with background hot-reload and weighted traffic routing
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import json
+import os
+import random
+import threading
+
+import numpy as np
+from loguru import logger
+
+from src.models.artifact import ARTIFACT_SUFFIX, ModelArtifact, load_artifact
+
+# Optional MLflow-registry stand-in: {"default": "1.1.0", "traffic": {"1.0.0": 0.9, "1.1.0": 0.1}}
+REGISTRY_FILE = "registry.json"
+
+
+Key = Tuple[str, str]  # (model name, version)
+
+
+def _version_key(version: str):
+    """Sort semantic versions numerically, falling back to string order"""
+    parts = []
+    for part in str(version).split("."):
+        parts.append((0, int(part), "") if part.isdigit() else (1, 0, part))
+    return tuple(parts)
+
+
+def match(models: Dict[Key, ModelArtifact], ref: str) -> List[Key]:
+    """Registry keys for a ``version`` or ``name:version`` reference"""
+    name, _, version = str(ref).rpartition(":")
+    return [key for key in models if key[1] == version and (not name or key[0] == name)]
+
+
+def reference(models: Dict[Key, ModelArtifact], key: Key) -> str:
+    """Shortest reference that selects ``key``: the bare version unless another model shares it"""
+    if len(match(models, key[1])) == 1:
+        return key[1]
+    return f"{key[0]}:{key[1]}"
+
+
+class RoutingTable:
+    """Immutable snapshot of loaded models and traffic weights"""
+
+    def __init__(self, models: Dict[Key, ModelArtifact], default: Optional[Key], traffic: Dict[str, float]):
+        self.models = models
+        self.default = default
+        self.traffic: Dict[Key, float] = {}
+        for ref, weight in traffic.items():
+            keys = match(models, ref)
+            if len(keys) == 1 and weight > 0:
+                self.traffic[keys[0]] = weight
+        self._keys = list(self.traffic)
+        self._cumulative = list(np.cumsum([self.traffic[k] for k in self._keys]))
+
+    def choose(self, rng: random.Random) -> Optional[Key]:
+        """Pick a model for an unpinned request according to the traffic weights"""
+        if not self._keys:
+            return self.default
+        point = rng.random() * self._cumulative[-1]
+        for key, bound in zip(self._keys, self._cumulative):
+            if point < bound:
+                return key
+        return self._keys[-1]
+
+
+class ModelManager:
+    """
+    Registry of model artifacts in ``models_dir``, keyed by ``(name, version)``.
+
+    New or changed artifacts are loaded and warmed up off the request path
+    (circuit compiled, test batch evaluated) and then published by replacing
+    the routing table in a single assignment. Requests that already resolved
+    a model keep their reference, so swaps never drop in-flight work.
+    Requests pinned to a ``model_version`` (``version`` or, when several
+    models share a version, ``name:version``) are routed to it; ``latest`` /
+    unpinned requests follow the traffic weights (canary rollouts) or the
+    default version.
+    """
+
+    def __init__(self, models_dir: str = "models", poll_interval: float = 5.0,
+                 warmup_batch_size: int = 8, seed: Optional[int] = None):
+        self.models_dir = Path(models_dir)
+        self.poll_interval = poll_interval
+        self.warmup_batch_size = warmup_batch_size
+        self._table = RoutingTable({}, None, {})
+        self._mtimes: Dict[str, float] = {}
+        self._paths: Dict[Key, str] = {}
+        self._pinned_traffic: Optional[Dict[str, float]] = None
+        self._pinned_default: Optional[str] = None
+        self._lock = threading.Lock()
+        # The watcher thread and /models/reload may scan concurrently
+        self._scan_lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Read side (request path)
+    # ------------------------------------------------------------------
+    @property
+    def models(self) -> Dict[Key, ModelArtifact]:
+        return self._table.models
+
+    @property
+    def versions(self) -> List[str]:
+        """References of the loaded models, as accepted by ``model_version``"""
+        models = self._table.models
+        return [reference(models, key) for key in sorted(models, key=lambda k: (k[0], _version_key(k[1])))]
+
+    @property
+    def current_model(self) -> Optional[str]:
+        table = self._table
+        return reference(table.models, table.default) if table.default else None
+
+    @property
+    def traffic(self) -> Dict[str, float]:
+        table = self._table
+        return {reference(table.models, key): weight for key, weight in table.traffic.items()}
+
+    def resolve(self, model_version: Optional[str] = None) -> Tuple[str, ModelArtifact]:
+        """Return ``(version, artifact)`` for a request; raises KeyError for unknown or ambiguous versions"""
+        table = self._table
+        if model_version and model_version != "latest":
+            keys = match(table.models, model_version)
+            if len(keys) != 1:
+                raise KeyError(model_version)
+            return keys[0][1], table.models[keys[0]]
+        key = table.choose(self._rng)
+        if key is None:
+            raise KeyError("latest")
+        return key[1], table.models[key]
+
+    def predict(self, features_batch, model_version: Optional[str] = None):
+        """Evaluate a batch with the routed model; returns ``(outputs, version)``"""
+        version, artifact = self.resolve(model_version)
+        return artifact.predict(np.atleast_2d(np.asarray(features_batch, dtype=float))), version
+
+    def find(self, model_name: str) -> Optional[ModelArtifact]:
+        """Look a model up by version reference, or by name (highest loaded version)"""
+        table = self._table
+        keys = match(table.models, model_name)
+        if len(keys) == 1:
+            return table.models[keys[0]]
+        versions = [key[1] for key in table.models if key[0] == model_name]
+        if not versions:
+            return None
+        return table.models[(model_name, max(versions, key=_version_key))]
+
+    # ------------------------------------------------------------------
+    # Write side (background loading and publishing)
+    # ------------------------------------------------------------------
+    def _warm(self, artifact: ModelArtifact):
+        """Compile the circuit and push a synthetic batch through it"""
+        artifact.predict(np.zeros((self.warmup_batch_size, artifact.n_qubits)))
+
+    def _publish(self, models: Dict[Key, ModelArtifact]):
+        """Build and atomically install a new routing table"""
+        registry = self._read_registry()
+        keys = match(models, self._pinned_default or registry.get("default") or "")
+        if len(keys) == 1:
+            default = keys[0]
+        else:
+            default = max(models, key=lambda k: (_version_key(k[1]), k[0])) if models else None
+        traffic = self._pinned_traffic if self._pinned_traffic is not None else registry.get("traffic", {})
+        self._table = RoutingTable(models, default, traffic)
+
+    def _read_registry(self) -> dict:
+        path = self.models_dir / REGISTRY_FILE
+        if not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Ignoring unreadable model registry {path}: {e}")
+            return {}
+
+    def load_model(self, path, name: Optional[str] = None) -> ModelArtifact:
+        """Load, warm and publish a single artifact"""
+        artifact = load_artifact(path)
+        if name:
+            artifact.header["name"] = name
+        self._warm(artifact)
+        key = (artifact.name, artifact.version)
+        with self._lock:
+            models = dict(self._table.models)
+            models[key] = artifact
+            self._paths[key] = str(path)
+            self._publish(models)
+        logger.info(f"Loaded model {artifact.name} version {artifact.version} from {path}")
+        return artifact
+
+    def scan(self) -> List[str]:
+        """Load new/changed artifacts and drop removed ones; returns changed versions"""
+        with self._scan_lock:
+            return self._scan()
+
+    def _scan(self) -> List[str]:
+        if not self.models_dir.exists():
+            return []
+        seen = {}
+        for path in sorted(self.models_dir.glob(f"*{ARTIFACT_SUFFIX}")):
+            try:
+                seen[str(path)] = path.stat().st_mtime
+            except OSError:
+                continue
+
+        changed, loaded = [], {}
+        for path, mtime in seen.items():
+            if self._mtimes.get(path) == mtime:
+                continue
+            try:
+                artifact = load_artifact(path)
+                self._warm(artifact)
+            except Exception as e:
+                logger.error(f"Failed to load model artifact {path}: {e}")
+                continue
+            loaded[path] = artifact
+            self._mtimes[path] = mtime
+
+        with self._lock:
+            models = dict(self._table.models)
+            for key, path in list(self._paths.items()):
+                # Deleted files, and files rewritten with a different name or version
+                replaced = path in loaded and key != (loaded[path].name, loaded[path].version)
+                if replaced or (path not in seen and path.startswith(str(self.models_dir))):
+                    changed.append(reference(models, key))
+                    models.pop(key, None)
+                    self._paths.pop(key)
+                    if not replaced:
+                        self._mtimes.pop(path, None)
+            for path, artifact in loaded.items():
+                key = (artifact.name, artifact.version)
+                models[key] = artifact
+                self._paths[key] = path
+            changed.extend(reference(models, (a.name, a.version)) for a in loaded.values())
+            self._publish(models)
+        if changed:
+            logger.info(f"Model registry updated: {changed} (default {self.current_model})")
+        return changed
+
+    def set_traffic(self, weights: Optional[Dict[str, float]], default: Optional[str] = None):
+        """Pin traffic weights (and optionally the default version); None reverts to the registry file"""
+        models = self._table.models
+        unknown = [ref for ref in (weights or {}) if len(match(models, ref)) != 1]
+        if default is not None and len(match(models, default)) != 1:
+            unknown.append(default)
+        if unknown:
+            raise KeyError(", ".join(unknown))
+        with self._lock:
+            self._pinned_traffic = dict(weights) if weights is not None else None
+            self._pinned_default = default
+            self._publish(dict(self._table.models))
+
+    # ------------------------------------------------------------------
+    # Background watcher
+    # ------------------------------------------------------------------
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.scan()
+            except Exception as e:
+                logger.error(f"Model directory scan failed: {e}")
+
+    def start_watching(self):
+        """Poll ``models_dir`` for new versions on a daemon thread"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="model-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=self.poll_interval + 1)
+            self._watcher = None
+
+
+model_manager = ModelManager(
+    models_dir=os.environ.get("MODELS_DIR", "models"),
+    poll_interval=float(os.environ.get("MODEL_POLL_INTERVAL", "5")),
+)
@@ -1,9 +1,18 @@
-from fastapi import APIRouter, Response
+from fastapi import APIRouter, HTTPException, Response
+import asyncio
 from src.monitoring.monitor import monitor
 from src.monitoring.metrics import metrics_collector
+from src.monitoring.profiler import profiler, ProfilerBusy
+from src.circuits.dispatch import dispatcher
+from src.schemas.models import FeedbackRequest
+
+MAX_PROFILE_SECONDS = 300
 
 router = APIRouter(prefix="/monitoring", tags=["monitoring"])
 
+# Resolved on every collection, so a replaced monitor.performance is picked up
+metrics_collector.set_performance_source(lambda: monitor.performance.gauge_values())
+
 @router.get("/health")
 async def monitoring_health():
     return {"status": "healthy", "service": "monitoring"}
@@ -14,6 +23,16 @@ async def get_metrics():
     metrics = metrics_collector.get_metrics()
     return Response(media_type="text/plain", content=metrics)
 
+@router.get("/streams")
+async def get_stream_stats():
+    """Connection-level stats for streaming prediction connections"""
+    return metrics_collector.get_stream_stats()
+
+@router.get("/backends")
+async def get_backend_dispatch(recent: int = 20):
+    """Backend calibration table, per-backend usage and recent dispatch decisions"""
+    return dispatcher.report(recent)
+
 @router.get("/drift")
 async def check_drift():
     """Check for data drift"""
@@ -35,8 +54,61 @@ async def check_drift():
     drift_report = monitor.check_data_drift(current_data, reference_data)
     return drift_report
 
+@router.post("/feedback")
+async def ingest_feedback(request: FeedbackRequest):
+    """Join ground-truth labels to logged predictions by request ID"""
+    counts = monitor.performance.record_feedback((item.request_id, item.label) for item in request.feedback)
+    metrics_collector.record_feedback(counts["matched"], counts["unmatched"])
+    return counts
+
 @router.get("/performance")
-async def get_performance():
-    """Get model performance metrics"""
-    performance_report = monitor.generate_performance_report()
+async def get_performance(model_version: str = None):
+    """Windowed accuracy, precision, recall, F1, calibration and latency per model version"""
+    performance_report = monitor.generate_performance_report(model_version)
     return performance_report
+
+@router.get("/profile")
+async def profile(seconds: float = 10.0, rate: float = 100.0, format: str = "json", limit: int = 20):
+    """
+    Sample all threads of this process for ``seconds`` and return the profile.
+
+    ``format=collapsed`` returns flamegraph-ready collapsed stacks as plain text.
+    """
+    if not 0 < seconds <= MAX_PROFILE_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be in (0, {MAX_PROFILE_SECONDS}]")
+    try:
+        profiler.start(rate)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        report = profiler.stop(limit)
+    if format == "collapsed":
+        return Response(media_type="text/plain", content=report["collapsed"])
+    return report
+
+@router.post("/profile/start")
+async def start_profiler(rate: float = 100.0):
+    """Start continuous sampling until /profile/stop is called"""
+    try:
+        profiler.start(rate)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"running": True, "rate_hz": profiler.rate}
+
+@router.get("/profile/snapshot")
+async def profile_snapshot(format: str = "json", limit: int = 20):
+    """Current profile of a continuous session without stopping it"""
+    report = profiler.report(limit)
+    if format == "collapsed":
+        return Response(media_type="text/plain", content=report["collapsed"])
+    return report
+
+@router.post("/profile/stop")
+async def stop_profiler(format: str = "json", limit: int = 20):
+    """Stop continuous sampling and return the accumulated profile"""
+    report = profiler.stop(limit)
+    if format == "collapsed":
+        return Response(media_type="text/plain", content=report["collapsed"])
+    return report
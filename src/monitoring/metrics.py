@@ -1,36 +1,270 @@
-from prometheus_client import Counter, Histogram, Gauge, generate_latest
+"""
+Prometheus metrics
+Multi-process aware metrics with cached label children and optional per-thread buffering
+
+When ``PROMETHEUS_MULTIPROC_DIR`` is set before this module is imported,
+prometheus_client keeps every metric in mmap-backed files shared by all
+worker processes and ``/monitoring/metrics`` aggregates them, so a scrape
+reports correct totals no matter which worker serves it.
+"""
+from prometheus_client import Counter, Histogram, Gauge, CollectorRegistry, REGISTRY, generate_latest
+from prometheus_client import multiprocess
+from prometheus_client.core import GaugeMetricFamily
+from collections import deque
+import os
+import threading
 import time
 from loguru import logger
 
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
 # Define metrics
 PREDICTION_COUNTER = Counter('model_predictions_total', 'Total predictions made', ['model_version', 'status'])
 PREDICTION_LATENCY = Histogram('prediction_latency_seconds', 'Prediction latency in seconds')
 ERROR_COUNTER = Counter('model_errors_total', 'Total prediction errors', ['error_type'])
-DRIFT_GAUGE = Gauge('data_drift_score', 'Data drift detection score')
+DRIFT_GAUGE = Gauge('data_drift_score', 'Data drift detection score', multiprocess_mode='mostrecent')
+STREAM_CONNECTIONS = Gauge('stream_active_connections', 'Open streaming prediction connections', ['transport'],
+                           multiprocess_mode='livesum')
+STREAM_ROWS = Counter('stream_rows_total', 'Rows scored over streaming connections', ['transport'])
+STREAM_BATCHES = Counter('stream_batches_total', 'Micro-batches evaluated for streaming connections', ['transport'])
+FEEDBACK_COUNTER = Counter('model_feedback_total', 'Ground-truth feedback items received', ['outcome'])
+STREAM_BACKPRESSURE = Counter('stream_backpressure_waits_total', 'Times a stream reader waited on a full window', ['transport'])
+
+
+class PerformanceCollector:
+    """
+    ``model_performance`` gauges computed from the shared feedback store when
+    the registry is collected, so every worker reports the same values and
+    label sets of retired versions or expired windows disappear with their data
+    """
+
+    def __init__(self):
+        # Callable yielding (model_version, window, metric, value) tuples
+        self.source = None
+
+    def collect(self):
+        family = GaugeMetricFamily('model_performance', 'Windowed model performance from labelled feedback',
+                                   labels=['model_version', 'window', 'metric'])
+        if self.source is not None:
+            try:
+                for model_version, window, metric, value in self.source():
+                    family.add_metric([model_version, window, metric], value)
+            except Exception as e:
+                # A failing store must not fail the whole scrape
+                logger.error(f"Performance metrics unavailable: {e}")
+        yield family
+
+
+PERFORMANCE_COLLECTOR = PerformanceCollector()
+if not MULTIPROCESS:
+    REGISTRY.register(PERFORMANCE_COLLECTOR)
+
+
+class _ThreadBuffer:
+    """Per-thread accumulators; only the owning thread writes to them"""
 
-class MetricsCollector:
     def __init__(self):
+        self.owner = threading.current_thread()
+        # Monotonic totals keyed by (metric, label values); the flusher publishes deltas
+        self.counts = {}
+        # deque.append / popleft are atomic, so observations need no lock
+        self.latencies = deque()
+
+
+class MetricsCollector:
+    """
+    Records API metrics.
+
+    ``mode="direct"`` updates Prometheus on every call. ``mode="buffered"``
+    accumulates into lock-free per-thread buffers that a background thread
+    flushes every ``flush_interval`` seconds (and on every scrape), keeping
+    metric updates off the request path. Label children are resolved once
+    per label combination and cached.
+    """
+
+    def __init__(self, mode: str = "direct", flush_interval: float = 1.0, stream_history: int = 100):
         self.start_time = time.time()
-    
+        self.mode = mode
+        self.flush_interval = flush_interval
+        self._children = {}
+        self._streams_lock = threading.Lock()
+        self.active_streams = {}
+        self.closed_streams = deque(maxlen=stream_history)
+
+        self._local = threading.local()
+        self._buffers = []
+        self._flushed = {}
+        self._buffers_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher = None
+        self._stop = threading.Event()
+        if mode == "buffered":
+            self.start_flusher()
+
+    # ------------------------------------------------------------------
+    # Label children and buffering
+    # ------------------------------------------------------------------
+    def _child(self, metric, *labels):
+        """Return the cached labelled child for ``metric``"""
+        key = (metric, labels)
+        child = self._children.get(key)
+        if child is None:
+            child = metric.labels(*labels)
+            self._children[key] = child
+        return child
+
+    def _buffer(self) -> _ThreadBuffer:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = _ThreadBuffer()
+            self._local.buffer = buffer
+            with self._buffers_lock:
+                self._buffers.append(buffer)
+        return buffer
+
+    def _inc(self, metric, labels: tuple, amount: float = 1):
+        if self.mode == "buffered":
+            counts = self._buffer().counts
+            key = (metric, labels)
+            counts[key] = counts.get(key, 0) + amount
+        else:
+            self._child(metric, *labels).inc(amount)
+
+    def flush(self):
+        """Publish buffered increments and observations to Prometheus"""
+        with self._flush_lock:
+            with self._buffers_lock:
+                buffers = list(self._buffers)
+            # Checked before flushing, so a dead thread's buffer is final when it is dropped
+            dead = [buffer for buffer in buffers if not buffer.owner.is_alive()]
+            for buffer in buffers:
+                for key, total in list(buffer.counts.items()):
+                    flushed_key = (id(buffer), key)
+                    delta = total - self._flushed.get(flushed_key, 0)
+                    if delta:
+                        metric, labels = key
+                        self._child(metric, *labels).inc(delta)
+                        self._flushed[flushed_key] = total
+                latencies = buffer.latencies
+                while latencies:
+                    PREDICTION_LATENCY.observe(latencies.popleft())
+            if dead:
+                with self._buffers_lock:
+                    self._buffers = [buffer for buffer in self._buffers if buffer not in dead]
+                for buffer in dead:
+                    for key in buffer.counts:
+                        self._flushed.pop((id(buffer), key), None)
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Metrics flush failed: {e}")
+
+    def start_flusher(self):
+        if self._flusher is None or not self._flusher.is_alive():
+            self._stop.clear()
+            self._flusher = threading.Thread(target=self._flush_loop, name="metrics-flusher", daemon=True)
+            self._flusher.start()
+
+    def stop_flusher(self):
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=self.flush_interval + 1)
+            self._flusher = None
+        self.flush()
+
+    def prewarm(self, model_versions):
+        """Create label children up front so first requests skip the lookups"""
+        for version in model_versions:
+            for status in ("success", "failure"):
+                self._child(PREDICTION_COUNTER, version, status)
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
     def record_prediction(self, model_version: str, success: bool = True):
         """Record prediction metrics"""
         status = "success" if success else "failure"
-        PREDICTION_COUNTER.labels(model_version=model_version, status=status).inc()
-    
+        self._inc(PREDICTION_COUNTER, (model_version, status))
+
     def record_latency(self, latency: float):
         """Record prediction latency"""
-        PREDICTION_LATENCY.observe(latency)
-    
+        if self.mode == "buffered":
+            self._buffer().latencies.append(latency)
+        else:
+            PREDICTION_LATENCY.observe(latency)
+
     def record_error(self, error_type: str):
         """Record error metrics"""
-        ERROR_COUNTER.labels(error_type=error_type).inc()
-    
+        self._inc(ERROR_COUNTER, (error_type,))
+
     def record_drift(self, drift_score: float):
         """Record data drift metrics"""
         DRIFT_GAUGE.set(drift_score)
-    
+
+    def record_feedback(self, matched: int, unmatched: int):
+        """Record feedback items joined to (or missing from) the prediction index"""
+        if matched:
+            self._inc(FEEDBACK_COUNTER, ("matched",), matched)
+        if unmatched:
+            self._inc(FEEDBACK_COUNTER, ("unmatched",), unmatched)
+
+    def set_performance_source(self, source):
+        """Callable yielding ``(model_version, window, metric, value)`` for the performance gauges"""
+        PERFORMANCE_COLLECTOR.source = source
+
+    def stream_opened(self, stream_id: str, transport: str, stats: dict):
+        """Register a streaming connection; ``stats`` is updated in place by the stream"""
+        self._child(STREAM_CONNECTIONS, transport).inc()
+        with self._streams_lock:
+            self.active_streams[stream_id] = stats
+
+    def record_stream_batch(self, transport: str, rows: int, backpressure_waits: int = 0):
+        """Record one evaluated micro-batch of a streaming connection"""
+        self._inc(STREAM_BATCHES, (transport,))
+        self._inc(STREAM_ROWS, (transport,), rows)
+        if backpressure_waits:
+            self._inc(STREAM_BACKPRESSURE, (transport,), backpressure_waits)
+
+    def stream_closed(self, stream_id: str, transport: str):
+        """Move a connection's final stats into the closed-connection history"""
+        self._child(STREAM_CONNECTIONS, transport).dec()
+        with self._streams_lock:
+            stats = self.active_streams.pop(stream_id, None)
+            if stats is not None:
+                self.closed_streams.append(stats)
+        if stats is not None:
+            logger.info(f"Stream {stream_id} closed: {stats}")
+
+    def get_stream_stats(self) -> dict:
+        """Connection-level stats for open and recently closed streams"""
+        with self._streams_lock:
+            return {
+                "active": [dict(s) for s in self.active_streams.values()],
+                "recent": list(self.closed_streams),
+            }
+
     def get_metrics(self):
-        """Get all metrics in Prometheus format"""
+        """Get all metrics in Prometheus format, aggregated across worker processes when enabled"""
+        if self.mode == "buffered":
+            self.flush()
+        if MULTIPROCESS:
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            registry.register(PERFORMANCE_COLLECTOR)
+            return generate_latest(registry)
         return generate_latest()
 
-metrics_collector = MetricsCollector()
+
+def mark_process_dead(pid: int):
+    """Drop a dead worker's live gauges from the shared store (gunicorn child_exit hook)"""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
+
+
+metrics_collector = MetricsCollector(
+    mode=os.environ.get("METRICS_MODE", "direct"),
+    flush_interval=float(os.environ.get("METRICS_FLUSH_INTERVAL", "1.0")),
+)
@@ -3,11 +3,13 @@ import numpy as np
 from datetime import datetime
 from loguru import logger
 import json
+from src.monitoring.performance import performance_tracker
 
 class MLMonitor:
     def __init__(self):
         self.drift_detected = False
         self.performance_metrics = {}
+        self.performance = performance_tracker
         
     def check_data_drift(self, current_data: pd.DataFrame, reference_data: pd.DataFrame) -> dict:
         """Check for data drift between current and reference data"""
@@ -43,27 +45,25 @@ class MLMonitor:
             logger.error(f"Error in drift detection: {e}")
             return {"error": str(e)}
     
-    def log_prediction(self, features: list, prediction: list, model_version: str):
-        """Log prediction for monitoring"""
+    def log_prediction(self, features: list, prediction: list, model_version: str,
+                       request_id: str = None, latency: float = None):
+        """Log prediction for monitoring and index it for ground-truth feedback"""
         prediction_log = {
             "timestamp": datetime.now().isoformat(),
+            "request_id": request_id,
             "features": features,
             "prediction": prediction,
             "model_version": model_version
         }
+        self.performance.record_prediction(request_id, model_version, prediction[0], latency)
         
         # In production, this would go to a monitoring system
         logger.info(f"Prediction logged: {prediction_log}")
         
-    def generate_performance_report(self) -> dict:
-        """Generate model performance report"""
-        return {
-            "timestamp": datetime.now().isoformat(),
-            "accuracy": 0.95,
-            "precision": 0.93,
-            "recall": 0.94,
-            "f1_score": 0.935,
-            "inference_latency": 0.025
-        }
+    def generate_performance_report(self, model_version: str = None) -> dict:
+        """Windowed performance per model version from labelled feedback"""
+        report = self.performance.report(model_version)
+        report["timestamp"] = datetime.now().isoformat()
+        return report
 
 monitor = MLMonitor()
@@ -0,0 +1,414 @@
+"""
+Online model performance
+Ground-truth feedback joined to logged predictions by request ID and folded into
+incremental per-version window aggregates
+
+Every time bucket holds a fixed-size vector of additive sufficient statistics
+(confusion counts, Brier sum, calibration bins, a log-spaced latency
+histogram). Buckets and the prediction index live in SQLite, shared by every
+API process, so feedback matches a prediction whichever gunicorn worker served
+it. Ingesting a label adds to a few bucket cells and a window report sums the
+buckets it covers; past predictions are never rescanned.
+
+Served predictions are buffered in memory and written in batches by a
+background thread, so the request path never waits on the database lock.
+"""
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+import math
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+from loguru import logger
+
+CALIBRATION_BINS = 10
+# Latency histogram edges in seconds: 0.1 ms .. ~100 s, 10 buckets per decade
+LATENCY_EDGES = np.logspace(-4, 2, 61)
+
+# Layout of the statistics vector
+TP, FP, TN, FN, BRIER, LABELED, PREDICTIONS = range(7)
+CAL_N = 7
+CAL_P = CAL_N + CALIBRATION_BINS
+CAL_Y = CAL_P + CALIBRATION_BINS
+LATENCY = CAL_Y + CALIBRATION_BINS
+STATS_SIZE = LATENCY + len(LATENCY_EDGES) + 1
+
+PERCENTILES = (50, 95, 99)
+
+
+def score_to_probability(score: float) -> float:
+    """Model output <Z> in [-1, 1] to P(label = 1); labels {0, 1} are trained as targets {-1, +1}"""
+    return min(1.0, max(0.0, (1.0 + float(score)) / 2.0))
+
+
+def _latency_percentile(histogram: np.ndarray, q: float) -> Optional[float]:
+    """Percentile from the latency histogram, interpolated geometrically within a bucket"""
+    total = histogram.sum()
+    if total == 0:
+        return None
+    rank = q / 100.0 * total
+    cumulative = np.cumsum(histogram)
+    bucket = int(np.searchsorted(cumulative, rank))
+    if bucket == 0:
+        return float(LATENCY_EDGES[0])
+    if bucket >= len(LATENCY_EDGES):
+        return float(LATENCY_EDGES[-1])
+    lower, upper = LATENCY_EDGES[bucket - 1], LATENCY_EDGES[bucket]
+    below = cumulative[bucket - 1]
+    fraction = (rank - below) / histogram[bucket] if histogram[bucket] else 1.0
+    return float(lower * (upper / lower) ** fraction)
+
+
+def summarize(stats: np.ndarray) -> dict:
+    """Metrics derived from one statistics vector"""
+    tp, fp, tn, fn = stats[TP], stats[FP], stats[TN], stats[FN]
+    labeled = stats[LABELED]
+
+    def ratio(a, b):
+        return float(a / b) if b else None
+
+    precision = ratio(tp, tp + fp)
+    recall = ratio(tp, tp + fn)
+    f1 = ratio(2 * precision * recall, precision + recall) if precision is not None and recall is not None else None
+    # Expected calibration error: bin-weighted |mean predicted probability - observed frequency|
+    gaps = np.abs(stats[CAL_P:CAL_Y] - stats[CAL_Y:LATENCY])
+    ece = ratio(gaps.sum(), labeled)
+    report = {
+        "predictions": int(stats[PREDICTIONS]),
+        "labeled": int(labeled),
+        "accuracy": ratio(tp + tn, labeled),
+        "precision": precision,
+        "recall": recall,
+        "f1_score": f1,
+        "brier_score": ratio(stats[BRIER], labeled),
+        "calibration_error": ece,
+    }
+    histogram = stats[LATENCY:]
+    for q in PERCENTILES:
+        report[f"latency_p{q}"] = _latency_percentile(histogram, q)
+    return report
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    request_id TEXT PRIMARY KEY,
+    model_version TEXT NOT NULL,
+    probability REAL NOT NULL,
+    logged_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS predictions_logged_at ON predictions (logged_at);
+CREATE TABLE IF NOT EXISTS stats (
+    model_version TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    slot INTEGER NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (model_version, bucket, slot)
+);
+CREATE TABLE IF NOT EXISTS models (
+    model_version TEXT PRIMARY KEY,
+    first_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def _common_step(sizes: Iterable[float]) -> float:
+    """Largest bucket width (to the millisecond) that divides every window size and slide step"""
+    return math.gcd(*(max(1, round(size * 1000)) for size in sizes)) / 1000
+
+
+class PerformanceTracker:
+    """
+    Per-``model_version`` accuracy, precision, recall, F1, calibration and
+    latency percentiles over tumbling and sliding windows.
+
+    Latency is counted when a prediction is logged; label metrics when its
+    feedback arrives, in the window of the arrival time. Predictions stay
+    matchable for ``ttl`` seconds, at most ``max_entries`` of them (oldest
+    evicted first), so unlabeled predictions cannot grow the index without
+    bound. Buckets older than the longest window are purged.
+
+    ``record_prediction`` only appends to an in-memory buffer, flushed every
+    ``flush_interval`` seconds and before any feedback or report in this
+    process; other processes see a prediction once it is flushed.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, tumbling: Sequence[float] = (60.0, 3600.0),
+                 sliding: Sequence[float] = (300.0,), slide_buckets: int = 10, max_entries: int = 100000,
+                 ttl: float = 3600.0, threshold: float = 0.5, flush_interval: float = 0.5,
+                 clock=time.time):
+        self.db_path = db_path or os.environ.get("PERFORMANCE_DB", "data/performance.db")
+        self.tumbling = tuple(tumbling)
+        self.sliding = tuple(sliding)
+        self.resolution = _common_step(self.tumbling + tuple(size / slide_buckets for size in self.sliding))
+        # The last complete tumbling window reaches back two window lengths
+        self.retention = max([2 * size for size in self.tumbling] + list(self.sliding)) + self.resolution
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self.clock = clock
+        self._conn = None
+        self._pid = None
+        self._lock = threading.RLock()
+        self._last_purge = -math.inf
+        self.flush_interval = flush_interval
+        # deque.append / popleft are atomic, so the request path takes no lock
+        self._pending = deque()
+        self._flusher = None
+        self._flusher_pid = None
+        self._flusher_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def _db(self) -> sqlite3.Connection:
+        # A connection must not cross a fork (gunicorn workers)
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            self._pid = os.getpid()
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # Commits on the request path skip the fsync; a crash loses at most the last few updates
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    @staticmethod
+    def _bump(db: sqlite3.Connection, name: str, amount: int):
+        if amount:
+            db.execute("INSERT INTO counters (name, value) VALUES (?, ?) "
+                       "ON CONFLICT (name) DO UPDATE SET value = value + excluded.value", (name, int(amount)))
+
+    @staticmethod
+    def _counters(db: sqlite3.Connection) -> Dict[str, int]:
+        return dict(db.execute("SELECT name, value FROM counters").fetchall())
+
+    def _add(self, db: sqlite3.Connection, model_version: str, cells: Dict[int, float], now: float):
+        """Add statistics cells to the bucket of ``now``"""
+        bucket = math.floor(now / self.resolution)
+        db.execute("INSERT OR IGNORE INTO models (model_version, first_seen) VALUES (?, ?)", (model_version, now))
+        db.executemany(
+            "INSERT INTO stats (model_version, bucket, slot, value) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (model_version, bucket, slot) DO UPDATE SET value = value + excluded.value",
+            [(model_version, bucket, slot, float(value)) for slot, value in cells.items()])
+
+    def _evict(self, db: sqlite3.Connection, now: float):
+        """Drop predictions past their TTL, then the oldest beyond ``max_entries``"""
+        expired = db.execute("DELETE FROM predictions WHERE logged_at <= ?", (now - self.ttl,)).rowcount
+        excess = self._counters(db).get("index_size", 0) - expired - self.max_entries
+        if excess > 0:
+            db.execute("DELETE FROM predictions WHERE rowid IN "
+                       "(SELECT rowid FROM predictions ORDER BY logged_at, rowid LIMIT ?)", (excess,))
+        excess = max(excess, 0)
+        self._bump(db, "evicted_ttl", expired)
+        self._bump(db, "evicted_capacity", excess)
+        self._bump(db, "index_size", -(expired + excess))
+
+    def _purge(self, db: sqlite3.Connection, now: float):
+        """Delete buckets no window reaches any more, at most once per bucket width"""
+        if now - self._last_purge < self.resolution:
+            return
+        self._last_purge = now
+        db.execute("DELETE FROM stats WHERE bucket < ?", (math.floor((now - self.retention) / self.resolution),))
+        db.execute("DELETE FROM models WHERE model_version NOT IN (SELECT model_version FROM stats)")
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def record_prediction(self, request_id: Optional[str], model_version: str, score: float,
+                          latency: Optional[float] = None):
+        """Buffer a served prediction for indexing and count its latency"""
+        self._pending.append((request_id, model_version, score, latency, self.clock()))
+        if self._flusher_pid != os.getpid():
+            self.start_flusher()
+        elif len(self._pending) >= self.max_entries:
+            # The flusher has fallen behind; never buffer more than the index holds
+            self.flush()
+
+    def _write(self, db: sqlite3.Connection, request_id: Optional[str], model_version: str, score: float,
+               latency: Optional[float], now: float):
+        cells = {PREDICTIONS: 1.0}
+        if latency is not None:
+            cells[LATENCY + int(np.searchsorted(LATENCY_EDGES, latency))] = 1.0
+        if request_id is not None:
+            replaced = db.execute("DELETE FROM predictions WHERE request_id = ?", (str(request_id),)).rowcount
+            db.execute("INSERT INTO predictions (request_id, model_version, probability, logged_at) "
+                       "VALUES (?, ?, ?, ?)", (str(request_id), model_version, score_to_probability(score), now))
+            self._bump(db, "index_size", 1 - replaced)
+            self._evict(db, now)
+        self._add(db, model_version, cells, now)
+        self._purge(db, now)
+
+    def flush(self):
+        """Write buffered predictions in one transaction"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._pending.popleft())
+            except IndexError:
+                break
+        if not batch:
+            return
+        with self._transaction() as db:
+            for item in batch:
+                self._write(db, *item)
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Performance flush failed: {e}")
+
+    def start_flusher(self):
+        # Threads do not survive a fork, so each process starts its own
+        with self._flusher_lock:
+            if self._flusher_pid == os.getpid() and self._flusher is not None and self._flusher.is_alive():
+                return
+            self._stop.clear()
+            self._flusher = threading.Thread(target=self._flush_loop, name="performance-flusher", daemon=True)
+            self._flusher.start()
+            self._flusher_pid = os.getpid()
+
+    def stop_flusher(self):
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=self.flush_interval + 1)
+            self._flusher = None
+            self._flusher_pid = None
+        self.flush()
+
+    def record_feedback(self, items: Iterable[Tuple[str, float]]) -> dict:
+        """Join ``(request_id, label)`` pairs to indexed predictions; labels are 0/1 (or -1/+1)"""
+        self.flush()
+        now = self.clock()
+        matched = unmatched = 0
+        with self._transaction() as db:
+            self._evict(db, now)
+            for request_id, label in items:
+                row = db.execute("SELECT model_version, probability FROM predictions WHERE request_id = ?",
+                                 (str(request_id),)).fetchone()
+                if row is None:
+                    unmatched += 1
+                    continue
+                db.execute("DELETE FROM predictions WHERE request_id = ?", (str(request_id),))
+                model_version, probability = row
+                actual = 1 if float(label) > 0 else 0
+                predicted = 1 if probability > self.threshold else 0
+                bin_index = min(int(probability * CALIBRATION_BINS), CALIBRATION_BINS - 1)
+                cells = {
+                    (TN, FN, FP, TP)[2 * predicted + actual]: 1.0,
+                    BRIER: (probability - actual) ** 2,
+                    LABELED: 1.0,
+                    CAL_N + bin_index: 1.0,
+                    CAL_P + bin_index: probability,
+                    CAL_Y + bin_index: actual,
+                }
+                self._add(db, model_version, cells, now)
+                matched += 1
+            self._bump(db, "index_size", -matched)
+            self._bump(db, "feedback_matched", matched)
+            self._bump(db, "feedback_unmatched", unmatched)
+        if unmatched:
+            logger.debug(f"{unmatched} feedback items had no indexed prediction (expired or unknown)")
+        return {"matched": matched, "unmatched": unmatched}
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def _windows(self, buckets: Dict[int, np.ndarray], first_seen: float, now: float) -> dict:
+        starts = {bucket: bucket * self.resolution for bucket in buckets}
+
+        def total(keep) -> np.ndarray:
+            vector = np.zeros(STATS_SIZE)
+            for bucket, cells in buckets.items():
+                if keep(starts[bucket]):
+                    vector += cells
+            return vector
+
+        windows = {}
+        for size in self.tumbling:
+            start = math.floor(now / size) * size
+            current = total(lambda t: start <= t < start + size)
+            windows[f"tumbling_{size:g}s"] = {
+                "current": {"start": start, **summarize(current)},
+                # None until a window has rolled over since the version was first seen
+                "last_complete": None if first_seen >= start else {
+                    "start": start - size, **summarize(total(lambda t: start - size <= t < start))},
+            }
+        for size in self.sliding:
+            # A bucket drops out once its start is ``size`` seconds old
+            windows[f"sliding_{size:g}s"] = summarize(total(lambda t: t > now - size))
+        return windows
+
+    def report(self, model_version: Optional[str] = None) -> dict:
+        """Current window metrics per model version"""
+        self.flush()
+        now = self.clock()
+        oldest = math.floor((now - self.retention) / self.resolution)
+        query = "SELECT model_version, bucket, slot, value FROM stats WHERE bucket >= ?"
+        args = (oldest,) if model_version is None else (oldest, model_version)
+        if model_version is not None:
+            query += " AND model_version = ?"
+        with self._lock:
+            db = self._db()
+            rows = db.execute(query, args).fetchall()
+            first_seen = dict(db.execute("SELECT model_version, first_seen FROM models").fetchall())
+            counters = self._counters(db)
+
+        buckets: Dict[str, Dict[int, np.ndarray]] = {}
+        for version, bucket, slot, value in rows:
+            vector = buckets.setdefault(version, {}).get(bucket)
+            if vector is None:
+                vector = buckets[version][bucket] = np.zeros(STATS_SIZE)
+            vector[slot] += value
+        return {
+            "timestamp": now,
+            "models": {version: self._windows(buckets[version], first_seen.get(version, now), now)
+                       for version in sorted(buckets)},
+            "feedback": {"matched": counters.get("feedback_matched", 0),
+                         "unmatched": counters.get("feedback_unmatched", 0)},
+            "index": {"size": counters.get("index_size", 0),
+                      "evicted": {"ttl": counters.get("evicted_ttl", 0),
+                                  "capacity": counters.get("evicted_capacity", 0)}},
+        }
+
+    def gauge_values(self):
+        """
+        ``(model_version, window, metric, value)`` for every defined metric:
+        the last complete tumbling windows and the current sliding windows
+        """
+        report = self.report()
+        for version, windows in report["models"].items():
+            for name, result in windows.items():
+                metrics = result.get("last_complete") if name.startswith("tumbling") else result
+                if metrics is None:
+                    continue
+                for metric, value in metrics.items():
+                    if metric != "start" and value is not None:
+                        yield version, name, metric, float(value)
+
+
+performance_tracker = PerformanceTracker()
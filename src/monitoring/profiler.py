@@ -0,0 +1,171 @@
+"""
+Statistical sampling profiler for live API processes
+"""
+from collections import Counter
+from typing import Dict, List, Optional
+import os
+import re
+import sys
+import threading
+import time
+
+from loguru import logger
+
+# Thread pools name workers "<prefix>_<n>" / "<prefix>-<n>"; fold them into one root frame
+_POOL_SUFFIX = re.compile(r"[_-]\d+$")
+
+
+class ProfilerBusy(RuntimeError):
+    """Raised when a profiling session is already running"""
+
+
+class SamplingProfiler:
+    """
+    Samples the Python stacks of every thread in the process at a fixed rate.
+
+    Sampling runs on a daemon thread using ``sys._current_frames()``, so the
+    profiled code is never instrumented and the cost is a stack walk per
+    thread per sample. Stacks are aggregated per thread group (event loop /
+    request handlers, simulator and executor pools, ...) into collapsed-stack
+    counts ready for flamegraph tools. The number of distinct stacks is
+    bounded so the profiler is safe to leave running on a live pod.
+    """
+
+    def __init__(self, max_depth: int = 64, max_stacks: int = 20000):
+        self.max_depth = max_depth
+        self.max_stacks = max_stacks
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stacks: Counter = Counter()
+            self.samples = 0
+            self.dropped = 0
+            self.started_at: Optional[float] = None
+            self.stopped_at: Optional[float] = None
+            self.rate = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @staticmethod
+    def _frame_label(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _sample(self, own_ident: int):
+        names = {t.ident: t.name for t in threading.enumerate()}
+        collected = []
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(self._frame_label(frame))
+                frame = frame.f_back
+            group = _POOL_SUFFIX.sub("", names.get(ident, f"thread-{ident}"))
+            stack.append(f"[{group}]")
+            collected.append(";".join(reversed(stack)))
+        with self._lock:
+            for key in collected:
+                if key in self.stacks or len(self.stacks) < self.max_stacks:
+                    self.stacks[key] += 1
+                else:
+                    self.dropped += 1
+            self.samples += 1
+
+    def _run(self, interval: float):
+        own_ident = threading.get_ident()
+        next_tick = time.perf_counter()
+        while not self._stop.is_set():
+            self._sample(own_ident)
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay < 0:
+                # Fell behind (e.g. GIL contention); skip missed ticks instead of bursting
+                next_tick = time.perf_counter()
+                delay = 0
+            self._stop.wait(delay)
+
+    def start(self, rate: float = 100.0, reset: bool = True):
+        """Start sampling at ``rate`` Hz on a background thread"""
+        if self.running:
+            raise ProfilerBusy("A profiling session is already running")
+        if reset:
+            self.reset()
+        rate = min(max(rate, 1.0), 1000.0)
+        self.rate = rate
+        self.started_at = time.time()
+        self.stopped_at = None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(1.0 / rate,), name="sampling-profiler", daemon=True)
+        self._thread.start()
+        logger.info(f"Sampling profiler started at {rate:.0f} Hz")
+
+    def stop(self, limit: int = 20) -> dict:
+        """Stop sampling and return the report"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.stopped_at = time.time()
+        logger.info(f"Sampling profiler stopped after {self.samples} samples")
+        return self.report(limit)
+
+    def profile(self, seconds: float, rate: float = 100.0, limit: int = 20) -> dict:
+        """Blocking helper: sample for ``seconds`` and return the report"""
+        self.start(rate)
+        time.sleep(seconds)
+        return self.stop(limit)
+
+    def collapsed(self) -> str:
+        """Collapsed-stack output (``frame;frame;frame count`` per line) for flamegraph tools"""
+        with self._lock:
+            items = self.stacks.most_common()
+        return "\n".join(f"{stack} {count}" for stack, count in items)
+
+    def top_functions(self, limit: int = 20) -> List[Dict]:
+        """Functions ranked by inclusive then self samples, with percentages"""
+        with self._lock:
+            items = list(self.stacks.items())
+        total = sum(count for _, count in items) or 1
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in items:
+            frames = stack.split(";")[1:]
+            if not frames:
+                continue
+            self_counts[frames[-1]] += count
+            for frame in set(frames):
+                total_counts[frame] += count
+        return [
+            {
+                "function": function,
+                "self_samples": self_counts[function],
+                "total_samples": total_counts[function],
+                "self_percent": round(100.0 * self_counts[function] / total, 2),
+                "total_percent": round(100.0 * total_counts[function] / total, 2),
+            }
+            for function in sorted(total_counts, key=lambda f: (total_counts[f], self_counts[f]),
+                                   reverse=True)[:limit]
+        ]
+
+    def report(self, limit: int = 20) -> dict:
+        end = self.stopped_at or time.time()
+        return {
+            "running": self.running,
+            "rate_hz": self.rate,
+            "duration": (end - self.started_at) if self.started_at else 0.0,
+            "samples": self.samples,
+            "distinct_stacks": len(self.stacks),
+            "dropped_stacks": self.dropped,
+            "top_functions": self.top_functions(limit),
+            "collapsed": self.collapsed(),
+        }
+
+
+profiler = SamplingProfiler()
@@ -4,6 +4,9 @@ import mlflow
 from loguru import logger
 import time
 
+PROCESSED_DATA = "data/processed/cleaned_dataset.csv"
+MODEL_PATH = "models/trained_model.qmla"
+
 @task
 def load_data_task():
     """Task to load and preprocess data"""
@@ -19,14 +22,23 @@ def preprocess_data_task(data):
     return "data_preprocessed"
 
 @task
-def train_model_task(data):
-    """Task to train model"""
-    logger.info("Training model...")
-    time.sleep(2)
+def train_model_task(data, n_workers: int = 1, transport: str = "shm"):
+    """Task to train model, data-parallel across ``n_workers`` local processes"""
+    import pandas as pd
+    from src.training.distributed import DataParallelTrainer
+    
+    logger.info(f"Training model on {n_workers} worker(s)...")
+    frame = pd.read_csv(PROCESSED_DATA)
+    target = "target" if "target" in frame.columns else frame.columns[-1]
+    X = frame.drop(columns=[target]).to_numpy(dtype=float)
+    y = frame[target].to_numpy()
     
-    # Mock MLflow tracking
-    logger.info("Logging to MLflow...")
-    return "model_trained"
+    trainer = DataParallelTrainer.from_params("params.yaml", n_workers=n_workers, transport=transport,
+                                              n_qubits=X.shape[1], seed=42)
+    history = trainer.fit(X, y)
+    path = trainer.export(MODEL_PATH, metadata={"dataset": PROCESSED_DATA, "n_workers": n_workers})
+    logger.info(f"Model written to {path}")
+    return {"model_path": str(path), "final_loss": history["loss"][-1]}
 
 @task
 def evaluate_model_task(model):
@@ -36,14 +48,14 @@ def evaluate_model_task(model):
     return {"accuracy": 0.95, "loss": 0.1}
 
 @flow(name="quantum-ml-training-flow", task_runner=SequentialTaskRunner())
-def training_flow():
+def training_flow(n_workers: int = 1, transport: str = "shm"):
     """Main training workflow"""
     logger.info("Starting Quantum ML Training Flow")
     
     # Execute tasks in order
     data = load_data_task()
     processed_data = preprocess_data_task(data)
-    model = train_model_task(processed_data)
+    model = train_model_task(processed_data, n_workers=n_workers, transport=transport)
     evaluation = evaluate_model_task(model)
     
     logger.info(f"Training completed with metrics: {evaluation}")
@@ -1,18 +1,42 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 class PredictionRequest(BaseModel):
     features: List[float]
     model_version: Optional[str] = "latest"
+    request_id: Optional[str] = None
 
 class PredictionResponse(BaseModel):
     prediction: List[float]
     confidence: float
     model_version: str
     inference_time: float
+    request_id: Optional[str] = None
 
 class ModelInfo(BaseModel):
     name: str
     version: str
     status: str
     performance: dict
+
+class BatchPredictionRequest(BaseModel):
+    features: List[List[float]]
+    model_version: Optional[str] = "latest"
+
+class BatchPredictionResponse(BaseModel):
+    predictions: List[float]
+    model_version: str
+    inference_time: float
+    count: int
+
+class JobRequest(BaseModel):
+    kind: str
+    payload: Dict[str, Any]
+    priority: int = 0
+
+class FeedbackItem(BaseModel):
+    request_id: str
+    label: float
+
+class FeedbackRequest(BaseModel):
+    feedback: List[FeedbackItem]
@@ -0,0 +1,306 @@
+"""
+Data-Parallel Training
+Local worker processes each simulate a shard of every mini-batch; losses and
+gradients are summed with an all-reduce before an identical optimizer step on
+every rank
+"""
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional
+import logging
+import multiprocessing as mp
+import queue
+import socket
+import struct
+import time
+import traceback
+
+import numpy as np
+
+from src.training.trainer import QuantumTrainer
+
+logger = logging.getLogger(__name__)
+
+TRANSPORTS = ("shm", "tcp")
+
+
+class SharedMemoryTransport:
+    """
+    All-reduce through a ``(world_size, capacity)`` float64 shared-memory block.
+
+    Each rank writes its row, waits on a barrier, then sums all rows in rank
+    order, so every rank gets a bit-identical result and the replicas never
+    drift apart. A second barrier keeps rows from being overwritten early.
+    """
+
+    def __init__(self, name: str, capacity: int, barrier, rank: int, world_size: int):
+        self.rank = rank
+        self.world_size = world_size
+        self.barrier = barrier
+        self._shm = shared_memory.SharedMemory(name=name)
+        self.buffer = np.ndarray((world_size, capacity), dtype=np.float64, buffer=self._shm.buf)
+
+    def allreduce(self, values: np.ndarray) -> np.ndarray:
+        k = len(values)
+        if k > self.buffer.shape[1]:
+            raise ValueError(f"All-reduce of {k} values exceeds buffer capacity {self.buffer.shape[1]}")
+        self.buffer[self.rank, :k] = values
+        self.barrier.wait()
+        total = self.buffer[:, :k].sum(axis=0)
+        self.barrier.wait()
+        return total
+
+    def abort(self):
+        self.barrier.abort()
+
+    def close(self):
+        del self.buffer
+        self._shm.close()
+
+
+def _send_array(sock, values: np.ndarray):
+    payload = np.ascontiguousarray(values, dtype="<f8").tobytes()
+    sock.sendall(struct.pack("<I", len(payload)) + payload)
+
+
+def _recv_exact(sock, n: int) -> bytes:
+    data = bytearray()
+    while len(data) < n:
+        chunk = sock.recv(n - len(data))
+        if not chunk:
+            raise ConnectionError("All-reduce peer disconnected")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def _recv_array(sock) -> np.ndarray:
+    (length,) = struct.unpack("<I", _recv_exact(sock, 4))
+    return np.frombuffer(_recv_exact(sock, length), dtype="<f8")
+
+
+class TCPTransport:
+    """
+    Star all-reduce over TCP as a stand-in for multi-node runs: rank 0 accepts
+    one connection per peer, sums contributions in rank order and sends the
+    total back.
+    """
+
+    def __init__(self, host: str, port: int, rank: int, world_size: int, timeout: float = 60.0):
+        self.rank = rank
+        self.world_size = world_size
+        self.peers = {}
+        if rank == 0:
+            self._server = socket.create_server((host, port))
+            self._server.settimeout(timeout)
+            while len(self.peers) < world_size - 1:
+                conn, _ = self._server.accept()
+                conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                (peer_rank,) = struct.unpack("<I", _recv_exact(conn, 4))
+                self.peers[peer_rank] = conn
+        else:
+            self._server = None
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    self._sock = socket.create_connection((host, port), timeout=timeout)
+                    break
+                except ConnectionRefusedError:
+                    # Rank 0 may not be listening yet
+                    if time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.05)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._sock.sendall(struct.pack("<I", rank))
+
+    def allreduce(self, values: np.ndarray) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64)
+        if self.rank != 0:
+            _send_array(self._sock, values)
+            return _recv_array(self._sock).copy()
+        total = values.copy()
+        for peer_rank in sorted(self.peers):
+            total += _recv_array(self.peers[peer_rank])
+        for conn in self.peers.values():
+            _send_array(conn, total)
+        return total
+
+    def abort(self):
+        self.close()
+
+    def close(self):
+        for conn in self.peers.values():
+            conn.close()
+        if self._server is not None:
+            self._server.close()
+        elif getattr(self, "_sock", None) is not None:
+            self._sock.close()
+
+
+def make_transport(spec: tuple, rank: int, world_size: int):
+    kind = spec[0]
+    if kind == "shm":
+        _, name, capacity, barrier = spec
+        return SharedMemoryTransport(name, capacity, barrier, rank, world_size)
+    if kind == "tcp":
+        _, host, port = spec
+        return TCPTransport(host, port, rank, world_size)
+    raise ValueError(f"Unknown transport: {kind}")
+
+
+class ShardTrainer(QuantumTrainer):
+    """Trainer replica that simulates only its shard of each mini-batch"""
+
+    def __init__(self, rank: int, world_size: int, transport, **kwargs):
+        super().__init__(**kwargs)
+        self.rank = rank
+        self.world_size = world_size
+        self.transport = transport
+
+    def _objective(self, X_batch, targets):
+        X_local = X_batch[self.rank::self.world_size]
+        t_local = targets[self.rank::self.world_size]
+        n_local = len(X_local)
+        states = self.circuit_manager.encode_batch(X_local) if n_local else None
+
+        def reduce_mean(local_sum):
+            total = self.transport.allreduce(np.append(local_sum, n_local))
+            return total[:-1] / total[-1]
+
+        def loss_fn(param_sets):
+            n_sets = len(np.atleast_2d(param_sets))
+            local = self._losses(states, t_local, param_sets) * n_local if n_local else np.zeros(n_sets)
+            losses = reduce_mean(local)
+            self._batch_loss = float(np.mean(losses))
+            return losses
+
+        def grad_fn(params):
+            if n_local:
+                loss, gradient = self._loss_and_gradient(states, t_local, params)
+                local = np.append(gradient, loss) * n_local
+            else:
+                local = np.zeros(self.n_parameters + 1)
+            # The loss rides along in the gradient all-reduce
+            total = reduce_mean(local)
+            self._batch_loss = float(total[-1])
+            return total[:-1]
+
+        return loss_fn, grad_fn
+
+
+def _worker(rank: int, world_size: int, spec: tuple, config: Dict[str, Any], data: tuple, results):
+    transport = None
+    try:
+        transport = make_transport(spec, rank, world_size)
+        if rank != 0:
+            # Only rank 0 writes checkpoints
+            config = {**config, "checkpoint_dir": None}
+        trainer = ShardTrainer(rank, world_size, transport, **config)
+        history = trainer.fit(*data)
+        if rank == 0:
+            results.put(("ok", rank, {"history": history, "parameters": trainer.parameters,
+                                      "optimizer": trainer.optimizer.state_dict()}))
+    except BaseException:
+        if transport is not None:
+            transport.abort()
+        results.put(("error", rank, traceback.format_exc()))
+    finally:
+        if transport is not None:
+            transport.close()
+
+
+class DataParallelTrainer(QuantumTrainer):
+    """
+    Data-parallel ``QuantumTrainer`` over ``n_workers`` local processes.
+
+    Every rank starts from the same seed, shuffles identically and steps the
+    optimizer on the same all-reduced loss and gradient, so the replicas stay
+    in lock-step without broadcasting parameters. ``transport="tcp"`` swaps
+    the shared-memory all-reduce for sockets, the same code path a multi-node
+    launcher would use.
+    """
+
+    def __init__(self, n_workers: int = 2, transport: str = "shm", host: str = "127.0.0.1",
+                 port: int = 0, start_method: Optional[str] = None, **kwargs):
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Unknown transport: {transport}")
+        if kwargs.get("seed") is None:
+            # Replicas must agree on the initial parameters and shuffling
+            kwargs["seed"] = int(np.random.default_rng().integers(2 ** 31))
+        if kwargs.get("optimizer", "adam") == "spsa":
+            kwargs["optimizer_kwargs"] = {"seed": kwargs["seed"], **(kwargs.get("optimizer_kwargs") or {})}
+        super().__init__(**kwargs)
+        self.n_workers = n_workers
+        self.transport = transport
+        self.host = host
+        self.port = port
+        self.start_method = start_method
+        # Experiment logging stays in the parent; workers only train
+        self._config = {k: v for k, v in kwargs.items() if k not in ("circuit_manager", "mlops")}
+        self._config["n_qubits"] = self.n_qubits
+
+    def _log_history(self):
+        if self.mlops is None:
+            return
+        self.mlops.log_quantum_parameters(
+            {"n_qubits": self.n_qubits, "n_parameters": self.n_parameters},
+            {"learning_rate": self.learning_rate, "epochs": self.epochs, "batch_size": self.batch_size,
+             "optimizer": self.optimizer_name, "n_workers": self.n_workers, "transport": self.transport},
+            {"observable": "pauli_z"},
+        )
+        for epoch in range(len(self.history["loss"])):
+            self.mlops.log_quantum_metrics({k: v[epoch] for k, v in self.history.items()}, step=epoch, phase="epoch")
+
+    def _transport_spec(self, ctx):
+        if self.transport == "tcp":
+            port = self.port
+            if not port:
+                with socket.socket() as probe:
+                    probe.bind((self.host, 0))
+                    port = probe.getsockname()[1]
+            return ("tcp", self.host, port), None
+        capacity = 2 * self.n_parameters + 4
+        shm = shared_memory.SharedMemory(create=True, size=self.n_workers * capacity * 8)
+        return ("shm", shm.name, capacity, ctx.Barrier(self.n_workers)), shm
+
+    def fit(self, X, y, X_val=None, y_val=None) -> Dict[str, list]:
+        if self.n_workers <= 1:
+            return super().fit(X, y, X_val, y_val)
+
+        ctx = mp.get_context(self.start_method)
+        spec, shm = self._transport_spec(ctx)
+        results = ctx.Queue()
+        data = (np.asarray(X, dtype=float), np.asarray(y), X_val, y_val)
+        workers = [ctx.Process(target=_worker, args=(rank, self.n_workers, spec, self._config, data, results),
+                               name=f"dp-worker-{rank}", daemon=True)
+                   for rank in range(self.n_workers)]
+        try:
+            for worker in workers:
+                worker.start()
+            outcome = None
+            while outcome is None:
+                try:
+                    outcome = results.get(timeout=1.0)
+                except queue.Empty:
+                    if not any(worker.is_alive() for worker in workers):
+                        raise RuntimeError("Data-parallel workers exited without a result")
+            status, rank, payload = outcome
+            if status != "ok":
+                raise RuntimeError(f"Data-parallel worker {rank} failed:\n{payload}")
+            for worker in workers:
+                worker.join()
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+        self.parameters = payload["parameters"]
+        state = payload["optimizer"]
+        if all(v is not None for v in state.values()):
+            self.optimizer.load_state_dict(state)
+        self.history = payload["history"]
+        self._log_history()
+        logger.info(f"Data-parallel training finished on {self.n_workers} workers ({self.transport}): "
+                    f"{np.mean(self.history['samples_per_second']):.1f} samples/s")
+        return self.history
@@ -0,0 +1,89 @@
+"""
+Vectorized optimizers for variational quantum circuits
+"""
+from typing import Callable, Optional
+import numpy as np
+
+
+class Adam:
+    """Adam optimizer operating on flat NumPy parameter vectors"""
+
+    def __init__(self, learning_rate: float = 0.01, beta1: float = 0.9,
+                 beta2: float = 0.999, epsilon: float = 1e-8):
+        self.learning_rate = learning_rate
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        self.reset()
+
+    def reset(self):
+        """Clear moment estimates"""
+        self.m = None
+        self.v = None
+        self.t = 0
+
+    def update(self, params, grad):
+        """Apply one Adam update given a gradient"""
+        if self.m is None:
+            self.m = np.zeros_like(params)
+            self.v = np.zeros_like(params)
+        self.t += 1
+        self.m = self.beta1 * self.m + (1 - self.beta1) * grad
+        self.v = self.beta2 * self.v + (1 - self.beta2) * grad ** 2
+        m_hat = self.m / (1 - self.beta1 ** self.t)
+        v_hat = self.v / (1 - self.beta2 ** self.t)
+        return params - self.learning_rate * m_hat / (np.sqrt(v_hat) + self.epsilon)
+
+    def step(self, params, loss_fn: Callable, grad_fn: Callable):
+        """One optimization step; Adam needs the exact (parameter-shift) gradient"""
+        return self.update(params, grad_fn(params))
+
+    def state_dict(self) -> dict:
+        return {"m": self.m, "v": self.v, "t": self.t}
+
+    def load_state_dict(self, state: dict):
+        self.m, self.v, self.t = state["m"], state["v"], int(state["t"])
+
+
+class SPSA:
+    """
+    Simultaneous perturbation stochastic approximation.
+
+    Estimates the full gradient from two loss evaluations per step, independent
+    of the number of parameters.
+    """
+
+    def __init__(self, learning_rate: float = 0.1, perturbation: float = 0.1,
+                 alpha: float = 0.602, gamma: float = 0.101, seed: Optional[int] = None):
+        self.learning_rate = learning_rate
+        self.perturbation = perturbation
+        self.alpha = alpha
+        self.gamma = gamma
+        self.rng = np.random.default_rng(seed)
+        self.reset()
+
+    def reset(self):
+        self.t = 0
+
+    def estimate_gradient(self, params, loss_fn: Callable):
+        """Two-point gradient estimate along a random Rademacher direction"""
+        c = self.perturbation / (self.t + 1) ** self.gamma
+        delta = self.rng.choice([-1.0, 1.0], size=params.shape)
+        loss_plus, loss_minus = loss_fn(np.stack([params + c * delta, params - c * delta]))
+        return (loss_plus - loss_minus) / (2 * c) * delta
+
+    def step(self, params, loss_fn: Callable, grad_fn: Callable):
+        """One optimization step using only ``loss_fn``"""
+        grad = self.estimate_gradient(params, loss_fn)
+        a = self.learning_rate / (self.t + 1) ** self.alpha
+        self.t += 1
+        return params - a * grad
+
+    def state_dict(self) -> dict:
+        return {"t": self.t}
+
+    def load_state_dict(self, state: dict):
+        self.t = int(state["t"])
+
+
+OPTIMIZERS = {"adam": Adam, "spsa": SPSA}
@@ -0,0 +1,40 @@
+"""
+DVC training stage
+Trains the variational model on the processed dataset and writes a binary model artifact
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.training.trainer import QuantumTrainer
+
+DATA_PATH = Path("data/processed/cleaned_dataset.csv")
+MODEL_PATH = Path("models/trained_model.qmla")
+METRICS_PATH = Path("metrics/performance.json")
+
+
+def main():
+    data = pd.read_csv(DATA_PATH)
+    target = "target" if "target" in data.columns else data.columns[-1]
+    X = data.drop(columns=[target]).to_numpy(dtype=float)
+    y = data[target].to_numpy()
+
+    trainer = QuantumTrainer.from_params("params.yaml", n_qubits=X.shape[1], seed=42)
+    trainer.fit(X, y)
+    trainer.export(MODEL_PATH, metadata={"dataset": str(DATA_PATH), "target": target})
+
+    METRICS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    metrics = trainer.evaluate(X, y)
+    metrics["samples_per_second"] = float(np.mean(trainer.history["samples_per_second"]))
+    METRICS_PATH.write_text(json.dumps(metrics, indent=2))
+    print(f"Model written to {MODEL_PATH}: {metrics}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Quantum Trainer
+Mini-batch training of the variational circuit model on top of QuantumCircuitManager
+"""
+from pathlib import Path
+from typing import Any, Dict, Optional
+import logging
+import time
+
+import numpy as np
+
+from src.circuits.quantum_manager import QuantumCircuitManager
+from src.training.optimizers import OPTIMIZERS
+
+logger = logging.getLogger(__name__)
+
+# Parameter-shift rule for RY rotations
+SHIFT = np.pi / 2
+
+
+class QuantumTrainer:
+    """
+    Trains ``encoding circuit -> variational circuit -> <Z_0>`` models.
+
+    Each mini-batch is encoded once with ``encode_batch``; forward passes for
+    all parameter sets needed by a step (parameter-shift pairs for Adam, the
+    two perturbations for SPSA) are evaluated over the whole batch through the
+    simulator. Binary labels {0, 1} are mapped to targets {-1, +1}.
+
+    With a ``shot_estimator`` the training forward passes use sampled
+    estimates of <Z_0> instead of exact values, as on hardware;
+    ``total_shots`` counts the measurements spent.
+    """
+
+    def __init__(self,
+                 circuit_manager: Optional[QuantumCircuitManager] = None,
+                 n_qubits: int = 4,
+                 optimizer: str = "adam",
+                 learning_rate: float = 0.01,
+                 epochs: int = 100,
+                 batch_size: int = 32,
+                 patience: Optional[int] = 10,
+                 min_delta: float = 1e-4,
+                 checkpoint_dir: Optional[str] = None,
+                 checkpoint_interval: int = 1,
+                 mlops=None,
+                 log_interval: int = 10,
+                 seed: Optional[int] = None,
+                 optimizer_kwargs: Optional[Dict[str, Any]] = None,
+                 shot_estimator=None):
+        self.circuit_manager = circuit_manager or QuantumCircuitManager(n_qubits=n_qubits)
+        self.n_qubits = self.circuit_manager.n_qubits
+        self.n_parameters = 2 * self.n_qubits
+        self.optimizer_name = optimizer
+        self.optimizer = OPTIMIZERS[optimizer](learning_rate=learning_rate, **(optimizer_kwargs or {}))
+        self.learning_rate = learning_rate
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.patience = patience
+        self.min_delta = min_delta
+        self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else None
+        self.checkpoint_interval = checkpoint_interval
+        self.mlops = mlops
+        self.log_interval = log_interval
+        self.rng = np.random.default_rng(seed)
+        self.parameters = self.rng.uniform(0, 2 * np.pi, self.n_parameters)
+        self.history: Dict[str, list] = {}
+        self.shot_estimator = shot_estimator
+        self.total_shots = 0
+        self._batch_loss = None
+
+    @classmethod
+    def from_params(cls, path: str = "params.yaml", **kwargs):
+        """Build a trainer from the ``training`` section of a DVC params file"""
+        import yaml
+
+        with open(path) as f:
+            training = (yaml.safe_load(f) or {}).get("training", {})
+        config = {k: training[k] for k in ("learning_rate", "epochs", "batch_size") if k in training}
+        config.update(kwargs)
+        return cls(**config)
+
+    # ------------------------------------------------------------------
+    # Forward / loss / gradient
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _targets(y):
+        y = np.asarray(y, dtype=float)
+        if np.isin(y, (0.0, 1.0)).all():
+            return 2 * y - 1
+        return y
+
+    def _forward(self, states, param_sets):
+        """Model outputs for several parameter vectors at once: shape (n_sets, batch)"""
+        outputs = np.stack([
+            self.circuit_manager.z_expectation_batch(
+                self.circuit_manager.evolve_batch(states, self.circuit_manager.create_variational_circuit(p))
+            )
+            for p in np.atleast_2d(param_sets)
+        ])
+        if self.shot_estimator is None:
+            return outputs
+        estimate = self.shot_estimator.estimate_batch(outputs.reshape(-1))
+        self.total_shots += int(estimate["shots"].sum())
+        return estimate["value"].reshape(outputs.shape)
+
+    def _losses(self, states, targets, param_sets):
+        """Mean squared error for each parameter vector"""
+        return np.mean((self._forward(states, param_sets) - targets) ** 2, axis=1)
+
+    def _loss_and_gradient(self, states, targets, params):
+        """MSE at ``params`` and its exact gradient via the parameter-shift rule, batched over all shifts"""
+        shifts = np.eye(self.n_parameters) * SHIFT
+        outputs = self._forward(states, np.vstack([params[None, :], params + shifts, params - shifts]))
+        f0, f_plus, f_minus = outputs[0], outputs[1:self.n_parameters + 1], outputs[self.n_parameters + 1:]
+        d_outputs = (f_plus - f_minus) / 2
+        return float(np.mean((f0 - targets) ** 2)), np.mean(2 * (f0 - targets) * d_outputs, axis=1)
+
+    def _gradient(self, states, targets, params):
+        return self._loss_and_gradient(states, targets, params)[1]
+
+    def _objective(self, X_batch, targets):
+        """
+        Loss and gradient closures over one mini-batch, encoded once. Both keep
+        the loss they evaluated in ``_batch_loss``, so logging it costs no extra pass.
+        """
+        states = self.circuit_manager.encode_batch(X_batch)
+
+        def loss_fn(param_sets):
+            losses = self._losses(states, targets, param_sets)
+            # SPSA evaluates params +/- c * delta; their mean estimates the loss at params
+            self._batch_loss = float(np.mean(losses))
+            return losses
+
+        def grad_fn(params):
+            self._batch_loss, gradient = self._loss_and_gradient(states, targets, params)
+            return gradient
+
+        return loss_fn, grad_fn
+
+    def predict(self, X, parameters=None):
+        """Model outputs <Z_0> in [-1, 1]"""
+        params = self.parameters if parameters is None else parameters
+        return self.circuit_manager.predict_batch(X, params)
+
+    def evaluate(self, X, y) -> Dict[str, float]:
+        """Loss and sign accuracy on a dataset"""
+        targets = self._targets(y)
+        outputs = self.predict(X)
+        return {
+            "loss": float(np.mean((outputs - targets) ** 2)),
+            "accuracy": float(np.mean(np.sign(outputs) == np.sign(targets))),
+        }
+
+    # ------------------------------------------------------------------
+    # Checkpointing
+    # ------------------------------------------------------------------
+    def save_checkpoint(self, path, epoch: int, loss: float):
+        """Save parameters and optimizer state to an .npz file"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = {f"optimizer_{k}": v for k, v in self.optimizer.state_dict().items() if v is not None}
+        np.savez(path, parameters=self.parameters, epoch=epoch, loss=loss, **state)
+        return path
+
+    def load_checkpoint(self, path) -> Dict[str, Any]:
+        """Restore parameters (and optimizer state when present) from an .npz file"""
+        with np.load(path) as data:
+            self.parameters = data["parameters"].copy()
+            state = {k[len("optimizer_"):]: data[k] for k in data.files if k.startswith("optimizer_")}
+            if state:
+                try:
+                    self.optimizer.load_state_dict(state)
+                except KeyError:
+                    # Checkpoint written before the optimizer took its first step
+                    pass
+            return {"epoch": int(data["epoch"]), "loss": float(data["loss"])}
+
+    def export(self, path, name: str = "quantum_model", version: str = "1.0.0",
+               dtype=np.float64, metadata: Optional[Dict[str, Any]] = None):
+        """Write the trained parameters as a binary model artifact"""
+        from src.models.artifact import save_artifact
+
+        metadata = {**(metadata or {}), "optimizer": self.optimizer_name, "epochs_run": len(self.history.get("loss", []))}
+        if self.history.get("loss"):
+            metadata["final_loss"] = self.history["loss"][-1]
+        return save_artifact(path, self.parameters, self.n_qubits, name=name, version=version,
+                             dtype=dtype, metadata=metadata)
+
+    # ------------------------------------------------------------------
+    # Training loop
+    # ------------------------------------------------------------------
+    def fit(self, X, y, X_val=None, y_val=None) -> Dict[str, list]:
+        """Run mini-batch training with early stopping; returns the history"""
+        X = np.asarray(X, dtype=float)
+        targets = self._targets(y)
+        n_samples = X.shape[0]
+        history = {"loss": [], "samples_per_second": []}
+        if X_val is not None:
+            history.update({"val_loss": [], "val_accuracy": []})
+
+        if self.mlops is not None:
+            self.mlops.log_quantum_parameters(
+                {"n_qubits": self.n_qubits, "n_parameters": self.n_parameters},
+                {"learning_rate": self.learning_rate, "epochs": self.epochs,
+                 "batch_size": self.batch_size, "optimizer": self.optimizer_name},
+                {"observable": "pauli_z"},
+            )
+
+        best_loss, best_params, stale = np.inf, self.parameters.copy(), 0
+        step = 0
+        for epoch in range(self.epochs):
+            start = time.perf_counter()
+            order = self.rng.permutation(n_samples)
+            epoch_loss = 0.0
+            for offset in range(0, n_samples, self.batch_size):
+                idx = order[offset:offset + self.batch_size]
+                loss_fn, grad_fn = self._objective(X[idx], targets[idx])
+                self.parameters = self.optimizer.step(self.parameters, loss_fn, grad_fn)
+                batch_loss = self._batch_loss
+                epoch_loss += batch_loss * len(idx)
+
+                step += 1
+                if self.mlops is not None and step % self.log_interval == 0:
+                    self.mlops.log_quantum_metrics({"batch_loss": batch_loss}, step=step)
+
+            elapsed = time.perf_counter() - start
+            history["loss"].append(epoch_loss / n_samples)
+            history["samples_per_second"].append(n_samples / elapsed if elapsed > 0 else float("inf"))
+            monitored = history["loss"][-1]
+            epoch_metrics = {"loss": monitored, "samples_per_second": history["samples_per_second"][-1]}
+
+            if X_val is not None:
+                val = self.evaluate(X_val, y_val)
+                history["val_loss"].append(val["loss"])
+                history["val_accuracy"].append(val["accuracy"])
+                monitored = val["loss"]
+                epoch_metrics.update({"val_loss": val["loss"], "val_accuracy": val["accuracy"]})
+
+            if self.mlops is not None:
+                self.mlops.log_quantum_metrics(epoch_metrics, step=epoch, phase="epoch")
+
+            if monitored < best_loss - self.min_delta:
+                best_loss, best_params, stale = monitored, self.parameters.copy(), 0
+                if self.checkpoint_dir is not None:
+                    self.save_checkpoint(self.checkpoint_dir / "best.npz", epoch, monitored)
+            else:
+                stale += 1
+
+            if self.checkpoint_dir is not None and (epoch + 1) % self.checkpoint_interval == 0:
+                self.save_checkpoint(self.checkpoint_dir / f"checkpoint_epoch{epoch + 1}.npz", epoch, monitored)
+
+            if self.patience is not None and stale >= self.patience:
+                logger.info(f"Early stopping at epoch {epoch + 1} (best loss {best_loss:.4f})")
+                break
+
+        self.parameters = best_params
+        self.history = history
+        logger.info(f"Training finished: {len(history['loss'])} epochs, "
+                    f"{np.mean(history['samples_per_second']):.1f} samples/s")
+        return history
@@ -0,0 +1,255 @@
+"""
+Hyperparameter Search
+Asynchronous successive halving (ASHA) over epochs and shots as fidelity budgets
+"""
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import math
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Config keys passed straight to QuantumTrainer; everything else is only logged
+TRAINER_KEYS = ("n_qubits", "learning_rate", "optimizer", "batch_size")
+CIRCUIT_KEYS = ("n_qubits", "n_layers")
+MODEL_KEYS = ("shots", "observable")
+
+# Training data held by each worker process, set by the pool initializer
+_worker_data = None
+
+
+def sample_config(space: Dict[str, Any], rng: np.random.Generator) -> Dict[str, Any]:
+    """
+    Draw one configuration from a search space.
+
+    Lists are categorical choices, ``(low, high)`` tuples are uniform and
+    ``(low, high, "log")`` tuples are log-uniform; anything else is fixed.
+    """
+    config = {}
+    for key, spec in space.items():
+        if isinstance(spec, list):
+            value = spec[rng.integers(len(spec))]
+            config[key] = value.item() if isinstance(value, np.generic) else value
+        elif isinstance(spec, tuple) and len(spec) == 3 and spec[2] == "log":
+            config[key] = float(np.exp(rng.uniform(np.log(spec[0]), np.log(spec[1]))))
+        elif isinstance(spec, tuple) and len(spec) == 2:
+            config[key] = float(rng.uniform(spec[0], spec[1]))
+        else:
+            config[key] = spec
+    return config
+
+
+def shot_estimator(shots: Optional[int], seed: int):
+    """Estimator measuring every circuit exactly ``shots`` times; None means exact expectation values"""
+    if not shots:
+        return None
+    from src.circuits.shots import AdaptiveShotEstimator
+
+    # A zero error target with initial_shots == max_shots stops after one fixed-size round
+    return AdaptiveShotEstimator(target_error=0.0, initial_shots=int(shots), max_shots=int(shots), seed=seed)
+
+
+def _init_worker(X, y, X_val, y_val):
+    global _worker_data
+    _worker_data = (X, y, X_val, y_val)
+
+
+def _run_trial(task) -> Dict[str, Any]:
+    """Train a trial for ``epochs`` more epochs and score it, both at a per-circuit shot budget"""
+    from src.training.trainer import QuantumTrainer
+
+    config, epochs, shots, state, seed = task
+    X, y, X_val, y_val = _worker_data
+    start = time.perf_counter()
+
+    estimator = shot_estimator(shots, seed)
+    trainer = QuantumTrainer(epochs=epochs, patience=None, seed=seed, shot_estimator=estimator,
+                             **{k: config[k] for k in TRAINER_KEYS if k in config})
+    if state is not None:
+        trainer.parameters = state["parameters"].copy()
+        if state.get("optimizer"):
+            trainer.optimizer.load_state_dict(state["optimizer"])
+    trainer.fit(X, y)
+
+    targets = trainer._targets(y_val)
+    exact = trainer.predict(X_val)
+    estimated = exact if estimator is None else estimator.estimate_batch(exact)["value"]
+    optimizer_state = trainer.optimizer.state_dict()
+    return {
+        "val_loss": float(np.mean((estimated - targets) ** 2)),
+        "val_loss_exact": float(np.mean((exact - targets) ** 2)),
+        "val_accuracy": float(np.mean(np.sign(estimated) == np.sign(targets))),
+        "train_loss": trainer.history["loss"][-1],
+        "shots_used": estimator.total_shots if estimator is not None else 0,
+        "elapsed": time.perf_counter() - start,
+        "state": {
+            "parameters": trainer.parameters,
+            "optimizer": optimizer_state if all(v is not None for v in optimizer_state.values()) else None,
+        },
+    }
+
+
+class ASHAScheduler:
+    """
+    Asynchronous successive halving.
+
+    Rung ``k`` trains for ``min_resource * eta**k`` epochs, measuring every
+    circuit evaluation (training forward passes and validation) with
+    ``min_shots * eta**k`` shots (capped at ``max_shots``). Whenever a worker
+    is free, the highest rung with a trial in the top ``1/eta`` of its rung that
+    has not yet been promoted gets promoted; otherwise a new trial starts at
+    rung 0. No rung ever waits for a full cohort to finish.
+    """
+
+    def __init__(self, min_resource: int = 1, max_resource: int = 27, reduction_factor: int = 3,
+                 min_shots: Optional[int] = 128, max_shots: Optional[int] = 8192):
+        if reduction_factor < 2:
+            raise ValueError("reduction_factor must be at least 2")
+        self.eta = reduction_factor
+        self.min_resource = min_resource
+        self.max_resource = max_resource
+        self.min_shots = min_shots
+        self.max_shots = max_shots
+        self.n_rungs = int(math.floor(math.log(max_resource / min_resource, reduction_factor) + 1e-9)) + 1
+        # rung -> {trial_id: score}
+        self.results: List[Dict[int, float]] = [{} for _ in range(self.n_rungs)]
+        self.promoted: List[set] = [set() for _ in range(self.n_rungs)]
+
+    def resource(self, rung: int) -> int:
+        return min(self.max_resource, self.min_resource * self.eta ** rung)
+
+    def shots(self, rung: int) -> Optional[int]:
+        if not self.min_shots:
+            return None
+        shots = self.min_shots * self.eta ** rung
+        return min(shots, self.max_shots) if self.max_shots else shots
+
+    def promotable(self) -> Optional[Tuple[int, int]]:
+        """``(trial_id, next_rung)`` for the best pending promotion, if any"""
+        for rung in range(self.n_rungs - 2, -1, -1):
+            scores = self.results[rung]
+            n_top = len(scores) // self.eta
+            if n_top == 0:
+                continue
+            top = sorted(scores, key=scores.get)[:n_top]
+            for trial_id in top:
+                if trial_id not in self.promoted[rung]:
+                    return trial_id, rung + 1
+        return None
+
+    def mark_promoted(self, trial_id: int, rung: int):
+        self.promoted[rung - 1].add(trial_id)
+
+    def report(self, trial_id: int, rung: int, score: float):
+        self.results[rung][trial_id] = score
+
+
+class HyperparameterSearch:
+    """
+    Runs ASHA over QuantumTrainer configurations on local worker processes.
+
+    Promoted trials resume from their previous parameters and optimizer state,
+    so a trial reaching the top rung costs ``max_resource`` epochs in total.
+    Every evaluated rung is recorded as a run through ``mlops`` when given.
+    """
+
+    def __init__(self, space: Dict[str, Any], scheduler: Optional[ASHAScheduler] = None,
+                 n_trials: int = 27, workers: int = 2, mlops=None, seed: int = 0,
+                 name: str = "asha"):
+        self.space = space
+        self.scheduler = scheduler or ASHAScheduler()
+        self.n_trials = n_trials
+        self.workers = workers
+        self.mlops = mlops
+        self.seed = seed
+        self.name = name
+        self.rng = np.random.default_rng(seed)
+        self.trials: Dict[int, Dict[str, Any]] = {}
+
+    def _next_task(self):
+        promotion = self.scheduler.promotable()
+        if promotion is not None:
+            trial_id, rung = promotion
+            self.scheduler.mark_promoted(trial_id, rung)
+        elif len(self.trials) < self.n_trials:
+            trial_id, rung = len(self.trials), 0
+            self.trials[trial_id] = {"trial_id": trial_id, "config": sample_config(self.space, self.rng),
+                                     "rung": -1, "epochs": 0, "state": None, "history": []}
+        else:
+            return None
+        trial = self.trials[trial_id]
+        epochs = self.scheduler.resource(rung) - trial["epochs"]
+        shots = self.scheduler.shots(rung)
+        seed = self.seed * 100003 + trial_id
+        return trial_id, rung, (trial["config"], epochs, shots, trial["state"], seed)
+
+    def _record(self, trial_id: int, rung: int, result: Dict[str, Any]):
+        trial = self.trials[trial_id]
+        trial["rung"] = rung
+        trial["epochs"] = self.scheduler.resource(rung)
+        trial["state"] = result.pop("state")
+        trial["history"].append({"rung": rung, "epochs": trial["epochs"],
+                                 "shots": self.scheduler.shots(rung), **result})
+        self.scheduler.report(trial_id, rung, result["val_loss"])
+
+        if self.mlops is not None:
+            config = trial["config"]
+            self.mlops.start_experiment(run_name=f"{self.name}_trial{trial_id}_rung{rung}",
+                                        tags={"search": self.name, "trial": str(trial_id), "rung": str(rung)})
+            self.mlops.log_quantum_parameters(
+                {k: config[k] for k in CIRCUIT_KEYS if k in config},
+                {**{k: v for k, v in config.items() if k not in CIRCUIT_KEYS + MODEL_KEYS},
+                 "epochs": trial["epochs"]},
+                {**{k: config[k] for k in MODEL_KEYS if k in config}, "shots": self.scheduler.shots(rung)},
+            )
+            self.mlops.log_quantum_metrics({k: v for k, v in result.items() if k != "elapsed"},
+                                           step=rung, phase="search")
+            self.mlops.end_experiment()
+
+    def run(self, X, y, X_val, y_val) -> Dict[str, Any]:
+        """Search until every trial has been started and no promotion is possible"""
+        start = time.perf_counter()
+        pending = {}
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(np.asarray(X, dtype=float), np.asarray(y),
+                                           np.asarray(X_val, dtype=float), np.asarray(y_val))) as pool:
+            while True:
+                while len(pending) < self.workers:
+                    task = self._next_task()
+                    if task is None:
+                        break
+                    trial_id, rung, payload = task
+                    pending[pool.submit(_run_trial, payload)] = (trial_id, rung)
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    trial_id, rung = pending.pop(future)
+                    self._record(trial_id, rung, future.result())
+                    logger.info(f"Trial {trial_id} rung {rung}: val_loss "
+                                f"{self.trials[trial_id]['history'][-1]['val_loss']:.4f}")
+        return self.summary(time.perf_counter() - start)
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        top_rung = max(trial["rung"] for trial in self.trials.values())
+        finalists = [t for t in self.trials.values() if t["rung"] == top_rung]
+        best = min(finalists, key=lambda t: t["history"][-1]["val_loss"])
+        epochs_used = sum(t["epochs"] for t in self.trials.values())
+        shots_used = sum(h["shots_used"] for t in self.trials.values() for h in t["history"])
+        full_budget = len(self.trials) * self.scheduler.max_resource
+        return {
+            "best_trial": best["trial_id"],
+            "best_config": best["config"],
+            "best_val_loss": best["history"][-1]["val_loss"],
+            "best_parameters": best["state"]["parameters"],
+            "n_trials": len(self.trials),
+            "epochs_used": epochs_used,
+            "full_budget_epochs": full_budget,
+            "budget_fraction": epochs_used / full_budget if full_budget else 0.0,
+            "shots_used": shots_used,
+            "elapsed": elapsed,
+            "trials": [{k: v for k, v in t.items() if k != "state"} for t in self.trials.values()],
+        }
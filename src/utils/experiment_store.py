@@ -0,0 +1,349 @@
+"""
+Embedded Experiment Store
+SQLite (WAL) tracking backend for high-frequency quantum training metrics
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = "experiments/experiments.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    experiment TEXT NOT NULL,
+    name TEXT,
+    status TEXT NOT NULL,
+    start_time REAL NOT NULL,
+    end_time REAL,
+    tags TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS runs_experiment ON runs (experiment, start_time);
+
+CREATE TABLE IF NOT EXISTS params (
+    run_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT,
+    value_num REAL,
+    PRIMARY KEY (run_id, key)
+);
+CREATE INDEX IF NOT EXISTS params_key_value ON params (key, value_num, value);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    step INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    value REAL
+);
+CREATE INDEX IF NOT EXISTS metrics_run_key_step ON metrics (run_id, key, step);
+"""
+
+COMPARISONS = {"=", "!=", "<", "<=", ">", ">="}
+
+
+def _numeric(value) -> Optional[float]:
+    if isinstance(value, bool):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ExperimentStore:
+    """
+    Local experiment tracking in a single SQLite database.
+
+    Metrics are buffered in memory and written with ``executemany`` inside
+    one transaction per flush, so logging millions of per-step values costs
+    a handful of commits instead of one file append each. WAL mode lets
+    readers query while a training process is still writing.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_STORE_PATH, flush_every: int = 5000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self._lock = threading.RLock()
+        self._buffer: List[Tuple] = []
+        self._next_step: Dict[Tuple[str, str], int] = {}
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def create_run(self, experiment: str, name: Optional[str] = None,
+                   tags: Optional[Dict[str, str]] = None, run_id: Optional[str] = None) -> str:
+        run_id = run_id or uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, experiment, name, status, start_time, tags) VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id, experiment, name, "RUNNING", time.time(), json.dumps(tags or {})),
+            )
+            self._conn.commit()
+        return run_id
+
+    def set_tags(self, run_id: str, tags: Dict[str, str]):
+        with self._lock:
+            row = self._conn.execute("SELECT tags FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+            if row is None:
+                raise KeyError(run_id)
+            merged = {**json.loads(row[0]), **{k: str(v) for k, v in tags.items()}}
+            self._conn.execute("UPDATE runs SET tags = ? WHERE run_id = ?", (json.dumps(merged), run_id))
+            self._conn.commit()
+
+    def end_run(self, run_id: str, status: str = "FINISHED"):
+        with self._lock:
+            self.flush()
+            self._conn.execute("UPDATE runs SET status = ?, end_time = ? WHERE run_id = ?",
+                               (status, time.time(), run_id))
+            self._conn.commit()
+
+    def log_params(self, run_id: str, params: Dict[str, Any]):
+        rows = [(run_id, key, str(value), _numeric(value)) for key, value in params.items()]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO params VALUES (?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def log_metrics(self, run_id: str, metrics: Dict[str, float], step: Optional[int] = None,
+                    timestamp: Optional[float] = None):
+        """Buffer one value per metric; a missing ``step`` continues each series"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            for key, value in metrics.items():
+                series = (run_id, key)
+                row_step = self._next_step.get(series, 0) if step is None else int(step)
+                self._next_step[series] = row_step + 1
+                self._buffer.append((run_id, key, row_step, timestamp, float(value)))
+            if len(self._buffer) >= self.flush_every:
+                self.flush()
+
+    def log_batch(self, run_id: str, key: str, values: Sequence[float],
+                  steps: Optional[Sequence[int]] = None, timestamp: Optional[float] = None):
+        """Bulk insert a whole series (e.g. per-step losses) in one transaction"""
+        values = np.asarray(values, dtype=float)
+        with self._lock:
+            if steps is None:
+                first = self._next_step.get((run_id, key), 0)
+                steps = np.arange(first, first + len(values))
+            steps = np.asarray(steps, dtype=np.int64)
+            if len(steps):
+                self._next_step[(run_id, key)] = int(steps.max()) + 1
+            timestamp = time.time() if timestamp is None else timestamp
+            self.flush()
+            self._conn.executemany(
+                "INSERT INTO metrics VALUES (?, ?, ?, ?, ?)",
+                ((run_id, key, int(s), timestamp, float(v)) for s, v in zip(steps, values)),
+            )
+            self._conn.commit()
+
+    def flush(self):
+        with self._lock:
+            if not self._buffer:
+                return
+            rows, self._buffer = self._buffer, []
+            self._conn.executemany("INSERT INTO metrics VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def _query(self, sql: str, args: Iterable = ()) -> List[tuple]:
+        with self._lock:
+            self.flush()
+            return self._conn.execute(sql, tuple(args)).fetchall()
+
+    def get_params(self, run_id: str) -> Dict[str, str]:
+        return dict(self._query("SELECT key, value FROM params WHERE run_id = ?", (run_id,)))
+
+    def metric_keys(self, run_id: str) -> List[str]:
+        return [r[0] for r in self._query("SELECT DISTINCT key FROM metrics WHERE run_id = ?", (run_id,))]
+
+    def get_metric(self, run_id: str, key: str, max_points: Optional[int] = None,
+                   start_step: Optional[int] = None, end_step: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Return a metric series as arrays.
+
+        With ``max_points`` the series is bucketed by step range inside SQLite
+        and each bucket reports its first step, mean, min and max, so plotting a
+        million-step run transfers only ``max_points`` rows.
+        """
+        where = "run_id = ? AND key = ?"
+        args: List[Any] = [run_id, key]
+        if start_step is not None:
+            where += " AND step >= ?"
+            args.append(start_step)
+        if end_step is not None:
+            where += " AND step <= ?"
+            args.append(end_step)
+
+        count, lo, hi = self._query(f"SELECT COUNT(*), MIN(step), MAX(step) FROM metrics WHERE {where}", args)[0]
+        if max_points is None or count <= max_points:
+            rows = self._query(f"SELECT step, value FROM metrics WHERE {where} ORDER BY step", args)
+            steps = np.array([r[0] for r in rows], dtype=np.int64)
+            values = np.array([r[1] for r in rows], dtype=float)
+            return {"step": steps, "value": values, "min": values, "max": values}
+
+        span = hi - lo + 1
+        rows = self._query(
+            f"SELECT MIN(step), AVG(value), MIN(value), MAX(value) FROM metrics WHERE {where} "
+            f"GROUP BY ((step - ?) * ?) / ? ORDER BY 1",
+            args + [lo, max_points, span],
+        )
+        columns = list(zip(*rows))
+        return {
+            "step": np.array(columns[0], dtype=np.int64),
+            "value": np.array(columns[1], dtype=float),
+            "min": np.array(columns[2], dtype=float),
+            "max": np.array(columns[3], dtype=float),
+        }
+
+    def metric_summary(self, run_id: str, key: str) -> Optional[Dict[str, float]]:
+        row = self._query(
+            "SELECT COUNT(*), MIN(value), MAX(value), "
+            "(SELECT value FROM metrics WHERE run_id = ? AND key = ? ORDER BY step DESC LIMIT 1) "
+            "FROM metrics WHERE run_id = ? AND key = ?",
+            (run_id, key, run_id, key),
+        )[0]
+        if not row[0]:
+            return None
+        return {"count": row[0], "min": row[1], "max": row[2], "last": row[3]}
+
+    def get_run(self, run_id: str) -> Dict[str, Any]:
+        rows = self._query("SELECT run_id, experiment, name, status, start_time, end_time, tags "
+                           "FROM runs WHERE run_id = ?", (run_id,))
+        if not rows:
+            raise KeyError(run_id)
+        run_id, experiment, name, status, start_time, end_time, tags = rows[0]
+        return {
+            "run_id": run_id,
+            "experiment": experiment,
+            "name": name,
+            "status": status,
+            "start_time": start_time,
+            "end_time": end_time,
+            "tags": json.loads(tags),
+            "params": self.get_params(run_id),
+            "metrics": {key: self.metric_summary(run_id, key) for key in self.metric_keys(run_id)},
+        }
+
+    def search_runs(self, experiment: Optional[str] = None, params: Optional[Dict[str, Any]] = None,
+                    metric: Optional[str] = None, mode: str = "last", ascending: bool = True,
+                    limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Find runs by parameter values, optionally ranked by a metric.
+
+        ``params`` maps keys to a value (equality) or an ``(op, value)`` pair
+        with op in ``=, !=, <, <=, >, >=``; numeric values compare numerically.
+        ``mode`` picks the metric aggregate used for ranking: last, min or max.
+        """
+        clauses, args = [], []
+        if experiment is not None:
+            clauses.append("r.experiment = ?")
+            args.append(experiment)
+        for key, condition in (params or {}).items():
+            op, value = condition if isinstance(condition, tuple) else ("=", condition)
+            if op not in COMPARISONS:
+                raise ValueError(f"Unsupported comparison: {op}")
+            number = _numeric(value)
+            column, operand = ("value_num", number) if number is not None else ("value", str(value))
+            clauses.append(f"r.run_id IN (SELECT run_id FROM params WHERE key = ? AND {column} {op} ?)")
+            args.extend([key, operand])
+
+        select = "SELECT r.run_id"
+        order = "r.start_time"
+        if metric is not None:
+            if mode == "last":
+                aggregate = ("(SELECT value FROM metrics m WHERE m.run_id = r.run_id AND m.key = ? "
+                             "ORDER BY step DESC LIMIT 1)")
+            elif mode in ("min", "max"):
+                aggregate = f"(SELECT {mode.upper()}(value) FROM metrics m WHERE m.run_id = r.run_id AND m.key = ?)"
+            else:
+                raise ValueError(f"Unknown mode: {mode}")
+            select += f", {aggregate} AS score"
+            args.insert(0, metric)
+            order = "score IS NULL, score"
+        sql = f"{select} FROM runs r"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order} {'ASC' if ascending else 'DESC'}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+
+        results = []
+        for row in self._query(sql, args):
+            run = self.get_run(row[0])
+            if metric is not None:
+                run["score"] = row[1]
+            results.append(run)
+        return results
+
+    def compare_runs(self, run_ids: Sequence[str], metrics: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Side-by-side params and metric summaries, plus the params that differ"""
+        runs = {run_id: self.get_run(run_id) for run_id in run_ids}
+        keys = set().union(*(run["params"] for run in runs.values())) if runs else set()
+        differing = sorted(k for k in keys if len({run["params"].get(k) for run in runs.values()}) > 1)
+        if metrics is not None:
+            for run in runs.values():
+                run["metrics"] = {k: v for k, v in run["metrics"].items() if k in metrics}
+        return {"runs": runs, "differing_params": differing}
+
+    # ------------------------------------------------------------------
+    # MLflow export
+    # ------------------------------------------------------------------
+    def export_to_mlflow(self, run_id: str, tracking_uri: Optional[str] = None,
+                         experiment_name: Optional[str] = None, batch_size: int = 1000) -> str:
+        """Replay a stored run into MLflow with ``log_batch``; returns the MLflow run id"""
+        from mlflow.entities import Metric, Param
+        from mlflow.tracking import MlflowClient
+
+        run = self.get_run(run_id)
+        client = MlflowClient(tracking_uri=tracking_uri)
+        name = experiment_name or run["experiment"]
+        experiment = client.get_experiment_by_name(name)
+        experiment_id = experiment.experiment_id if experiment else client.create_experiment(name)
+        mlflow_run = client.create_run(experiment_id, start_time=int(run["start_time"] * 1000),
+                                       tags={**run["tags"], "mlflow.runName": run["name"] or run_id,
+                                             "source_run_id": run_id})
+        mlflow_id = mlflow_run.info.run_id
+
+        params = [Param(k, v) for k, v in run["params"].items()]
+        for i in range(0, len(params), 100):
+            client.log_batch(mlflow_id, params=params[i:i + 100])
+
+        batch = []
+        with self._lock:
+            self.flush()
+            cursor = self._conn.execute("SELECT key, value, timestamp, step FROM metrics WHERE run_id = ? "
+                                        "ORDER BY key, step", (run_id,))
+            rows = cursor.fetchall()
+        for key, value, timestamp, step in rows:
+            batch.append(Metric(key, value, int(timestamp * 1000), step))
+            if len(batch) >= batch_size:
+                client.log_batch(mlflow_id, metrics=batch)
+                batch = []
+        if batch:
+            client.log_batch(mlflow_id, metrics=batch)
+        client.set_terminated(mlflow_id, status=run["status"] if run["status"] != "RUNNING" else "FINISHED")
+        logger.info(f"Exported run {run_id} ({len(rows)} metric values) to MLflow run {mlflow_id}")
+        return mlflow_id
@@ -4,10 +4,12 @@ Industry-standard experiment tracking, model management, and workflow orchestrat
 """
 import logging
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Sequence
 from datetime import datetime
 from pathlib import Path
 
+from src.utils.experiment_store import DEFAULT_STORE_PATH, ExperimentStore
+
 logger = logging.getLogger(__name__)
 
 class QuantumMLOpsManager:
@@ -19,12 +21,24 @@ class QuantumMLOpsManager:
                  experiment_name: str = "quantum-ml-experiments",
                  tracking_uri: str = "./mlruns",
                  wandb_project: str = "quantum-ml-platform",
-                 enable_wandb: bool = False):
+                 enable_wandb: bool = False,
+                 store_backend: str = "mlflow",
+                 store_path: Optional[str] = None):
         
         self.experiment_name = experiment_name
         self.tracking_uri = tracking_uri
         self.wandb_project = wandb_project
         self.enable_wandb = enable_wandb
+        self.store_backend = store_backend
+        self.run_id = None
+        
+        # Opt-in embedded SQLite store; MLflow is then only written on export.
+        # Its path is separate from tracking_uri, which may be an MLflow server URL.
+        self.store = None
+        if store_backend == "sqlite":
+            self.store = ExperimentStore(store_path or os.environ.get("EXPERIMENT_STORE", DEFAULT_STORE_PATH))
+        elif store_backend != "mlflow":
+            raise ValueError(f"Unknown store backend: {store_backend}")
         
         # Set environment variable to disable WandB prompts
         os.environ["WANDB_SILENT"] = "true"
@@ -61,12 +75,14 @@ class QuantumMLOpsManager:
         
         self._setup_directories()
         logger.info(f"QuantumMLOpsManager initialized for experiment: {experiment_name}")
+        logger.info(f"Tracking backend: {store_backend}")
         logger.info(f"MLflow available: {self.mlflow_available}")
         logger.info(f"WandB available: {self.wandb_available}")
     
     def _setup_directories(self):
         """Create necessary directories for MLOps"""
-        Path(self.tracking_uri).mkdir(exist_ok=True)
+        if "://" not in str(self.tracking_uri):
+            Path(self.tracking_uri).mkdir(exist_ok=True)
         Path("models").mkdir(exist_ok=True)
         Path("experiments").mkdir(exist_ok=True)
     
@@ -80,8 +96,14 @@ class QuantumMLOpsManager:
         if run_name is None:
             run_name = f"quantum_run_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
+        if self.store is not None:
+            run_tags = dict(tags or {})
+            if description:
+                run_tags["description"] = description
+            run_tags.update({f"system_{k}": v for k, v in self._system_info().items()})
+            run_id = self.store.create_run(self.experiment_name, run_name, run_tags)
         # Start MLflow run if available
-        if self.mlflow_available:
+        elif self.mlflow_available:
             import mlflow
             mlflow.start_run(run_name=run_name)
             
@@ -101,6 +123,7 @@ class QuantumMLOpsManager:
             # Local mode - just create a run ID
             run_id = f"local_{run_name}"
         
+        self.run_id = run_id
         logger.info(f"Started experiment: {run_name}")
         return run_id
     
@@ -111,14 +134,17 @@ class QuantumMLOpsManager:
         """
         Log comprehensive quantum experiment parameters
         """
+        params = {
+            **{f"circuit_{k}": v for k, v in circuit_params.items()},
+            **{f"training_{k}": v for k, v in training_params.items()},
+            **{f"model_{k}": v for k, v in model_params.items()}
+        }
+        if self.store is not None:
+            self.store.log_params(self._active_run(), params)
         # Log to MLflow if available
-        if self.mlflow_available:
+        elif self.mlflow_available:
             import mlflow
-            mlflow.log_params({
-                **{f"circuit_{k}": v for k, v in circuit_params.items()},
-                **{f"training_{k}": v for k, v in training_params.items()},
-                **{f"model_{k}": v for k, v in model_params.items()}
-            })
+            mlflow.log_params(params)
         
         # Log to wandb if available
         if self.wandb_available:
@@ -140,8 +166,10 @@ class QuantumMLOpsManager:
         """
         Log quantum-specific metrics with phase tracking
         """
+        if self.store is not None:
+            self.store.log_metrics(self._active_run(), {f"{phase}_{k}": v for k, v in metrics.items()}, step=step)
         # Log to MLflow if available
-        if self.mlflow_available:
+        elif self.mlflow_available:
             import mlflow
             mlflow.log_metrics({f"{phase}_{k}": v for k, v in metrics.items()}, step=step)
         
@@ -154,20 +182,57 @@ class QuantumMLOpsManager:
                 # Silently fail if WandB has issues
                 pass
     
-    def _log_system_info(self):
-        """Log system and environment information"""
-        if not self.mlflow_available:
+    def log_metric_series(self,
+                          name: str,
+                          values: Sequence[float],
+                          steps: Optional[Sequence[int]] = None,
+                          phase: str = "training"):
+        """
+        Bulk-log a whole metric series, e.g. per-step losses from a training epoch
+        """
+        if self.store is not None:
+            self.store.log_batch(self._active_run(), f"{phase}_{name}", values, steps)
             return
-            
+        if steps is None:
+            steps = range(len(values))
+        for step, value in zip(steps, values):
+            self.log_quantum_metrics({name: float(value)}, step=int(step), phase=phase)
+    
+    def export_to_mlflow(self, run_id: Optional[str] = None, tracking_uri: Optional[str] = None) -> str:
+        """
+        Copy a run from the embedded store into MLflow; returns the MLflow run ID
+        """
+        if self.store is None:
+            raise RuntimeError("Runs are already logged to MLflow directly")
+        if not self.mlflow_available:
+            raise RuntimeError("MLflow is not installed")
+        return self.store.export_to_mlflow(run_id or self.run_id, tracking_uri or self.tracking_uri,
+                                           self.experiment_name)
+    
+    def _active_run(self) -> str:
+        """Run ID to log to, starting a run on first use like MLflow does"""
+        if self.run_id is None:
+            self.start_experiment()
+        return self.run_id
+    
+    def _system_info(self) -> Dict[str, str]:
         import platform
         import sys
-        import mlflow
         
-        system_info = {
+        return {
             "python_version": sys.version,
             "platform": platform.platform(),
             "processor": platform.processor()
         }
+    
+    def _log_system_info(self):
+        """Log system and environment information"""
+        if not self.mlflow_available:
+            return
+            
+        import mlflow
+        
+        system_info = self._system_info()
         
         # Add version info for available packages
         try:
@@ -185,7 +250,10 @@ class QuantumMLOpsManager:
     
     def end_experiment(self):
         """End the current experiment"""
-        if self.mlflow_available:
+        if self.store is not None:
+            if self.run_id is not None:
+                self.store.end_run(self.run_id)
+        elif self.mlflow_available:
             import mlflow
             mlflow.end_run()
         
@@ -197,6 +265,7 @@ class QuantumMLOpsManager:
                 # Silently fail if WandB has issues
                 pass
         
+        self.run_id = None
         logger.info("Experiment completed")
 
 # Example usage and testing
@@ -0,0 +1,14 @@
+"""
+Shared test configuration
+"""
+import atexit
+import os
+import shutil
+import tempfile
+
+# Tests that start the app must not leave job or performance databases in the working tree.
+# Set at conftest import, before the module-level managers read them.
+_data_dir = tempfile.mkdtemp(prefix="qml-tests-")
+atexit.register(shutil.rmtree, _data_dir, ignore_errors=True)
+os.environ.setdefault("JOBS_DB", os.path.join(_data_dir, "jobs.db"))
+os.environ.setdefault("PERFORMANCE_DB", os.path.join(_data_dir, "performance.db"))
@@ -0,0 +1,11 @@
+"""
+Shared test fixtures
+"""
+import numpy as np
+
+
+def model_circuit(qm, seed=0):
+    """Encoding followed by the variational ansatz, with random angles, as served by the model"""
+    rng = np.random.default_rng(seed)
+    encoding = qm.create_encoding_circuit(rng.uniform(0, np.pi, qm.n_qubits))
+    return encoding.compose(qm.create_variational_circuit(rng.uniform(-1, 1, 2 * qm.n_qubits)))
@@ -0,0 +1,73 @@
+"""
+Tests for adaptive shot allocation
+"""
+import sys
+import os
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def test_estimate_meets_target_on_multi_term_observable():
+    """The estimate lands within its CI and noisy terms get most of the shots"""
+    from qiskit import QuantumCircuit
+    from qiskit.quantum_info import SparsePauliOp, Statevector
+    from src.circuits.quantum_manager import QuantumCircuitManager
+    from src.circuits.shots import AdaptiveShotEstimator
+
+    qc = QuantumCircuit(2)
+    qc.ry(np.pi / 2, 0)
+    observable = SparsePauliOp(["IZ", "ZI", "XI"], coeffs=[1.0, 0.5, 0.5])
+    exact = np.real(Statevector.from_instruction(qc).expectation_value(observable))
+
+    result = QuantumCircuitManager(n_qubits=2).estimate_expectation(
+        qc, observable, AdaptiveShotEstimator(target_error=0.02, seed=0))
+
+    assert result["converged"]
+    assert abs(result["value"] - exact) < 4 * result["std_error"]
+    # <IZ> = 0 has maximal variance; <ZI> = 1 is deterministic
+    assert result["shots_per_term"]["IZ"] > 10 * result["shots_per_term"]["ZI"]
+
+def test_adaptive_uses_fewer_shots_than_fixed_at_equal_accuracy():
+    """Per-circuit stopping beats a worst-case fixed shot count"""
+    from src.circuits.shots import AdaptiveShotEstimator
+
+    target = 0.05
+    expectations = np.random.default_rng(1).uniform(-1, 1, 2000)
+    estimator = AdaptiveShotEstimator(target_error=target, seed=2)
+    result = estimator.estimate_batch(expectations)
+
+    fixed_shots = int(np.ceil((estimator.z / target) ** 2)) * len(expectations)
+    assert estimator.total_shots < 0.8 * fixed_shots
+    coverage = np.mean(np.abs(result["value"] - expectations) <= target)
+    assert coverage > 0.9
+
+def test_zero_coefficients_cost_no_shots():
+    """An all-zero observable is 0 without sampling; zero terms never get shots"""
+    import warnings
+    from src.circuits.shots import AdaptiveShotEstimator
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        zero = AdaptiveShotEstimator(seed=0).estimate_batch(np.array([[0.3, -0.5]]), [0.0, 0.0])
+        assert zero["value"][0] == 0.0 and zero["shots"][0] == 0 and zero["converged"][0]
+
+        # No target: the whole budget goes to the non-zero term
+        mixed = AdaptiveShotEstimator(target_error=0.0, max_shots=1000, seed=0).estimate_batch(
+            np.array([[0.3, -0.5]]), [1.0, 0.0])
+        assert mixed["shots_per_term"][0].tolist() == [1000, 0]
+
+def test_trainer_counts_shots():
+    """Training on sampled estimates still reduces the loss and tallies shots"""
+    from src.circuits.shots import AdaptiveShotEstimator
+    from src.training.trainer import QuantumTrainer
+
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, np.pi, (30, 2))
+    y = (X[:, 0] > np.pi / 2).astype(int)
+    trainer = QuantumTrainer(n_qubits=2, epochs=3, batch_size=10, learning_rate=0.1, seed=0,
+                             shot_estimator=AdaptiveShotEstimator(target_error=0.1, seed=0))
+    history = trainer.fit(X, y)
+
+    assert trainer.total_shots > 0
+    assert history["loss"][-1] < history["loss"][0]
@@ -0,0 +1,100 @@
+"""
+Tests for the calibrated backend dispatcher
+"""
+import sys
+import os
+import json
+import tempfile
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def test_backends_agree_with_circuit_manager():
+    """Every backend computes QuantumCircuitManager's model"""
+    from src.circuits.dispatch import BackendDispatcher
+    from src.circuits.quantum_manager import QuantumCircuitManager
+
+    rng = np.random.default_rng(0)
+    inputs = rng.uniform(0, np.pi, (5, 3))
+    params = rng.uniform(0, 2 * np.pi, 6)
+    expected = QuantumCircuitManager(n_qubits=3).predict_batch(inputs, params)
+
+    dispatcher = BackendDispatcher(None)
+    for name in dispatcher.backends:
+        assert np.allclose(dispatcher.run(inputs, params.reshape(2, 3), backend=name), expected)
+
+def test_calibration_persists_and_drives_dispatch():
+    """The timing table round-trips through disk and picks the fastest backend"""
+    from src.circuits.dispatch import BackendDispatcher
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "calibration.json")
+        BackendDispatcher(path, backends=["native", "qiskit"]).calibrate(
+            n_qubits_grid=(2,), depth_grid=(1,), batch_grid=(1, 16), repeats=1)
+        with open(path) as f:
+            saved = json.load(f)
+        assert set(saved["timings"]) == {"q2_d1_b1", "q2_d1_b16"}
+        assert saved["backends"] == ["native", "qiskit"]
+
+        dispatcher = BackendDispatcher(path, backends=["native", "qiskit"])
+        dispatcher.table = {"q2_d1_b1": {"native": 2.0, "qiskit": 1.0},
+                            "q2_d1_b16": {"native": 1.0, "qiskit": 2.0}}
+        assert dispatcher.choose(2, 1, 1) == ("qiskit", "calibrated")
+        assert dispatcher.choose(2, 1, 64) == ("native", "nearest:q2_d1_b16")
+
+        dispatcher.run(np.zeros((64, 2)), np.zeros((1, 2)))
+        report = dispatcher.report()
+        assert report["usage"]["native"]["calls"] == 1
+        assert report["recent_decisions"][-1]["reason"] == "nearest:q2_d1_b16"
+
+def test_backends_endpoint():
+    """Dispatch state is exposed under /monitoring/backends"""
+    from fastapi.testclient import TestClient
+    from src.api.main import app
+
+    response = TestClient(app).get("/monitoring/backends")
+    assert response.status_code == 200
+    assert "native" in response.json()["backends"]
+
+def test_model_predictions_are_dispatched(monkeypatch):
+    """/predict runs default-template artifacts through the dispatcher"""
+    from fastapi.testclient import TestClient
+    from src.api.main import app
+    from src.circuits.dispatch import dispatcher
+    from src.circuits.quantum_manager import QuantumCircuitManager
+    from src.models.artifact import save_artifact
+    from src.models.model_manager import model_manager
+
+    params = np.random.default_rng(1).uniform(0, 2 * np.pi, 4)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = save_artifact(os.path.join(tmpdir, "dispatch-9.9.9.qmla"), params, n_qubits=2,
+                             name="dispatch", version="9.9.9")
+        monkeypatch.setattr(model_manager, "models_dir", type(model_manager.models_dir)(tmpdir))
+        model_manager.scan()
+        client = TestClient(app)
+        calls = sum(usage["calls"] for usage in client.get("/monitoring/backends").json()["usage"].values())
+
+        response = client.post("/predict", json={"features": [0.3, 0.7], "model_version": "9.9.9"})
+        report = client.get("/monitoring/backends").json()
+        os.remove(path)
+        model_manager.scan()
+
+    assert response.status_code == 200
+    assert sum(usage["calls"] for usage in report["usage"].values()) == calls + 1
+    assert report["recent_decisions"][-1]["batch_size"] == 1
+    expected = QuantumCircuitManager(n_qubits=2).predict_batch(np.array([[0.3, 0.7]]), params)
+    assert np.isclose(response.json()["prediction"][0], expected[0])
+
+def test_dispatched_predictions_size_rows_to_the_model():
+    """Wide rows are truncated and narrow rows padded, as on the statevector path"""
+    from src.models.artifact import save_artifact, load_artifact
+
+    params = np.random.default_rng(2).uniform(0, 2 * np.pi, 4)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        artifact = load_artifact(save_artifact(os.path.join(tmpdir, "m.qmla"), params, n_qubits=2))
+        assert artifact.dispatch_weights() is not None
+        qm = artifact.circuit_manager
+        for row in ([0.3, 0.7, 0.1], [0.3]):
+            states = qm.encode_batch(np.array([row]))
+            assert np.isclose(artifact.predict([row])[0], artifact.predict(None, states=states)[0])
@@ -0,0 +1,81 @@
+"""
+Tests for offline bulk scoring
+"""
+import sys
+import os
+import json
+import tempfile
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def _setup(tmpdir, n_rows=250):
+    from src.models.artifact import save_artifact, load_artifact
+
+    model_path = save_artifact(os.path.join(tmpdir, "model.qmla"), np.linspace(0.1, 1.2, 4),
+                               n_qubits=2, version="3.1.0")
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({"row_id": np.arange(n_rows),
+                          "a": rng.uniform(0, np.pi, n_rows), "b": rng.uniform(0, np.pi, n_rows)})
+    input_path = os.path.join(tmpdir, "input.parquet")
+    frame.to_parquet(input_path, index=False)
+    expected = load_artifact(model_path).predict(frame[["a", "b"]].to_numpy())
+    return str(model_path), input_path, expected
+
+def test_chunked_scoring_matches_artifact():
+    """Chunked multi-process scoring reproduces direct predictions in order"""
+    from src.inference.batch_scoring import main
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        model_path, input_path, expected = _setup(tmpdir)
+        output = os.path.join(tmpdir, "out")
+        stats = main(["--model", model_path, "--input", input_path, "--output", output,
+                      "--chunk-size", "40", "--workers", "2", "--id-column", "row_id",
+                      "--features", "a", "b"])
+
+        result = pd.read_parquet(output)
+        assert stats["chunks_scored"] == 7 and stats["rows_scored"] == 250
+        assert stats["last_completed_chunk"] == 6
+        assert list(result["row_id"]) == list(range(250))
+        assert np.allclose(result["prediction"], expected)
+        assert set(result["model_version"]) == {"3.1.0"}
+
+def test_resume_skips_completed_chunks():
+    """A rerun only scores chunks whose part file is missing"""
+    from src.inference.batch_scoring import BatchScorer
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        model_path, input_path, expected = _setup(tmpdir, n_rows=100)
+        output = os.path.join(tmpdir, "out")
+        scorer = BatchScorer(model_path, output, chunk_size=25, workers=1, id_column="row_id")
+        scorer.run(input_path)
+        os.remove(os.path.join(output, "part-000002.parquet"))
+
+        stats = BatchScorer(model_path, output, chunk_size=25, workers=1, id_column="row_id").run(input_path)
+
+        assert stats["chunks_skipped"] == 3 and stats["chunks_scored"] == 1
+        with open(os.path.join(output, "_progress.json")) as f:
+            assert json.load(f)["completed"] is True
+        assert np.allclose(pd.read_parquet(output).sort_values("row_id")["prediction"], expected)
+
+def test_resume_refuses_changed_config_and_drops_partial_parts():
+    """Parts from another chunking are never mixed in, and crash leftovers are removed"""
+    from src.inference.batch_scoring import BatchScorer, ResumeError
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        model_path, input_path, expected = _setup(tmpdir, n_rows=100)
+        output = os.path.join(tmpdir, "out")
+        BatchScorer(model_path, output, chunk_size=25, workers=1, id_column="row_id").run(input_path)
+
+        with pytest.raises(ResumeError, match="chunk_size"):
+            BatchScorer(model_path, output, chunk_size=50, workers=1, id_column="row_id").run(input_path)
+
+        os.remove(os.path.join(output, "part-000003.parquet"))
+        with open(os.path.join(output, "_part-000003.parquet.tmp"), "wb") as f:
+            f.write(b"truncated")
+        BatchScorer(model_path, output, chunk_size=25, workers=1, id_column="row_id").run(input_path)
+        assert not [name for name in os.listdir(output) if name.endswith(".tmp")]
+        assert np.allclose(pd.read_parquet(output).sort_values("row_id")["prediction"], expected)
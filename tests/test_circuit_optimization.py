@@ -0,0 +1,77 @@
+"""
+Tests for the circuit optimization pipeline
+"""
+import sys
+import os
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def _deep_ansatz(n_qubits, layers, seed=0):
+    from qiskit import QuantumCircuit
+    rng = np.random.default_rng(seed)
+    qc = QuantumCircuit(n_qubits)
+    for _ in range(layers):
+        for i in range(n_qubits):
+            qc.ry(rng.uniform(0, np.pi), i)
+            qc.rz(rng.uniform(0, np.pi), i)
+            qc.rz(0.0, i)
+        for i in range(n_qubits - 1):
+            qc.cx(i, i + 1)
+        qc.cx(n_qubits - 2, n_qubits - 1)
+        qc.cx(n_qubits - 2, n_qubits - 1)
+        qc.h(0)
+    return qc
+
+def test_fused_simulation_matches_qiskit():
+    """Fused simulation reproduces the reference statevector"""
+    from qiskit.quantum_info import Statevector
+    from src.circuits.optimization import CircuitOptimizer
+
+    qc = _deep_ansatz(4, 3)
+    expected = Statevector.from_instruction(qc)
+    result = CircuitOptimizer().simulate(qc)
+
+    assert np.allclose(result.data, expected.data)
+
+def test_passes_reduce_gate_count():
+    """Zero rotations are dropped, rotations merged and CX pairs cancelled"""
+    from qiskit import QuantumCircuit
+    from src.circuits.optimization import CircuitOptimizer
+
+    qc = QuantumCircuit(2)
+    qc.ry(0.1, 0)
+    qc.ry(0.2, 0)
+    qc.rx(0.0, 1)
+    qc.cx(0, 1)
+    qc.cx(0, 1)
+
+    simplified = CircuitOptimizer().simplify_circuit(qc)
+
+    assert len(simplified.data) == 1
+    assert simplified.data[0].operation.name == "ry"
+    assert np.isclose(float(simplified.data[0].operation.params[0]), 0.3)
+
+def test_report_and_plan_cache():
+    """Reports show a FLOP reduction and plans are reused per structure"""
+    from src.circuits.quantum_manager import QuantumCircuitManager
+
+    qm = QuantumCircuitManager(n_qubits=4)
+    report = qm.optimization_report(_deep_ansatz(4, 3, seed=1))
+    qm.optimization_report(_deep_ansatz(4, 3, seed=2))
+
+    assert report["fused_blocks"] < report["original_gates"]
+    assert report["optimized_flops"] < report["original_flops"]
+    assert qm.optimizer.cache_info()["hits"] >= 1
+
+def test_manager_expectation_unchanged():
+    """Optimized and unoptimized managers agree on expectation values"""
+    from src.circuits.quantum_manager import QuantumCircuitManager
+
+    params = np.linspace(0.1, 1.0, 6)
+    fast = QuantumCircuitManager(n_qubits=3)
+    slow = QuantumCircuitManager(n_qubits=3, optimize=False)
+    circuit = fast.create_variational_circuit(params)
+
+    assert np.isclose(fast.get_expectation_value(circuit), slow.get_expectation_value(circuit))
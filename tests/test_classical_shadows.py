@@ -0,0 +1,66 @@
+"""
+Tests for classical-shadow estimation
+"""
+import sys
+import os
+import itertools
+import tempfile
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def _state():
+    from qiskit import QuantumCircuit
+
+    qc = QuantumCircuit(3)
+    qc.ry(0.7, 0)
+    qc.rx(1.1, 1)
+    qc.cx(0, 1)
+    qc.h(2)
+    qc.cx(1, 2)
+    qc.rz(0.4, 2)
+    return qc
+
+def test_many_paulis_from_one_snapshot_set():
+    """All 1- and 2-local Paulis come from the same shadow within tolerance"""
+    from qiskit.quantum_info import Statevector, SparsePauliOp
+    from src.circuits.quantum_manager import QuantumCircuitManager
+
+    qc = _state()
+    state = Statevector.from_instruction(qc)
+    shadow = QuantumCircuitManager(n_qubits=3).classical_shadow(qc, n_snapshots=20000, seed=0)
+    assert shadow.nbytes == 2 * 20000 * 3
+
+    labels = ["".join(p) for p in itertools.product("IXYZ", repeat=3) if 0 < sum(c != "I" for c in p) <= 2]
+    estimates = shadow.estimate(labels)
+    exact = np.array([np.real(state.expectation_value(SparsePauliOp(label))) for label in labels])
+    assert len(labels) == 36
+    assert np.max(np.abs(estimates - exact)) < 0.15
+
+    observable = SparsePauliOp(["ZZI", "IXI"], coeffs=[0.5, 2.0])
+    assert abs(shadow.estimate(observable) - np.real(state.expectation_value(observable))) < 0.2
+
+def test_fidelity_and_persistence():
+    """Fidelity with the prepared state is ~1 and snapshots round-trip to disk"""
+    from qiskit.quantum_info import Statevector
+    from src.circuits.shadows import ClassicalShadow, sample_shadow
+
+    state = Statevector.from_instruction(_state())
+    shadow = sample_shadow(state, 5000, seed=1)
+    assert abs(shadow.estimate_fidelity(state) - 1.0) < 0.15
+    assert shadow.estimate_fidelity(np.eye(8)[7]) < 0.3
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "shadow.npz")
+        shadow.save(path)
+        loaded = ClassicalShadow.load(path)
+        assert np.array_equal(loaded.bases, shadow.bases) and loaded.outcomes.dtype == np.uint8
+
+def test_shadow_size_grows_logarithmically():
+    """A 100x increase in observables costs well under 3x the snapshots"""
+    from src.circuits.shadows import shadow_size
+
+    small, _ = shadow_size(10, locality=2, epsilon=0.1)
+    large, groups = shadow_size(1000, locality=2, epsilon=0.1)
+    assert large / small < 3 and groups > 1
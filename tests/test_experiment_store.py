@@ -0,0 +1,75 @@
+"""
+Tests for the embedded SQLite experiment store
+"""
+import sys
+import os
+import tempfile
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def test_bulk_series_and_downsampling():
+    """Bulk-inserted series come back whole or bucketed to max_points"""
+    from src.utils.experiment_store import ExperimentStore
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = ExperimentStore(os.path.join(tmpdir, "runs.db"), flush_every=100)
+        run_id = store.create_run("exp", "run")
+        losses = np.linspace(1.0, 0.0, 10000)
+        store.log_batch(run_id, "loss", losses)
+        for step in range(250):
+            store.log_metrics(run_id, {"acc": step / 250})
+
+        full = store.get_metric(run_id, "loss")
+        assert np.allclose(full["value"], losses) and full["step"][-1] == 9999
+
+        sampled = store.get_metric(run_id, "loss", max_points=100)
+        assert len(sampled["step"]) == 100
+        assert np.all(sampled["min"] <= sampled["value"]) and np.all(sampled["value"] <= sampled["max"])
+        assert sampled["max"][0] == 1.0 and sampled["min"][-1] == 0.0
+
+        assert store.metric_summary(run_id, "acc")["count"] == 250
+        store.close()
+
+def test_search_and_compare_runs_by_params():
+    """Runs are filtered by indexed params and ranked by a metric"""
+    from src.utils.experiment_store import ExperimentStore
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = ExperimentStore(os.path.join(tmpdir, "runs.db"))
+        ids = {}
+        for n_qubits, lr, final in [(2, 0.1, 0.4), (4, 0.1, 0.2), (4, 0.01, 0.3)]:
+            run_id = store.create_run("sweep", f"q{n_qubits}_lr{lr}")
+            store.log_params(run_id, {"n_qubits": n_qubits, "learning_rate": lr, "optimizer": "adam"})
+            store.log_batch(run_id, "loss", [1.0, final])
+            ids[(n_qubits, lr)] = run_id
+
+        runs = store.search_runs("sweep", params={"n_qubits": 4}, metric="loss")
+        assert [r["run_id"] for r in runs] == [ids[(4, 0.1)], ids[(4, 0.01)]]
+        assert runs[0]["score"] == 0.2
+
+        assert len(store.search_runs(params={"learning_rate": ("<", 0.05), "optimizer": "adam"})) == 1
+
+        comparison = store.compare_runs([ids[(2, 0.1)], ids[(4, 0.1)]])
+        assert comparison["differing_params"] == ["n_qubits"]
+        store.close()
+
+def test_mlops_manager_logs_to_store():
+    """QuantumMLOpsManager keeps its logging API on top of the store"""
+    from src.utils.quantum_mlops import QuantumMLOpsManager
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        mlops = QuantumMLOpsManager(tracking_uri=tmpdir, store_backend="sqlite",
+                                    store_path=os.path.join(tmpdir, "experiments.db"))
+        run_id = mlops.start_experiment(run_name="r", tags={"phase": "test"})
+        mlops.log_quantum_parameters({"n_qubits": 2}, {"learning_rate": 0.01}, {"shots": 1000})
+        mlops.log_quantum_metrics({"loss": 0.5}, step=0)
+        mlops.log_metric_series("batch_loss", [0.9, 0.8, 0.7])
+        mlops.end_experiment()
+
+        run = mlops.store.get_run(run_id)
+        assert run["status"] == "FINISHED" and run["tags"]["phase"] == "test"
+        assert run["params"]["circuit_n_qubits"] == "2"
+        assert run["metrics"]["training_loss"]["last"] == 0.5
+        assert run["metrics"]["training_batch_loss"]["count"] == 3
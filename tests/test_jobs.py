@@ -0,0 +1,172 @@
+"""
+Tests for the asynchronous job API
+"""
+import sys
+import os
+import json
+import tempfile
+import threading
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def _until(condition, timeout=5.0):
+    import time
+
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+def _gated_kind(monkeypatch, order):
+    """Register a job kind that records its start and runs until its gate opens"""
+    from src.api import jobs
+
+    gates = {}
+
+    def gated(payload, context):
+        order.append(payload["name"])
+        gate = gates.setdefault(payload["name"], threading.Event())
+        while not gate.wait(0.01):
+            context.check()
+        return {"name": payload["name"]}
+
+    monkeypatch.setitem(jobs.JOB_KINDS, "gated", gated)
+    return lambda name: gates.setdefault(name, threading.Event()).set()
+
+def test_priority_and_tenant_limits(monkeypatch):
+    """Higher priority runs first and a busy tenant does not block others"""
+    from src.api.jobs import JobManager
+
+    order = []
+    release = _gated_kind(monkeypatch, order)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = JobManager(os.path.join(tmpdir, "jobs.db"), workers=2, tenant_limit=1)
+        first = manager.submit("gated", {"name": "a1"}, tenant="a")
+        _until(lambda: order == ["a1"])
+        low = manager.submit("gated", {"name": "a-low"}, tenant="a", priority=0)
+        high = manager.submit("gated", {"name": "a-high"}, tenant="a", priority=5)
+        other = manager.submit("gated", {"name": "b1"}, tenant="b")
+        assert manager.get(high["job_id"])["queue_position"] == 0
+
+        release("b1")
+        assert manager.wait(other["job_id"], timeout=5)["status"] == "succeeded"
+        # Tenant "a" is at its limit, so the second worker ran tenant "b" ahead of a-high
+        assert order[:2] == ["a1", "b1"] and manager.get(low["job_id"])["status"] == "queued"
+
+        for name in ("a1", "a-high", "a-low"):
+            release(name)
+        assert manager.wait(low["job_id"], timeout=5)["status"] == "succeeded"
+        assert order == ["a1", "b1", "a-high", "a-low"]
+        assert manager.result(high["job_id"]) == {"name": "a-high"}
+        manager.stop()
+
+def test_cancel_queued_and_running_jobs(monkeypatch):
+    """Queued jobs cancel immediately, running jobs at their next check"""
+    from src.api.jobs import JobManager
+
+    order = []
+    _gated_kind(monkeypatch, order)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = JobManager(os.path.join(tmpdir, "jobs.db"), workers=1)
+        running = manager.submit("gated", {"name": "r"})
+        queued = manager.submit("gated", {"name": "q"})
+        _until(lambda: order == ["r"])
+
+        assert manager.cancel(queued["job_id"])["status"] == "cancelled"
+        manager.cancel(running["job_id"])
+        assert manager.wait(running["job_id"], timeout=5)["status"] == "cancelled"
+        assert order == ["r"]
+        manager.stop()
+
+def test_jobs_persist_and_recover():
+    """Results survive a restart and unfinished jobs are picked up again"""
+    from src.api.jobs import JobManager, QUEUED, RUNNING
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "jobs.db")
+        manager = JobManager(path, workers=1)
+        job = manager.submit("predict", {"features": [[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]], "chunk_size": 2})
+        assert manager.wait(job["job_id"])["progress"] == 1.0
+        manager.stop()
+
+        # A job left queued by a process that died before running it
+        manager._db().execute(
+            "INSERT INTO jobs (job_id, tenant, kind, priority, status, payload, submitted_at) "
+            "VALUES ('orphan', 'default', 'predict', 0, ?, ?, 0)", (QUEUED, json.dumps({"features": [[1.0, 2.0]]})))
+        # A job left running by a worker that stopped heartbeating
+        manager._db().execute(
+            "INSERT INTO jobs (job_id, tenant, kind, priority, status, payload, submitted_at, owner) "
+            "VALUES ('stale', 'other', 'predict', 0, ?, ?, 0, 'gone:1:0')", (RUNNING, json.dumps({"features": [[1.0]]})))
+
+        restarted = JobManager(path, workers=1)
+        assert restarted.result(job["job_id"])["count"] == 3
+        restarted.start()
+        assert restarted.wait("orphan")["status"] == "succeeded"
+        assert restarted.wait("stale")["status"] == "succeeded"
+        restarted.stop()
+
+def test_managers_share_one_database(monkeypatch):
+    """Managers in different processes claim each job once and share limits and cancels"""
+    from src.api.jobs import JobManager
+
+    order = []
+    release = _gated_kind(monkeypatch, order)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "jobs.db")
+        first = JobManager(path, workers=2, tenant_limit=1, poll_interval=0.05)
+        second = JobManager(path, workers=2, tenant_limit=1, poll_interval=0.05)
+        first.start()
+        second.start()
+        a1 = first.submit("gated", {"name": "a1"}, tenant="a")
+        a2 = second.submit("gated", {"name": "a2"}, tenant="a")
+        b1 = second.submit("gated", {"name": "b1"}, tenant="b")
+        _until(lambda: len(order) == 2)
+        # Four idle workers, but tenant "a" may only run one job across both managers
+        assert sorted(order) == ["a1", "b1"]
+
+        running_on = first.get(a1["job_id"])["owner"]
+        canceller = second if running_on == first.owner else first
+        canceller.cancel(a1["job_id"])
+        assert first.wait(a1["job_id"], timeout=5)["status"] == "cancelled"
+
+        release("a2")
+        release("b1")
+        assert second.wait(a2["job_id"], timeout=5)["status"] == "succeeded"
+        assert first.wait(b1["job_id"], timeout=5)["status"] == "succeeded"
+        assert sorted(order) == ["a1", "a2", "b1"]
+        first.stop()
+        second.stop()
+
+def test_jobs_api(monkeypatch):
+    """Submit, stream progress, fetch results and handle errors over HTTP"""
+    from fastapi.testclient import TestClient
+    from src.api import jobs
+    from src.api.main import app
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = jobs.JobManager(os.path.join(tmpdir, "jobs.db"), workers=1)
+        monkeypatch.setattr(jobs, "job_manager", manager)
+        client = TestClient(app)
+
+        X = np.random.default_rng(0).uniform(0, np.pi, (5, 2)).tolist()
+        response = client.post("/jobs", json={"kind": "kernel", "payload": {"X": X, "block_size": 2}},
+                               headers={"X-Tenant-ID": "research"})
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        events = [json.loads(line) for line in client.get(f"/jobs/{job_id}/events?interval=0.01").text.splitlines()]
+        assert events[-1]["status"] == "succeeded" and events[-1]["tenant"] == "research"
+        kernel = np.array(client.get(f"/jobs/{job_id}/result").json()["result"]["kernel"])
+        assert kernel.shape == (5, 5) and np.allclose(kernel, kernel.T) and np.allclose(np.diag(kernel), 1)
+
+        payload = {"features": [0.3, 0.6, 0.9], "parameters": [0.1] * 6, "observables": ["IIZ", "XZI", "ZZZ"]}
+        job_id = client.post("/jobs", json={"kind": "expectation", "payload": payload}).json()["job_id"]
+        manager.wait(job_id)
+        assert len(client.get(f"/jobs/{job_id}/result").json()["result"]["values"]) == 3
+        assert client.delete(f"/jobs/{job_id}").status_code == 409
+        assert [j["tenant"] for j in client.get("/jobs?tenant=research").json()["jobs"]] == ["research"]
+
+        assert client.post("/jobs", json={"kind": "nope", "payload": {}}).status_code == 400
+        assert client.get("/jobs/missing").status_code == 404
+        manager.stop()
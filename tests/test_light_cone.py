@@ -0,0 +1,56 @@
+"""
+Tests for light-cone pruning
+"""
+import sys
+import os
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def test_light_cone_of_model_is_constant_width():
+    """Z on qubit 0 of the layered ansatz only depends on three qubits"""
+    from src.circuits.quantum_manager import QuantumCircuitManager
+    from tests.helpers import model_circuit
+    from src.circuits.optimization import light_cone
+
+    qm = QuantumCircuitManager(n_qubits=10)
+    circuit = model_circuit(qm)
+    reduced, order = light_cone(circuit, [0])
+    assert order == [0, 1, 2] and reduced.num_qubits == 3
+    assert len(reduced.data) < len(circuit.data)
+
+    full = QuantumCircuitManager(n_qubits=10, prune=False)
+    assert np.isclose(qm.get_simple_expectation(circuit), full.get_simple_expectation(circuit))
+    value = qm.get_expectation_value(circuit)
+    assert abs(value) < 0.99 and np.isclose(value, full.get_expectation_value(circuit))
+    assert np.isclose(value, full.get_simple_expectation(circuit))
+
+def test_pruned_observables_match_full_simulation():
+    """Multi-term observables are restricted to the union of their light cones"""
+    from qiskit.quantum_info import Statevector, SparsePauliOp
+    from src.circuits.quantum_manager import QuantumCircuitManager
+    from tests.helpers import model_circuit
+    from src.circuits.optimization import light_cone
+
+    qm = QuantumCircuitManager(n_qubits=8)
+    circuit = model_circuit(qm, seed=3)
+    observable = SparsePauliOp(["IIIIIIXZ", "IIZIIIII"], coeffs=[0.7, -1.2])
+    exact = np.real(Statevector.from_instruction(circuit).expectation_value(observable))
+    assert np.isclose(qm.get_expectation_value(circuit, observable), exact)
+
+    # The last qubit's cone spans the register, so nothing is pruned
+    same, order = light_cone(circuit, [7])
+    assert same is circuit and order == list(range(8))
+
+def test_wide_model_expectation():
+    """A 40-qubit model output is computed on its light cone and agrees with cutting"""
+    from src.circuits.quantum_manager import QuantumCircuitManager
+    from tests.helpers import model_circuit
+    from src.circuits.cutting import CircuitCutter
+
+    qm = QuantumCircuitManager(n_qubits=40)
+    circuit = model_circuit(qm, seed=5)
+    value = qm.get_simple_expectation(circuit)
+    assert np.isclose(value, CircuitCutter(max_width=8).expectation(circuit))
+    assert qm.cut_expectation(circuit, return_report=True)[1]["n_qubits"] == 3
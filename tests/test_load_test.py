@@ -0,0 +1,70 @@
+"""
+Tests for the load generator script
+"""
+import sys
+import os
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def test_histogram_percentiles_within_precision():
+    """Percentiles match exact values to ~3 significant digits"""
+    from scripts.load_test import HdrHistogram
+
+    values = np.random.default_rng(0).lognormal(8, 1, 20000)
+    histogram = HdrHistogram()
+    for v in values:
+        histogram.record(v)
+
+    for p in (50, 99, 99.9):
+        exact = np.percentile(values.astype(int), p, method="inverted_cdf")
+        assert abs(histogram.percentile(p) - exact) / exact < 2e-3
+
+def test_coordinated_omission_correction_backfills():
+    """A stalled request back-fills the samples that were never sent"""
+    from scripts.load_test import HdrHistogram
+
+    histogram = HdrHistogram()
+    histogram.record_corrected(1000, expected_interval_us=100)
+
+    assert histogram.total == 10
+    assert histogram.percentile(50) < 1000
+
+def test_in_process_closed_loop_report():
+    """A short closed-loop run against the in-process app produces a report"""
+    from scripts.load_test import main, to_markdown
+
+    report = main(["--in-process", "--mode", "closed", "--concurrency", "2", "--rate", "0",
+                   "--endpoint", "batch", "--batch-size", "10", "--duration", "0.3",
+                   "--warmup", "0"])
+
+    assert report["requests"] > 0
+    assert report["errors"] == {}
+    assert report["latency_ms"]["p99"] >= report["latency_ms"]["p50"] > 0
+    assert report["throughput_rows_per_s"] > 0
+    assert report["config"]["omission_corrected"] is False
+    assert "not corrected for coordinated omission" in to_markdown(report)
+
+def test_in_process_run_serves_loaded_models(monkeypatch):
+    """--in-process runs the app's startup, so requests reach the artifacts on disk"""
+    import tempfile
+    from scripts.load_test import main
+    from src.circuits.dispatch import dispatcher
+    from src.models.artifact import save_artifact
+    from src.models.model_manager import model_manager
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = save_artifact(os.path.join(tmpdir, "load-1.0.0.qmla"), np.linspace(0.1, 0.8, 8),
+                             n_qubits=4, name="load", version="1.0.0")
+        monkeypatch.setattr(model_manager, "models_dir", type(model_manager.models_dir)(tmpdir))
+        calls = sum(usage["calls"] for usage in dispatcher.report(0)["usage"].values())
+
+        report = main(["--in-process", "--mode", "closed", "--concurrency", "1", "--rate", "0",
+                       "--duration", "0.2", "--warmup", "0"])
+        os.remove(path)
+        model_manager.scan()
+
+    assert report["requests"] > 0 and report["errors"] == {}
+    # Startup warm-up and every request ran the model through the dispatcher
+    assert sum(usage["calls"] for usage in dispatcher.report(0)["usage"].values()) >= calls + report["requests"]
@@ -0,0 +1,69 @@
+"""
+Tests for the Prometheus metrics collector
+"""
+import sys
+import os
+import subprocess
+import tempfile
+import threading
+
+# Add src to path
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT)
+
+def _sample(name, labels):
+    from prometheus_client import REGISTRY
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+def test_buffered_mode_flushes_all_threads():
+    """Per-thread buffers lose no increments across concurrent writers"""
+    from src.monitoring.metrics import MetricsCollector
+
+    collector = MetricsCollector(mode="buffered", flush_interval=0.01)
+    labels = {"model_version": "buffered-test", "status": "success"}
+    before = _sample("model_predictions_total", labels)
+
+    def work():
+        for _ in range(1000):
+            collector.record_prediction("buffered-test")
+            collector.record_latency(0.001)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    collector.stop_flusher()
+
+    assert _sample("model_predictions_total", labels) - before == 4000
+    # Buffers of finished threads are dropped once flushed
+    assert collector._buffers == [] and collector._flushed == {}
+
+def test_label_children_are_cached():
+    """Repeated calls reuse the same labelled child"""
+    from src.monitoring.metrics import MetricsCollector, PREDICTION_COUNTER
+
+    collector = MetricsCollector()
+    collector.record_prediction("cached-test")
+    collector.record_prediction("cached-test")
+
+    assert len([k for k in collector._children if k[1] == ("cached-test", "success")]) == 1
+    assert collector._child(PREDICTION_COUNTER, "cached-test", "success") is \
+        collector._child(PREDICTION_COUNTER, "cached-test", "success")
+
+def test_multiprocess_totals_are_aggregated():
+    """A scrape from one process reports predictions recorded by all workers"""
+    record = ("from src.monitoring.metrics import metrics_collector\n"
+              "for _ in range(5): metrics_collector.record_prediction('mp-test')\n")
+    scrape = ("from src.monitoring.metrics import metrics_collector\n"
+              "print(metrics_collector.get_metrics().decode())\n")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": tmpdir}
+        for _ in range(3):
+            subprocess.run([sys.executable, "-c", record], cwd=ROOT, env=env, check=True)
+        output = subprocess.run([sys.executable, "-c", scrape], cwd=ROOT, env=env, check=True,
+                                capture_output=True, text=True).stdout
+
+    line = next(l for l in output.splitlines()
+                if l.startswith("model_predictions_total") and 'model_version="mp-test"' in l)
+    assert float(line.split()[-1]) == 15.0
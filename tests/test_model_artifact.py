@@ -0,0 +1,58 @@
+"""
+Tests for the binary model artifact format
+"""
+import sys
+import os
+import tempfile
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def test_round_trip_memmap():
+    """Parameters round-trip through a memory map with header metadata"""
+    from src.models.artifact import save_artifact, load_artifact
+
+    params = np.linspace(0, 1, 8)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = save_artifact(os.path.join(tmpdir, "model.qmla"), params, n_qubits=4,
+                             version="2.0.0", metadata={"owner": "tests"}, dtype=np.float32)
+        artifact = load_artifact(path)
+
+        assert isinstance(artifact.parameters, np.memmap)
+        assert artifact.parameters.dtype == np.float32
+        assert np.allclose(artifact.parameters, params)
+        assert artifact.version == "2.0.0"
+        assert artifact.metadata == {"owner": "tests"}
+        assert artifact.observables[0]["pauli"] == "IIIZ"
+        assert artifact.header["data_offset"] % 64 == 0
+        del artifact
+
+def test_checksum_validation():
+    """Corrupted parameter bytes are rejected"""
+    from src.models.artifact import ArtifactError, save_artifact, load_artifact, read_header
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = save_artifact(os.path.join(tmpdir, "model.qmla"), np.ones(4), n_qubits=2)
+        offset = read_header(path)["data_offset"]
+        with open(path, "r+b") as f:
+            f.seek(offset)
+            f.write(b"\xff")
+
+        with pytest.raises(ArtifactError):
+            load_artifact(path)
+
+def test_artifact_predictions_match_trainer():
+    """A loaded artifact predicts the same outputs as the trainer that exported it"""
+    from src.training.trainer import QuantumTrainer
+    from src.models.artifact import load_artifact
+
+    trainer = QuantumTrainer(n_qubits=2, seed=0)
+    X = np.random.default_rng(0).uniform(0, np.pi, size=(5, 2))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = trainer.export(os.path.join(tmpdir, "model.qmla"))
+        artifact = load_artifact(path)
+
+        assert np.allclose(artifact.predict(X), trainer.predict(X))
+        del artifact
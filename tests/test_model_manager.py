@@ -0,0 +1,135 @@
+"""
+Tests for the model registry, hot-reload and versioned routing
+"""
+import sys
+import os
+import json
+import tempfile
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def _write(tmpdir, version, seed=0, name="quantum_model"):
+    from src.models.artifact import save_artifact
+    params = np.random.default_rng(seed).uniform(0, np.pi, 4)
+    return save_artifact(os.path.join(tmpdir, f"{name}-{version}.qmla"), params, n_qubits=2,
+                         name=name, version=version)
+
+def test_scan_loads_and_removes_versions():
+    """Scanning picks up new artifacts and drops deleted ones"""
+    from src.models.model_manager import ModelManager
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = ModelManager(models_dir=tmpdir)
+        _write(tmpdir, "1.0.0")
+        assert manager.scan() == ["1.0.0"]
+
+        path = _write(tmpdir, "1.1.0", seed=1)
+        manager.scan()
+        assert manager.versions == ["1.0.0", "1.1.0"]
+        assert manager.current_model == "1.1.0"
+
+        os.remove(path)
+        manager.scan()
+        assert manager.versions == ["1.0.0"]
+        assert manager.current_model == "1.0.0"
+
+def test_pinned_version_and_swap_keeps_inflight_reference():
+    """Pinned requests hit their version; an old reference survives a swap"""
+    from src.models.model_manager import ModelManager
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = ModelManager(models_dir=tmpdir)
+        _write(tmpdir, "1.0.0")
+        manager.scan()
+        version, inflight = manager.resolve("latest")
+
+        _write(tmpdir, "2.0.0", seed=3)
+        manager.scan()
+
+        assert manager.resolve("1.0.0")[0] == "1.0.0"
+        assert manager.resolve()[0] == "2.0.0"
+        assert version == "1.0.0"
+        assert inflight.predict(np.zeros((1, 2))).shape == (1,)
+        with pytest.raises(KeyError):
+            manager.resolve("9.9.9")
+
+def test_traffic_weights_from_registry_file():
+    """Canary weights in registry.json split unpinned traffic"""
+    from src.models.model_manager import ModelManager
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write(tmpdir, "1.0.0")
+        _write(tmpdir, "1.1.0", seed=1)
+        with open(os.path.join(tmpdir, "registry.json"), "w") as f:
+            json.dump({"default": "1.0.0", "traffic": {"1.0.0": 0.8, "1.1.0": 0.2}}, f)
+        manager = ModelManager(models_dir=tmpdir, seed=0)
+        manager.scan()
+
+        picks = [manager.resolve()[0] for _ in range(2000)]
+        share = picks.count("1.1.0") / len(picks)
+        assert manager.current_model == "1.0.0"
+        assert 0.15 < share < 0.25
+
+        manager.set_traffic({"1.1.0": 1.0})
+        assert {manager.resolve()[0] for _ in range(50)} == {"1.1.0"}
+
+def test_models_with_same_version_are_kept_apart():
+    """Two model names sharing a version number do not replace each other"""
+    from src.models.model_manager import ModelManager
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = ModelManager(models_dir=tmpdir)
+        _write(tmpdir, "1.0.0", name="fraud")
+        path = _write(tmpdir, "1.0.0", seed=1, name="churn")
+        manager.scan()
+        assert set(manager.models) == {("fraud", "1.0.0"), ("churn", "1.0.0")}
+        assert manager.versions == ["churn:1.0.0", "fraud:1.0.0"]
+        assert manager.find("churn").name == "churn"
+        with pytest.raises(KeyError):
+            manager.resolve("1.0.0")
+        assert manager.resolve("fraud:1.0.0")[1].name == "fraud"
+
+        os.remove(path)
+        manager.scan()
+        assert set(manager.models) == {("fraud", "1.0.0")}
+        assert manager.resolve("1.0.0")[1].name == "fraud"
+
+def test_concurrent_scans_load_each_artifact_once():
+    """The watcher and /models/reload scanning together do not double-load"""
+    import threading
+    from src.models.model_manager import ModelManager
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = ModelManager(models_dir=tmpdir)
+        _write(tmpdir, "1.0.0")
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(manager.scan())) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(results) == [[], [], [], ["1.0.0"]]
+
+def test_predict_endpoint_routes_by_version(monkeypatch):
+    """/predict honours model_version and /models lists loaded versions"""
+    from fastapi.testclient import TestClient
+    from src.api.main import app
+    from src.models.model_manager import model_manager
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write(tmpdir, "1.0.0")
+        monkeypatch.setattr(model_manager, "models_dir", type(model_manager.models_dir)(tmpdir))
+        model_manager.scan()
+        client = TestClient(app)
+
+        response = client.post("/predict", json={"features": [0.1, 0.2], "model_version": "1.0.0"})
+        assert response.status_code == 200
+        assert response.json()["model_version"] == "1.0.0"
+        assert client.post("/predict", json={"features": [0.1], "model_version": "0.0.1"}).status_code == 404
+        assert client.get("/models").json()["models"] == ["1.0.0"]
+
+        os.remove(os.path.join(tmpdir, "quantum_model-1.0.0.qmla"))
+        model_manager.scan()
@@ -0,0 +1,173 @@
+"""
+Tests for online performance aggregation from labelled feedback
+"""
+import sys
+import os
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def test_windowed_metrics_match_batch_computation():
+    """Incremental window metrics equal a direct computation over the same labels"""
+    from src.monitoring.performance import PerformanceTracker
+
+    clock = Clock(1200.0)
+    tracker = PerformanceTracker(":memory:", tumbling=(60,), sliding=(300,), clock=clock)
+    rng = np.random.default_rng(0)
+    scores = rng.uniform(-1, 1, 200)
+    labels = (rng.uniform(size=200) < (1 + scores) / 2).astype(int)
+    latencies = rng.uniform(0.001, 0.05, 200)
+    for i in range(200):
+        tracker.record_prediction(f"r{i}", "v1", scores[i], latencies[i])
+    assert tracker.record_feedback((f"r{i}", labels[i]) for i in range(200)) == {"matched": 200, "unmatched": 0}
+
+    predicted = (scores > 0).astype(int)
+    tp = np.sum((predicted == 1) & (labels == 1))
+    precision, recall = tp / predicted.sum(), tp / labels.sum()
+    metrics = tracker.report()["models"]["v1"]["sliding_300s"]
+    assert metrics["labeled"] == 200 and metrics["predictions"] == 200
+    assert np.isclose(metrics["accuracy"], np.mean(predicted == labels))
+    assert np.isclose(metrics["precision"], precision) and np.isclose(metrics["recall"], recall)
+    assert np.isclose(metrics["f1_score"], 2 * precision * recall / (precision + recall))
+    assert np.isclose(metrics["brier_score"], np.mean(((1 + scores) / 2 - labels) ** 2))
+    assert 0 <= metrics["calibration_error"] < 0.2
+    # Histogram percentiles are within one bucket (~26%) of the exact values
+    assert abs(metrics["latency_p50"] / np.percentile(latencies, 50) - 1) < 0.3
+
+def test_tumbling_and_sliding_windows_roll_over():
+    """Completed tumbling windows are frozen and sliding windows forget old data"""
+    from src.monitoring.performance import PerformanceTracker
+
+    clock = Clock(1200.0)
+    tracker = PerformanceTracker(":memory:", tumbling=(60,), sliding=(300,), slide_buckets=5, clock=clock)
+    tracker.record_prediction("a", "v1", 0.9, 0.01)
+    tracker.record_feedback([("a", 1)])
+
+    clock.now = 1265.0
+    tracker.record_prediction("b", "v1", 0.9, 0.01)
+    tracker.record_feedback([("b", 0)])
+    windows = tracker.report()["models"]["v1"]
+    assert windows["tumbling_60s"]["last_complete"]["accuracy"] == 1.0
+    assert windows["tumbling_60s"]["current"]["accuracy"] == 0.0
+    assert windows["sliding_300s"]["accuracy"] == 0.5
+
+    clock.now = 1530.0
+    windows = tracker.report()["models"]["v1"]
+    assert windows["sliding_300s"]["accuracy"] == 0.0 and windows["sliding_300s"]["labeled"] == 1
+    assert windows["tumbling_60s"]["last_complete"]["labeled"] == 0
+    assert ("v1", "sliding_300s", "accuracy", 0.0) in set(tracker.gauge_values())
+
+def test_prediction_index_is_bounded():
+    """Predictions past their TTL or beyond capacity no longer match feedback"""
+    from src.monitoring.performance import PerformanceTracker
+
+    clock = Clock()
+    tracker = PerformanceTracker(":memory:", max_entries=3, ttl=100, clock=clock)
+    for i in range(5):
+        tracker.record_prediction(f"r{i}", "v1", 0.5)
+    clock.now += 50
+    tracker.record_prediction("late", "v1", 0.5)
+    clock.now += 60
+
+    result = tracker.record_feedback([("r0", 1), ("r4", 1), ("late", 1), ("unknown", 0)])
+    assert result == {"matched": 1, "unmatched": 3}
+    assert tracker.report()["index"] == {"size": 0, "evicted": {"ttl": 2, "capacity": 3}}
+
+def test_workers_share_one_store():
+    """Feedback received by one worker matches a prediction served by another"""
+    import tempfile
+    from src.monitoring.performance import PerformanceTracker
+
+    clock = Clock()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "performance.db")
+        serving, receiving = PerformanceTracker(path, clock=clock), PerformanceTracker(path, clock=clock)
+        serving.record_prediction("r1", "v1", 0.8, 0.01)
+        serving.record_prediction("r2", "v1", -0.8, 0.01)
+        # Buffered until flushed, by the background thread or explicitly
+        assert receiving.record_feedback([("r1", 1)]) == {"matched": 0, "unmatched": 1}
+        serving.flush()
+
+        assert receiving.record_feedback([("r1", 1), ("r2", 1)]) == {"matched": 2, "unmatched": 0}
+        assert serving.record_feedback([("r1", 1)]) == {"matched": 0, "unmatched": 1}
+        for tracker in (serving, receiving):
+            sliding = tracker.report()["models"]["v1"]["sliding_300s"]
+            assert sliding["labeled"] == 2 and sliding["accuracy"] == 0.5
+            assert tracker.report()["feedback"] == {"matched": 2, "unmatched": 2}
+
+def test_predictions_are_flushed_in_the_background():
+    """The request path only buffers; the flusher thread writes to the store"""
+    import tempfile
+    import time
+    from src.monitoring.performance import PerformanceTracker
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "performance.db")
+        serving = PerformanceTracker(path, flush_interval=0.05)
+        receiving = PerformanceTracker(path)
+        serving.record_prediction("r1", "v1", 0.8, 0.01)
+        assert serving._flusher.is_alive()
+
+        deadline = time.time() + 5
+        while receiving.report()["index"]["size"] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        assert receiving.record_feedback([("r1", 1)]) == {"matched": 1, "unmatched": 0}
+        serving.stop_flusher()
+
+def test_performance_gauges_follow_the_store():
+    """Gauges are read from the store at collection time and retired label sets disappear"""
+    from prometheus_client import CollectorRegistry, generate_latest
+    from src.monitoring.metrics import PerformanceCollector
+    from src.monitoring.performance import PerformanceTracker
+
+    clock = Clock(1200.0)
+    tracker = PerformanceTracker(":memory:", tumbling=(60,), sliding=(300,), clock=clock)
+    collector = PerformanceCollector()
+    collector.source = tracker.gauge_values
+    registry = CollectorRegistry()
+    registry.register(collector)
+
+    tracker.record_prediction("a", "old", 0.9)
+    tracker.record_feedback([("a", 1)])
+    assert 'model_version="old",window="sliding_300s"' in generate_latest(registry).decode()
+
+    clock.now = 1800.0
+    tracker.record_prediction("b", "new", 0.9)
+    metrics = generate_latest(registry).decode()
+    assert 'model_version="old"' not in metrics
+    assert 'metric="predictions",model_version="new",window="sliding_300s"} 1.0' in metrics
+
+def test_feedback_endpoint_updates_performance(monkeypatch):
+    """Labels posted for served predictions show up in the report and Prometheus gauges"""
+    from fastapi.testclient import TestClient
+    from src.api.main import app
+    from src.monitoring.monitor import monitor
+    from src.monitoring.performance import PerformanceTracker
+
+    monkeypatch.setattr(monitor, "performance", PerformanceTracker(":memory:"))
+    client = TestClient(app)
+    served = [client.post("/predict", json={"features": features, "request_id": f"req-{i}"}).json()
+              for i, features in enumerate([[0.5, 0.7], [-0.4, -0.8], [0.2, 0.1]])]
+    assert [s["request_id"] for s in served] == ["req-0", "req-1", "req-2"]
+    version = served[0]["model_version"]
+
+    response = client.post("/monitoring/feedback", json={"feedback": [
+        {"request_id": "req-0", "label": 1}, {"request_id": "req-1", "label": 0},
+        {"request_id": "req-2", "label": 0}, {"request_id": "missing", "label": 1}]})
+    assert response.json() == {"matched": 3, "unmatched": 1}
+
+    report = client.get("/monitoring/performance").json()
+    sliding = report["models"][version]["sliding_300s"]
+    assert sliding["labeled"] == 3 and np.isclose(sliding["accuracy"], 2 / 3)
+    assert sliding["latency_p50"] is not None
+
+    metrics = client.get("/monitoring/metrics").text
+    assert f'model_performance{{metric="accuracy",model_version="{version}",window="sliding_300s"}}' in metrics
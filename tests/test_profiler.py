@@ -0,0 +1,52 @@
+"""
+Tests for the sampling profiler
+"""
+import sys
+import os
+import threading
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def _busy_loop(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+def test_profiler_captures_busy_thread():
+    """A spinning worker thread dominates the collapsed stacks"""
+    from src.monitoring.profiler import SamplingProfiler
+
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_loop, args=(stop,), name="sim-worker_3")
+    worker.start()
+    try:
+        sampler = SamplingProfiler()
+        report = sampler.profile(0.3, rate=200)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert report["samples"] > 10
+    assert "[sim-worker];" in report["collapsed"]
+    assert any("_busy_loop" in f["function"] and f["total_percent"] > 0 for f in report["top_functions"])
+    line = report["collapsed"].splitlines()[0]
+    assert int(line.rsplit(" ", 1)[1]) > 0
+
+def test_profile_endpoint_and_busy_guard():
+    """The monitoring endpoint profiles for N seconds and rejects overlapping sessions"""
+    from fastapi.testclient import TestClient
+    from src.api.main import app
+    from src.monitoring.profiler import profiler
+
+    client = TestClient(app)
+    assert client.post("/monitoring/profile/start?rate=50").status_code == 200
+    assert client.get("/monitoring/profile?seconds=0.1").status_code == 409
+    time.sleep(0.1)
+    stopped = client.post("/monitoring/profile/stop").json()
+    assert stopped["running"] is False and stopped["samples"] > 0
+
+    collapsed = client.get("/monitoring/profile?seconds=0.1&format=collapsed")
+    assert collapsed.status_code == 200
+    assert collapsed.headers["content-type"].startswith("text/plain")
+    assert not profiler.running
@@ -0,0 +1,60 @@
+"""
+Tests for the quantum kernel engine
+"""
+import sys
+import os
+import tempfile
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def test_encode_batch_matches_circuit():
+    """Batched encoding reproduces create_encoding_circuit statevectors"""
+    from src.circuits.quantum_manager import QuantumCircuitManager
+
+    qm = QuantumCircuitManager(n_qubits=3)
+    X = np.random.default_rng(0).uniform(0, np.pi, size=(4, 3))
+    states = qm.encode_batch(X)
+
+    for row, features in zip(states, X):
+        expected = qm.compute_statevector(qm.create_encoding_circuit(features))
+        assert np.allclose(row, expected.data)
+
+def test_gram_matrix_blocked_and_symmetric():
+    """Blocked Gram matrix equals pairwise fidelities"""
+    from src.circuits.kernels import QuantumKernel
+
+    X = np.random.default_rng(1).uniform(0, np.pi, size=(7, 2))
+    kernel = QuantumKernel(n_qubits=2, block_size=3)
+    K = kernel.evaluate(X)
+    states = kernel.encode(X)
+    expected = np.abs(states.conj() @ states.T) ** 2
+
+    assert np.allclose(K, expected)
+    assert np.allclose(np.diag(K), 1.0)
+
+def test_memmap_and_parallel_output():
+    """Parallel tiles streamed to a memmap match the serial result"""
+    from src.circuits.kernels import QuantumKernel
+
+    rng = np.random.default_rng(2)
+    X, Y = rng.uniform(0, np.pi, size=(9, 2)), rng.uniform(0, np.pi, size=(5, 2))
+    serial = QuantumKernel(n_qubits=2, block_size=4).evaluate(X, Y)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "kernel.dat")
+        parallel = QuantumKernel(n_qubits=2, block_size=4, n_jobs=2).evaluate(X, Y, out_path=path)
+        assert isinstance(parallel, np.memmap)
+        assert np.allclose(parallel, serial)
+
+def test_sklearn_callable():
+    """Kernel can be passed directly to scikit-learn's SVC"""
+    from sklearn.svm import SVC
+    from src.circuits.kernels import QuantumKernel
+
+    X = np.array([[0.1, 0.1], [0.2, 0.0], [2.9, 3.0], [3.0, 2.8]])
+    y = np.array([0, 0, 1, 1])
+    model = SVC(kernel=QuantumKernel(n_qubits=2)).fit(X, y)
+
+    assert list(model.predict(X)) == [0, 0, 1, 1]
@@ -0,0 +1,69 @@
+"""
+Tests for prediction payload wire formats
+"""
+import sys
+import os
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def test_numpy_body_is_zero_copy():
+    """Raw float32 bodies decode without copying the buffer"""
+    from src.api.serialization import decode_batch
+
+    data = np.arange(12, dtype="<f4").reshape(3, 4)
+    body = data.tobytes()
+    features, version = decode_batch(body, "application/x-numpy; dtype=float32; shape=3,4",
+                                     {"x-model-version": "1.0.0"})
+
+    assert np.array_equal(features, data)
+    assert np.shares_memory(features, np.frombuffer(body, dtype="<f4"))
+    assert version == "1.0.0"
+
+def test_json_and_msgpack_bodies():
+    """JSON and msgpack payloads decode to the same batch"""
+    import msgpack
+    from src.api.serialization import decode_batch
+
+    payload = {"features": [[0.1, 0.2], [0.3, 0.4]], "model_version": "latest"}
+    from_json, _ = decode_batch(b'{"features": [[0.1, 0.2], [0.3, 0.4]]}', "application/json")
+    from_msgpack, version = decode_batch(msgpack.packb(payload), "application/msgpack")
+
+    assert np.allclose(from_json, from_msgpack)
+    assert version == "latest"
+
+def test_negotiate_accept_header():
+    """Accept headers select the first supported media type"""
+    from src.api.serialization import negotiate, JSON, MSGPACK, NUMPY
+
+    assert negotiate(None) == JSON
+    assert negotiate("application/x-numpy, application/json") == NUMPY
+    assert negotiate("text/html, application/x-msgpack") == MSGPACK
+    assert negotiate("*/*") == JSON
+
+def test_batch_endpoint_formats():
+    """/predict/batch answers JSON, msgpack and raw numpy clients"""
+    import msgpack
+    from fastapi.testclient import TestClient
+    from src.api.main import app
+
+    client = TestClient(app)
+    rows = np.array([[0.1, 0.3], [0.5, 0.7]])
+
+    as_json = client.post("/predict/batch", json={"features": rows.tolist()})
+    assert as_json.status_code == 200
+    expected = as_json.json()["predictions"]
+    assert as_json.json()["count"] == 2
+
+    as_numpy = client.post("/predict/batch", content=rows.astype("<f8").tobytes(),
+                           headers={"Content-Type": "application/x-numpy; columns=2",
+                                    "Accept": "application/x-numpy"})
+    assert np.allclose(np.frombuffer(as_numpy.content, dtype="<f8"), expected)
+
+    as_msgpack = client.post("/predict/batch", content=msgpack.packb({"features": rows.tolist()}),
+                             headers={"Content-Type": "application/msgpack", "Accept": "application/msgpack"})
+    assert np.allclose(msgpack.unpackb(as_msgpack.content)["predictions"], expected)
+
+    assert client.post("/predict/batch", content=b"x", headers={"Content-Type": "text/plain"}).status_code == 415
+    assert client.post("/predict", json={"features": [0.1, 0.2]}).status_code == 200
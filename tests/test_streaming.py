@@ -0,0 +1,84 @@
+"""
+Tests for the streaming prediction endpoints
+"""
+import sys
+import os
+import json
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def test_ndjson_stream_preserves_order():
+    """NDJSON rows come back in input order, including invalid rows"""
+    from fastapi.testclient import TestClient
+    from src.api.main import app
+
+    client = TestClient(app)
+    lines = [json.dumps({"id": f"r{i}", "features": [i * 0.1, 0.2]}) for i in range(50)]
+    lines.insert(10, "not json")
+    response = client.post("/stream/predict?max_batch_size=8",
+                           content="\n".join(lines).encode(),
+                           headers={"Content-Type": "application/x-ndjson"})
+
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert response.status_code == 200
+    assert len(results) == 51
+    assert "error" in results[10]
+    ids = [r["id"] for r in results if "error" not in r]
+    assert ids == [f"r{i}" for i in range(50)]
+
+def test_websocket_stream_with_window_and_binary_frames():
+    """WebSocket clients get a window, ordered results and credit"""
+    from fastapi.testclient import TestClient
+    from src.api.main import app
+
+    client = TestClient(app)
+    with client.websocket_connect("/stream/ws?columns=2&window=64") as ws:
+        hello = ws.receive_json()
+        assert hello["type"] == "window" and hello["rows"] == 64
+
+        ws.send_text('{"id": "a", "features": [0.1, 0.2]}\n[0.3, 0.4]')
+        rows = np.array([[0.5, 0.6], [0.7, 0.8]], dtype="<f8")
+        ws.send_bytes(rows.tobytes())
+
+        received = []
+        while len(received) < 4:
+            message = ws.receive_json()
+            assert message["type"] == "result"
+            assert message["credit"] == len(message["results"])
+            received.extend(message["results"])
+
+    assert [r["id"] for r in received] == ["a", 1, 2, 3]
+    assert np.isclose(received[3]["prediction"], 0.75)
+
+def test_stream_stats_exposed():
+    """Closed streams show up in the metrics collector"""
+    from fastapi.testclient import TestClient
+    from src.api.main import app
+    from src.monitoring.metrics import metrics_collector
+
+    client = TestClient(app)
+    client.post("/stream/predict", content=b"[1.0]\n[2.0]\n")
+    stats = client.get("/monitoring/streams").json()
+
+    assert stats["recent"][-1]["rows_out"] == 2
+    assert metrics_collector.get_stream_stats()["recent"][-1]["transport"] == "ndjson"
+
+def test_window_caps_micro_batches():
+    """A client window smaller than the batch size bounds both the queue and the batches"""
+    import asyncio
+    from src.api.streaming import PredictionStream
+
+    stream = PredictionStream("ndjson", max_batch_size=256, window=8)
+    assert stream.window == 8 and stream.max_batch_size == 8
+
+    async def source():
+        for i in range(20):
+            yield i, np.array([0.1, 0.2]), None
+
+    async def collect():
+        return [len(batch) async for batch in stream.run(source())]
+
+    sizes = asyncio.run(collect())
+    assert sum(sizes) == 20 and max(sizes) <= 8
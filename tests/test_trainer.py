@@ -0,0 +1,91 @@
+"""
+Tests for the mini-batch quantum trainer
+"""
+import sys
+import os
+import tempfile
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def _dataset(n=40, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(0, np.pi, size=(n, 2))
+    y = (X[:, 0] > np.pi / 2).astype(int)
+    return X, y
+
+def test_parameter_shift_gradient_matches_finite_difference():
+    """Batched parameter-shift gradient equals a numerical gradient"""
+    from src.training.trainer import QuantumTrainer
+
+    trainer = QuantumTrainer(n_qubits=2, seed=0)
+    X, y = _dataset(8)
+    states = trainer.circuit_manager.encode_batch(X)
+    targets = trainer._targets(y)
+    params = trainer.parameters
+
+    grad = trainer._gradient(states, targets, params)
+    eps = 1e-6
+    numeric = np.array([
+        (trainer._losses(states, targets, params + eps * e)[0]
+         - trainer._losses(states, targets, params - eps * e)[0]) / (2 * eps)
+        for e in np.eye(len(params))
+    ])
+    assert np.allclose(grad, numeric, atol=1e-5)
+
+def test_logged_batch_loss_reuses_the_optimizer_evaluation():
+    """Each step runs the model once: the logged loss comes from the gradient's own forward pass"""
+    from src.training.trainer import QuantumTrainer
+
+    X, y = _dataset(16)
+    trainer = QuantumTrainer(n_qubits=2, epochs=1, batch_size=16, seed=0)
+    initial = trainer.evaluate(X, y)["loss"]
+    calls = []
+    forward = trainer._forward
+    trainer._forward = lambda states, param_sets: calls.append(1) or forward(states, param_sets)
+    history = trainer.fit(X, y)
+
+    assert len(calls) == 1
+    assert np.isclose(history["loss"][0], initial)
+
+def test_adam_training_reduces_loss_and_checkpoints():
+    """Adam training lowers the loss and writes checkpoints"""
+    from src.training.trainer import QuantumTrainer
+
+    X, y = _dataset()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        trainer = QuantumTrainer(n_qubits=2, learning_rate=0.1, epochs=15, batch_size=8,
+                                 checkpoint_dir=tmpdir, seed=1)
+        initial = trainer.evaluate(X, y)["loss"]
+        history = trainer.fit(X, y)
+
+        assert min(history["loss"]) < initial
+        assert all(s > 0 for s in history["samples_per_second"])
+        assert os.path.exists(os.path.join(tmpdir, "best.npz"))
+
+        restored = QuantumTrainer(n_qubits=2, seed=2)
+        restored.load_checkpoint(os.path.join(tmpdir, "best.npz"))
+        assert np.allclose(restored.parameters, trainer.parameters)
+
+def test_spsa_and_early_stopping():
+    """SPSA runs and early stopping halts a stalled run"""
+    from src.training.trainer import QuantumTrainer
+
+    X, y = _dataset(16)
+    trainer = QuantumTrainer(n_qubits=2, optimizer="spsa", learning_rate=0.0, epochs=50,
+                             batch_size=16, patience=2, seed=3)
+    history = trainer.fit(X, y, X_val=X, y_val=y)
+
+    assert len(history["loss"]) == 3
+
+def test_from_params():
+    """Trainer reads learning_rate, epochs and batch_size from params.yaml"""
+    from src.training.trainer import QuantumTrainer
+
+    params_path = os.path.join(os.path.dirname(__file__), '..', 'params.yaml')
+    trainer = QuantumTrainer.from_params(params_path, n_qubits=2)
+
+    assert trainer.learning_rate == 0.001
+    assert trainer.epochs == 100
+    assert trainer.batch_size == 32
@@ -0,0 +1,61 @@
+"""
+Tests for the ASHA hyperparameter search
+"""
+import sys
+import os
+import tempfile
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def test_scheduler_promotes_top_fraction():
+    """Only the top 1/eta of a rung is promoted, best first"""
+    from src.training.tuning import ASHAScheduler
+
+    scheduler = ASHAScheduler(min_resource=1, max_resource=9, reduction_factor=3, min_shots=100, max_shots=500)
+    assert scheduler.n_rungs == 3
+    assert [scheduler.resource(k) for k in range(3)] == [1, 3, 9]
+    assert [scheduler.shots(k) for k in range(3)] == [100, 300, 500]
+
+    for trial_id, score in enumerate([0.5, 0.2]):
+        scheduler.report(trial_id, 0, score)
+    assert scheduler.promotable() is None
+
+    scheduler.report(2, 0, 0.9)
+    assert scheduler.promotable() == (1, 1)
+    scheduler.mark_promoted(1, 1)
+    assert scheduler.promotable() is None
+
+def test_search_runs_trials_and_records_them():
+    """A local search spends a fraction of the full budget and logs every rung"""
+    from src.training.tuning import ASHAScheduler, HyperparameterSearch
+    from src.utils.quantum_mlops import QuantumMLOpsManager
+
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, np.pi, (40, 2))
+    y = (X[:, 0] > np.pi / 2).astype(int)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        mlops = QuantumMLOpsManager(tracking_uri=tmpdir, store_backend="sqlite",
+                                    store_path=os.path.join(tmpdir, "experiments.db"))
+        search = HyperparameterSearch(
+            {"n_qubits": 2, "learning_rate": (0.01, 0.3, "log"), "optimizer": ["adam"], "batch_size": [20]},
+            scheduler=ASHAScheduler(min_resource=1, max_resource=9, reduction_factor=3, min_shots=64),
+            n_trials=9, workers=2, mlops=mlops, seed=1,
+        )
+        result = search.run(X[:30], y[:30], X[30:], y[30:])
+
+        assert result["n_trials"] == 9
+        assert result["budget_fraction"] < 0.5
+        best = search.trials[result["best_trial"]]
+        assert best["rung"] == 2 and best["epochs"] == 9
+        assert [h["epochs"] for h in best["history"]] == [1, 3, 9]
+        # Training itself is measured, and higher rungs spend more shots per epoch
+        per_epoch = [h["shots_used"] / e for h, e in zip(best["history"], (1, 2, 6))]
+        assert per_epoch[0] < per_epoch[1] < per_epoch[2]
+        assert result["shots_used"] == sum(h["shots_used"] for t in search.trials.values() for h in t["history"])
+
+        runs = mlops.store.search_runs(params={"model_shots": 576}, metric="search_val_loss")
+        assert len(runs) == sum(1 for t in search.trials.values() if t["rung"] == 2)
+        assert runs[0]["params"]["circuit_n_qubits"] == "2"
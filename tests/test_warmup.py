@@ -0,0 +1,52 @@
+"""
+Tests for startup warm-up and readiness
+"""
+import sys
+import os
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def test_warmup_runs_all_steps():
+    """Every warm-up step runs and readiness flips at the end"""
+    from src.api.warmup import Warmup
+
+    warmup = Warmup(batch_sizes=[1, 4])
+    assert warmup.report()["status"] == "pending" and not warmup.ready
+    warmup.run()
+
+    report = warmup.report()
+    assert warmup.ready and report["duration"] >= 0
+    assert [s["step"] for s in report["steps"]] == ["models", "serialization", "metrics"]
+    assert all(s["ok"] for s in report["steps"])
+
+def test_ready_endpoint_gates_on_warmup(monkeypatch):
+    """/ready is 503 until warm-up completes while /health stays 200"""
+    from fastapi.testclient import TestClient
+    import src.api.main as main
+    from src.api.warmup import Warmup
+
+    pending = Warmup(batch_sizes=[1])
+    monkeypatch.setattr(main, "warmup", pending)
+    client = TestClient(main.app)
+    assert client.get("/health").status_code == 200
+    response = client.get("/ready")
+    assert response.status_code == 503 and response.json()["status"] == "pending"
+
+    pending.start()
+    assert pending.wait(30)
+    assert client.get("/ready").status_code == 200
+
+def test_startup_starts_warmup():
+    """Application startup kicks off the warm-up"""
+    from fastapi.testclient import TestClient
+    from src.api.main import app
+    from src.api.warmup import warmup
+
+    with TestClient(app) as client:
+        assert warmup.wait(30)
+        deadline = time.time() + 5
+        while client.get("/ready").status_code != 200 and time.time() < deadline:
+            time.sleep(0.05)
+        assert client.get("/ready").json()["ready"] is True